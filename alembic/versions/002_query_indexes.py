@@ -0,0 +1,45 @@
+"""Foreign-key and listing indexes
+
+Revision ID: 002_query_indexes
+Revises: 001_initial
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_query_indexes'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_workspaces_owner_id'), 'workspaces', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_workspace_members_workspace_id'), 'workspace_members', ['workspace_id'], unique=False)
+    op.create_index('ix_workspace_members_user_id_workspace_id', 'workspace_members', ['user_id', 'workspace_id'], unique=False)
+    op.create_index(op.f('ix_projects_workspace_id'), 'projects', ['workspace_id'], unique=False)
+    # (project_id, created_at) serves both the project filter and keyset page order
+    op.create_index('ix_meetings_project_id_created_at', 'meetings', ['project_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_meetings_created_by_id'), 'meetings', ['created_by_id'], unique=False)
+    op.create_index('ix_meeting_notes_meeting_id_created_at', 'meeting_notes', ['meeting_id', 'created_at'], unique=False)
+    op.create_index('ix_tasks_project_id_created_at', 'tasks', ['project_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_tasks_assigned_to_id'), 'tasks', ['assigned_to_id'], unique=False)
+    op.create_index(op.f('ix_tasks_meeting_id'), 'tasks', ['meeting_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_meeting_id'), table_name='tasks')
+    op.drop_index(op.f('ix_tasks_assigned_to_id'), table_name='tasks')
+    op.drop_index('ix_tasks_project_id_created_at', table_name='tasks')
+    op.drop_index('ix_meeting_notes_meeting_id_created_at', table_name='meeting_notes')
+    op.drop_index(op.f('ix_meetings_created_by_id'), table_name='meetings')
+    op.drop_index('ix_meetings_project_id_created_at', table_name='meetings')
+    op.drop_index(op.f('ix_projects_workspace_id'), table_name='projects')
+    op.drop_index('ix_workspace_members_user_id_workspace_id', table_name='workspace_members')
+    op.drop_index(op.f('ix_workspace_members_workspace_id'), table_name='workspace_members')
+    op.drop_index(op.f('ix_workspaces_owner_id'), table_name='workspaces')
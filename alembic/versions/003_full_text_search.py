@@ -0,0 +1,90 @@
+"""Full-text search indexes
+
+Revision ID: 003_full_text_search
+Revises: 002_query_indexes
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_full_text_search'
+down_revision: Union[str, None] = '002_query_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres text search configuration of the generated tsvector columns
+SEARCH_TS_CONFIG = os.getenv("SEARCH_TS_CONFIG", "english")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # External-content FTS5 tables kept in sync by triggers
+        op.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+            title, summary, transcript, content='meetings', content_rowid='id', tokenize='porter unicode61'
+        )""")
+        op.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS meeting_notes_fts USING fts5(
+            content, content='meeting_notes', content_rowid='id', tokenize='porter unicode61'
+        )""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN
+            INSERT INTO meetings_fts(rowid, title, summary, transcript)
+            VALUES (new.id, new.title, new.summary, new.transcript);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN
+            INSERT INTO meetings_fts(meetings_fts, rowid, title, summary, transcript)
+            VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE OF title, summary, transcript ON meetings BEGIN
+            INSERT INTO meetings_fts(meetings_fts, rowid, title, summary, transcript)
+            VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+            INSERT INTO meetings_fts(rowid, title, summary, transcript)
+            VALUES (new.id, new.title, new.summary, new.transcript);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_insert AFTER INSERT ON meeting_notes BEGIN
+            INSERT INTO meeting_notes_fts(rowid, content) VALUES (new.id, new.content);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_delete AFTER DELETE ON meeting_notes BEGIN
+            INSERT INTO meeting_notes_fts(meeting_notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END""")
+        op.execute("""CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_update AFTER UPDATE OF content ON meeting_notes BEGIN
+            INSERT INTO meeting_notes_fts(meeting_notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO meeting_notes_fts(rowid, content) VALUES (new.id, new.content);
+        END""")
+        # Index the rows written before this revision
+        op.execute("INSERT INTO meetings_fts(meetings_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO meeting_notes_fts(meeting_notes_fts) VALUES ('rebuild')")
+    elif bind.dialect.name == "postgresql":
+        # Generated tsvector columns, maintained by Postgres on every write, with GIN indexes
+        op.execute(f"""ALTER TABLE meetings ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(summary, '')), 'B') ||
+            setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(transcript, '')), 'C')
+        ) STORED""")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_meetings_search_vector ON meetings USING GIN (search_vector)")
+        op.execute(f"""ALTER TABLE meeting_notes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('{SEARCH_TS_CONFIG}', coalesce(content, ''))
+        ) STORED""")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_meeting_notes_search_vector ON meeting_notes USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for trigger in (
+            "meeting_notes_fts_update", "meeting_notes_fts_delete", "meeting_notes_fts_insert",
+            "meetings_fts_update", "meetings_fts_delete", "meetings_fts_insert"
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS meeting_notes_fts")
+        op.execute("DROP TABLE IF EXISTS meetings_fts")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_meeting_notes_search_vector")
+        op.execute("ALTER TABLE meeting_notes DROP COLUMN IF EXISTS search_vector")
+        op.execute("DROP INDEX IF EXISTS ix_meetings_search_vector")
+        op.execute("ALTER TABLE meetings DROP COLUMN IF EXISTS search_vector")
@@ -1,30 +1,40 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
-from groq import Groq
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional
+import httpx
+from groq import AsyncGroq
 from dotenv import load_dotenv
 load_dotenv()
 import logging
+from pydantic import ValidationError
+from . import schemas
+from .chunking import split_transcript
+from .llm_cache import LLMCache
+from .token_budget import BudgetPlan, TokenUsage, estimate_tokens, plan_completion
 
 logger = logging.getLogger(__name__)
 
-class AIService:
-    def __init__(self):
-        self.groq_api_key = os.getenv("Groq_api_key", "")
-        self.client = None
-        if self.groq_api_key:
-            try:
-                self.client = Groq(api_key=self.groq_api_key)
-            except Exception as e:
-                logger.warning(f"Failed to initialize Groq client: {e}")
+# LLM call limits - all requests share one connection pool and at most
+# AI_MAX_CONCURRENCY completions are in flight at any time
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", "20"))
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "60"))
 
-    async def generate_summary(self, transcript: str, meeting_type: str = "general") -> str:
-        """Generate meeting summary using AI"""
-        if not self.client:
-            return "AI model not available. Please configure Groq API key."
+# Chunked (map-reduce) summarization for transcripts longer than one chunk
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "12000"))
+SUMMARY_CHUNK_OVERLAP = int(os.getenv("SUMMARY_CHUNK_OVERLAP", "2"))
+SUMMARY_MAX_FANOUT = int(os.getenv("SUMMARY_MAX_FANOUT", "4"))
+SUMMARY_REDUCE_GROUP = int(os.getenv("SUMMARY_REDUCE_GROUP", "4"))
+SUMMARY_CHUNK_CACHE_SIZE = 512
 
-        try:
-            prompt = f"""Please provide a comprehensive summary of this {meeting_type} meeting transcript:
+# Part of every LLM cache key - bump when prompt templates change
+PROMPT_TEMPLATE_VERSION = "1"
+
+def _summary_prompt(transcript: str, meeting_type: str) -> str:
+    return f"""Please provide a comprehensive summary of this {meeting_type} meeting transcript:
 
 Transcript:
 {transcript}
@@ -36,173 +46,438 @@ Please structure your summary to include:
 
 Summary:"""
 
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=2048
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.exception("Error generating summary")
-            return f"Error generating summary: {e}"
+def _join_partials(partials: List[str]) -> str:
+    return "\n\n".join(f"Part {i + 1}:\n{p}" for i, p in enumerate(partials))
 
-    async def extract_action_items(self, transcript: str, summary: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Extract action items from meeting transcript"""
-        if not self.client:
-            logger.error("Groq client not initialized")
-            return []
+def _reduce_prompt(joined: str, meeting_type: str, final: bool) -> str:
+    if final:
+        instructions = """Combine them into one comprehensive meeting summary that includes:
+1. Main topics discussed
+2. Key decisions made
+3. Important outcomes or next steps"""
+    else:
+        instructions = "Merge them into one partial summary, keeping topics, decisions, owners and next steps."
+    return f"""Below are consecutive partial summaries of a {meeting_type} meeting.
+{instructions}
 
-        if not transcript or len(transcript.strip()) < 10:
-            logger.warning("Transcript too short to extract action items")
-            return []
+{joined}
 
-        try:
-            context = f"Summary: {summary}\n\n" if summary else ""
-            prompt = f"""{context}Extract action items from this meeting transcript. Return ONLY valid JSON array, no markdown, no extra text.
+Summary:"""
 
-Transcript:
-{transcript}
+def _rolling_summary_prompt(previous_summary: str, new_transcript: str, meeting_type: str) -> str:
+    return f"""You are maintaining a running summary of an ongoing {meeting_type} meeting.
 
-JSON format:
-[
-  {{"title": "Task title", "description": "Details", "assignee": "Person", "due_date": "Date", "priority": "high/medium/low"}}
-]"""
-
-            response = self.client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=1024
-            )
-            content = response.choices[0].message.content.strip()
-
-            # Clean JSON response
-            content = content.replace("```json", "").replace("```", "").strip()
-            
-            if not content or content == "[]":
-                logger.info("No action items found in transcript")
-                return []
-
-            action_items = json.loads(content)
-            
-            if not isinstance(action_items, list):
-                logger.warning(f"Expected list, got {type(action_items)}")
-                return []
-                
-            logger.info(f"Extracted {len(action_items)} action items")
-            return action_items
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing failed: {e}. Content: {content}")
-            return []
-        except Exception as e:
-            logger.exception("Error extracting action items")
-            return []
+Current summary:
+{previous_summary or "(no summary yet)"}
 
-    async def analyze_sentiment(self, transcript: str) -> Dict[str, Any]:
-        """Analyze sentiment of the meeting"""
-        if not self.client:
-            return {"overall": "neutral", "confidence": 0}
+New transcript segments since the current summary:
+{new_transcript}
 
-        try:
-            prompt = f"""Analyze the sentiment of this meeting transcript and provide:
-1. Overall sentiment (positive/negative/neutral)
-2. Confidence score (0-1)
-3. Key positive aspects
-4. Key concerns or negative aspects
+Rewrite the summary so that it also covers the new segments. Keep it structured with:
+1. Main topics discussed
+2. Key decisions made
+3. Important outcomes or next steps
 
-Transcript:
-{transcript}
+Updated summary:"""
+
+def _analysis_prompt(source: str, source_label: str, meeting_type: str) -> str:
+    return f"""Analyze this {meeting_type} meeting and return ONLY a JSON object, no markdown, no extra text.
 
-Return as JSON with keys: overall, confidence, positive_aspects, concerns"""
+{source_label}:
+{source}
 
-            response = self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=2048
+JSON format:
+{{
+  "summary": "Comprehensive summary covering main topics, key decisions and next steps",
+  "action_items": [
+    {{"title": "Task title", "description": "Details", "assignee": "Person", "due_date": "Date", "priority": "high/medium/low"}}
+  ],
+  "sentiment": {{"overall": "positive/negative/neutral", "confidence": 0.0, "positive_aspects": [], "concerns": []}},
+  "topics": ["Main topic"],
+  "insights": {{
+    "key_decisions": [],
+    "risks_identified": [],
+    "unanswered_questions": [],
+    "recommendations": [],
+    "follow_up_needed": false
+  }}
+}}"""
+
+def _parse_analysis(content: str) -> schemas.MeetingAnalysis:
+    """Raises json.JSONDecodeError or ValidationError for output that is not a valid analysis"""
+    content = content.replace("```json", "").replace("```", "").strip()
+    return schemas.MeetingAnalysis.model_validate(json.loads(content))
+
+class AIService:
+    def __init__(self, max_concurrency: int = AI_MAX_CONCURRENCY, cache: Optional[LLMCache] = None):
+        self.groq_api_key = os.getenv("Groq_api_key", "")
+        self.client = None
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else LLMCache()
+        # Estimated against reported prompt tokens for every completion
+        self.usage = TokenUsage()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Partial summaries of chunks and reduce groups, reused as transcripts grow
+        self._chunk_summaries: "OrderedDict[str, str]" = OrderedDict()
+        # transcript hash -> pending analyze_meeting request
+        self._analyses_in_flight: Dict[str, asyncio.Future] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        if self.groq_api_key:
+            try:
+                self._http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=AI_MAX_CONNECTIONS,
+                        max_keepalive_connections=AI_MAX_CONNECTIONS
+                    ),
+                    timeout=AI_REQUEST_TIMEOUT
+                )
+                self.client = AsyncGroq(api_key=self.groq_api_key, http_client=self._http_client)
+            except Exception as e:
+                logger.warning(f"Failed to initialize Groq client: {e}")
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limiter, created lazily inside the running event loop"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _complete(
+        self,
+        plan: BudgetPlan,
+        temperature: float = 0.1,
+        response_format: Optional[Dict[str, Any]] = None,
+        parse: Optional[Callable[[str], Any]] = None
+    ) -> Any:
+        """Run a single chat completion without blocking the event loop.
+
+        The plan (from token_budget.plan_completion) picks the model and
+        holds the prompt, already fitted to its context window. Identical
+        requests are answered from the LLM response cache. With parse, the
+        parsed content is returned and only content that parses is cached;
+        a cached entry that no longer parses is dropped and requested again,
+        and an empty completion raises ValueError.
+        """
+        key = self._cache_key(plan.tier.model, plan.prompt, temperature, plan.max_tokens, response_format)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            if parse is None:
+                return cached
+            try:
+                return parse(cached)
+            except (ValueError, ValidationError) as e:
+                logger.warning(f"Dropping unparseable cached completion: {e}")
+                await self.cache.delete(key)
+
+        params = {"response_format": response_format} if response_format else {}
+        async with self.semaphore:
+            response = await self.client.chat.completions.create(
+                model=plan.tier.model,
+                messages=[{"role": "user", "content": plan.prompt}],
+                temperature=temperature,
+                max_tokens=plan.max_tokens,
+                **params
+            )
+        self.usage.record(plan, getattr(response, "usage", None))
+        content = response.choices[0].message.content
+        if parse is None:
+            if content is not None:
+                await self.cache.set(key, content)
+            return content
+        if content is None:
+            raise ValueError("Empty completion")
+        result = parse(content)
+        await self.cache.set(key, content)
+        return result
+
+    async def _complete_stream(self, plan: BudgetPlan, temperature: float = 0.1) -> AsyncIterator[str]:
+        """Like _complete, but yields the completion text as it is generated.
+
+        Shares cache entries with _complete: a cached response is yielded in
+        one piece, and a fully streamed response is cached.
+        """
+        key = self._cache_key(plan.tier.model, plan.prompt, temperature, plan.max_tokens)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        usage = None
+        async with self.semaphore:
+            stream = await self.client.chat.completions.create(
+                model=plan.tier.model,
+                messages=[{"role": "user", "content": plan.prompt}],
+                temperature=temperature,
+                max_tokens=plan.max_tokens,
+                stream=True
             )
-            content = response.choices[0].message.content
+            async for chunk in stream:
+                # Groq reports usage on the last chunk, under x_groq
+                usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        self.usage.record(plan, usage)
+        await self.cache.set(key, "".join(parts))
+
+    @staticmethod
+    def _cache_key(
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        return LLMCache.make_key(
+            model, PROMPT_TEMPLATE_VERSION, prompt,
+            {"temperature": temperature, "max_tokens": max_tokens, "response_format": response_format}
+        )
+
+    async def aclose(self):
+        """Release the shared HTTP connection pool"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self.cache.close()
+
+    async def generate_summary(self, transcript: str, meeting_type: str = "general", raise_errors: bool = False) -> str:
+        """Generate meeting summary using AI.
+
+        Errors are returned as the summary text unless raise_errors is set.
+        """
+        if not self.client:
+            return "AI model not available. Please configure Groq API key."
 
+        if len(transcript) > SUMMARY_CHUNK_CHARS:
             try:
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                return {"overall": "neutral", "confidence": 0.5}
+                return await self.summarize_chunked(transcript, meeting_type)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.exception("Error generating chunked summary")
+                return f"Error generating summary: {e}"
 
+        try:
+            plan = plan_completion(lambda text: _summary_prompt(text, meeting_type), transcript, max_tokens=2048)
+            return await self._complete(plan)
         except Exception as e:
-            logger.exception("Error analyzing sentiment")
-            return {"overall": "neutral", "confidence": 0}
+            if raise_errors:
+                raise
+            logger.exception("Error generating summary")
+            return f"Error generating summary: {e}"
 
-    async def identify_topics(self, transcript: str) -> List[str]:
-        """Identify main topics discussed in the meeting"""
+    async def stream_summary(self, transcript: str, meeting_type: str = "general") -> AsyncIterator[str]:
+        """generate_summary, yielding the text as it is generated.
+
+        Long transcripts run the map-reduce steps first; only the final
+        reduce is streamed.
+        """
         if not self.client:
-            return []
+            yield "AI model not available. Please configure Groq API key."
+            return
 
         try:
-            prompt = f"""Identify the main topics discussed in this meeting transcript.
-Return a JSON array of topic strings.
-
-Transcript:
-{transcript}
-
-Return only the JSON array of topics."""
+            if len(transcript) > SUMMARY_CHUNK_CHARS:
+                partials = await self._partial_summaries(
+                    transcript, meeting_type, asyncio.Semaphore(SUMMARY_MAX_FANOUT)
+                )
+                if len(partials) == 1:
+                    yield partials[0]
+                    return
+                plan = plan_completion(
+                    lambda text: _reduce_prompt(text, meeting_type, final=True), _join_partials(partials),
+                    max_tokens=1024, source_tokens=estimate_tokens(transcript)
+                )
+            else:
+                plan = plan_completion(lambda text: _summary_prompt(text, meeting_type), transcript, max_tokens=2048)
+
+            async for delta in self._complete_stream(plan):
+                yield delta
+        except Exception as e:
+            logger.exception("Error streaming summary")
+            yield f"Error generating summary: {e}"
+
+    async def summarize_chunked(self, transcript: str, meeting_type: str = "general") -> str:
+        """Map-reduce summary for transcripts that do not fit in one prompt.
+
+        Chunks are summarized concurrently (at most SUMMARY_MAX_FANOUT at a
+        time), then partial summaries are merged in groups of
+        SUMMARY_REDUCE_GROUP until a single summary remains.
+        """
+        fanout = asyncio.Semaphore(SUMMARY_MAX_FANOUT)
+        partials = await self._partial_summaries(transcript, meeting_type, fanout)
+        if len(partials) == 1:
+            return partials[0]
+        # The final merge is sized by the whole transcript, so long meetings get the large model
+        return await self._reduce_summaries(partials, meeting_type, True, fanout, source_tokens=estimate_tokens(transcript))
+
+    async def _partial_summaries(self, transcript: str, meeting_type: str, fanout: asyncio.Semaphore) -> List[str]:
+        """Map and intermediate reduce steps, down to at most SUMMARY_REDUCE_GROUP partials"""
+        chunks = split_transcript(transcript, SUMMARY_CHUNK_CHARS, overlap=SUMMARY_CHUNK_OVERLAP)
+
+        partials = await asyncio.gather(*[
+            self._summarize_chunk(chunk, index, len(chunks), meeting_type, fanout)
+            for index, chunk in enumerate(chunks)
+        ])
+
+        while len(partials) > SUMMARY_REDUCE_GROUP:
+            groups = [partials[i:i + SUMMARY_REDUCE_GROUP] for i in range(0, len(partials), SUMMARY_REDUCE_GROUP)]
+            partials = await asyncio.gather(*[
+                self._reduce_summaries(group, meeting_type, False, fanout) for group in groups
+            ])
+
+        return list(partials)
+
+    async def _cached_partial(
+        self,
+        kind: str,
+        text: str,
+        fanout: asyncio.Semaphore,
+        build_prompt: Callable[[str], str],
+        source_tokens: Optional[int] = None
+    ) -> str:
+        """Run a map/reduce step, reusing the result for identical input"""
+        key = hashlib.sha256(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+        if key in self._chunk_summaries:
+            self._chunk_summaries.move_to_end(key)
+            return self._chunk_summaries[key]
+
+        async with fanout:
+            result = await self._complete(plan_completion(build_prompt, text, max_tokens=1024, source_tokens=source_tokens))
+
+        self._chunk_summaries[key] = result
+        if len(self._chunk_summaries) > SUMMARY_CHUNK_CACHE_SIZE:
+            self._chunk_summaries.popitem(last=False)
+        return result
+
+    async def _summarize_chunk(self, chunk: str, index: int, total: int, meeting_type: str, fanout: asyncio.Semaphore) -> str:
+        def build_prompt(chunk: str) -> str:
+            return f"""This is part {index + 1} of {total} of a {meeting_type} meeting transcript.
+Summarize this part, keeping topics discussed, decisions made, owners and next steps.
+
+Transcript part:
+{chunk}
+
+Partial summary:"""
+
+        return await self._cached_partial(f"chunk:{meeting_type}", chunk, fanout, build_prompt)
+
+    async def _reduce_summaries(
+        self,
+        partials: List[str],
+        meeting_type: str,
+        final: bool,
+        fanout: asyncio.Semaphore,
+        source_tokens: Optional[int] = None
+    ) -> str:
+        return await self._cached_partial(
+            f"reduce:{meeting_type}:{final}", _join_partials(partials), fanout,
+            lambda text: _reduce_prompt(text, meeting_type, final), source_tokens
+        )
+
+    async def update_rolling_summary(self, previous_summary: str, new_transcript: str, meeting_type: str = "general") -> Optional[str]:
+        """Fold new transcript segments into a running meeting summary.
+
+        Returns None when the update fails so callers can keep the previous state.
+        """
+        if not self.client:
+            return None
 
-            response = self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=2048
+        try:
+            plan = plan_completion(
+                lambda text: _rolling_summary_prompt(previous_summary, text, meeting_type), new_transcript, max_tokens=2048
             )
-            content = response.choices[0].message.content
-
-            try:
-                topics = json.loads(content)
-                return topics if isinstance(topics, list) else []
-            except json.JSONDecodeError:
-                return []
+            return await self._complete(plan)
+        except Exception:
+            logger.exception("Error updating rolling summary")
+            return None
 
-        except Exception as e:
-            logger.exception("Error identifying topics")
-            return []
+    async def stream_rolling_summary(self, previous_summary: str, new_transcript: str, meeting_type: str = "general") -> AsyncIterator[str]:
+        """update_rolling_summary, yielding the text as it is generated.
 
-    async def generate_meeting_insights(self, transcript: str, summary: str = None) -> Dict[str, Any]:
-        """Generate comprehensive meeting insights"""
+        Yields nothing without a client; errors propagate so callers can keep
+        the previous summary.
+        """
         if not self.client:
-            return {}
-
+            return
+        plan = plan_completion(
+            lambda text: _rolling_summary_prompt(previous_summary, text, meeting_type), new_transcript, max_tokens=2048
+        )
+        async for delta in self._complete_stream(plan):
+            yield delta
+
+    async def analyze_meeting(self, transcript: str, meeting_type: str = "general", raise_errors: bool = False) -> schemas.MeetingAnalysis:
+        """Summary, action items, sentiment, topics and insights from one LLM call.
+
+        Concurrent calls for the same transcript share a single request.
+        A failed request or an unparseable response gives an empty analysis
+        unless raise_errors is set; unparseable responses are not cached, so
+        the next call asks the model again.
+        """
+        if not self.client:
+            return schemas.MeetingAnalysis(summary="AI model not available. Please configure Groq API key.")
+
+        key = hashlib.sha256(f"{meeting_type}\0{transcript}".encode("utf-8")).hexdigest()
+        future = self._analyses_in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._analyze_meeting(transcript, meeting_type))
+            self._analyses_in_flight[key] = future
+            future.add_done_callback(lambda _: self._analyses_in_flight.pop(key, None))
         try:
-            context = f"Summary: {summary}\n\n" if summary else ""
-            prompt = f"""{context}Provide comprehensive insights for this meeting transcript:
+            return await asyncio.shield(future)
+        except (ValueError, ValidationError) as e:
+            # JSONDecodeError, or an empty completion
+            if raise_errors:
+                raise
+            logger.error(f"Invalid meeting analysis: {e}")
+            return schemas.MeetingAnalysis()
+        except Exception:
+            if raise_errors:
+                raise
+            logger.exception("Error analyzing meeting")
+            return schemas.MeetingAnalysis()
+
+    async def _analyze_meeting(self, transcript: str, meeting_type: str) -> schemas.MeetingAnalysis:
+        # Condense transcripts that do not fit in one prompt
+        if len(transcript) > SUMMARY_CHUNK_CHARS:
+            source = await self.summarize_chunked(transcript, meeting_type)
+            source_label = "Meeting notes (condensed from a long transcript)"
+        else:
+            source = transcript
+            source_label = "Transcript"
+
+        # Short meetings stay on the small model; long ones are worth the large one
+        plan = plan_completion(
+            lambda text: _analysis_prompt(text, source_label, meeting_type), source,
+            max_tokens=4096, source_tokens=estimate_tokens(transcript)
+        )
+        return await self._complete(plan, response_format={"type": "json_object"}, parse=_parse_analysis)
 
-Transcript:
-{transcript}
+    async def extract_action_items(self, transcript: str, summary: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Extract action items from meeting transcript"""
+        if not transcript or len(transcript.strip()) < 10:
+            logger.warning("Transcript too short to extract action items")
+            return []
 
-Return a JSON object with:
-- key_decisions: array of key decisions made
-- risks_identified: array of risks or concerns raised
-- unanswered_questions: array of open questions
-- recommendations: array of recommendations or suggestions
-- follow_up_needed: boolean indicating if follow-up meeting is needed"""
-
-            response = self.client.chat.completions.create(
-                model="mixtral-8x7b-32768",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=2048
-            )
-            content = response.choices[0].message.content
+        analysis = await self.analyze_meeting(transcript)
+        logger.info(f"Extracted {len(analysis.action_items)} action items")
+        return [item.model_dump() for item in analysis.action_items]
 
-            try:
-                insights = json.loads(content)
-                return insights
-            except json.JSONDecodeError:
-                return {}
+    async def analyze_sentiment(self, transcript: str) -> Dict[str, Any]:
+        """Analyze sentiment of the meeting"""
+        analysis = await self.analyze_meeting(transcript)
+        return analysis.sentiment.model_dump()
 
-        except Exception as e:
-            logger.exception("Error generating insights")
-            return {}
+    async def identify_topics(self, transcript: str) -> List[str]:
+        """Identify main topics discussed in the meeting"""
+        analysis = await self.analyze_meeting(transcript)
+        return analysis.topics
+
+    async def generate_meeting_insights(self, transcript: str, summary: str = None) -> Dict[str, Any]:
+        """Generate comprehensive meeting insights"""
+        analysis = await self.analyze_meeting(transcript)
+        return analysis.insights.model_dump()
 
 # Global AI service instance
 ai_service = AIService()
\ No newline at end of file
@@ -0,0 +1,200 @@
+import os
+import abc
+import asyncio
+import logging
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Broadcast backend - "inprocess" for a single worker, "redis" to fan out
+# meeting messages across workers and nodes
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "inprocess")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Handler called with (meeting_id, encoded message) for every delivered message,
+# and with (meeting_id, encoded command) for commands to a meeting this worker owns
+DeliverHandler = Callable[[int, str], None]
+
+def meeting_channel(meeting_id: int) -> str:
+    return f"meeting:{meeting_id}"
+
+def command_channel(meeting_id: int) -> str:
+    return f"meeting-commands:{meeting_id}"
+
+def channel_meeting_id(channel: str) -> int:
+    return int(channel.rsplit(":", 1)[1])
+
+class BroadcastBackend(abc.ABC):
+    """Carries encoded meeting messages to every worker with local participants.
+
+    A meeting's session lives on the worker that started it; that worker
+    subscribes to the meeting's command channel, and commands arriving on
+    other workers are sent there.
+    """
+
+    def __init__(self):
+        self.handler: Optional[DeliverHandler] = None
+        self.command_handler: Optional[DeliverHandler] = None
+
+    def set_handler(self, handler: DeliverHandler):
+        self.handler = handler
+
+    def set_command_handler(self, handler: DeliverHandler):
+        self.command_handler = handler
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def subscribe(self, meeting_id: int):
+        pass
+
+    async def unsubscribe(self, meeting_id: int):
+        pass
+
+    async def subscribe_commands(self, meeting_id: int):
+        """Receive commands for a meeting whose session this worker owns"""
+        pass
+
+    async def unsubscribe_commands(self, meeting_id: int):
+        pass
+
+    @abc.abstractmethod
+    async def publish(self, meeting_id: int, text: str):
+        """Deliver an encoded message to the meeting's participants on every worker"""
+
+    @abc.abstractmethod
+    async def send_command(self, meeting_id: int, text: str) -> bool:
+        """Send an encoded command to the meeting's owner; False when no worker owns it"""
+
+class InProcessBackend(BroadcastBackend):
+    """Single-worker delivery - messages go straight to local connections"""
+
+    async def publish(self, meeting_id: int, text: str):
+        self.handler(meeting_id, text)
+
+    async def send_command(self, meeting_id: int, text: str) -> bool:
+        # The only worker - a session not found locally does not exist
+        return False
+
+class MemoryPubSub:
+    """In-memory pub/sub hub shared by several backends, standing in for Redis in tests"""
+
+    def __init__(self):
+        self.channels: Dict[str, Set["MemoryBackend"]] = {}
+
+    def publish(self, channel: str, text: str) -> int:
+        """Deliver to every subscriber; returns how many there were, like PUBLISH"""
+        subscribers = list(self.channels.get(channel, ()))
+        for backend in subscribers:
+            backend.receive(channel, text)
+        return len(subscribers)
+
+    def subscribe(self, channel: str, backend: "MemoryBackend"):
+        self.channels.setdefault(channel, set()).add(backend)
+
+    def unsubscribe(self, channel: str, backend: "MemoryBackend"):
+        subscribers = self.channels.get(channel)
+        if subscribers is not None:
+            subscribers.discard(backend)
+            if not subscribers:
+                del self.channels[channel]
+
+class MemoryBackend(BroadcastBackend):
+    """Pub/sub backend on a MemoryPubSub hub - one instance per simulated worker"""
+
+    def __init__(self, hub: MemoryPubSub):
+        super().__init__()
+        self.hub = hub
+
+    async def subscribe(self, meeting_id: int):
+        self.hub.subscribe(meeting_channel(meeting_id), self)
+
+    async def unsubscribe(self, meeting_id: int):
+        self.hub.unsubscribe(meeting_channel(meeting_id), self)
+
+    async def subscribe_commands(self, meeting_id: int):
+        self.hub.subscribe(command_channel(meeting_id), self)
+
+    async def unsubscribe_commands(self, meeting_id: int):
+        self.hub.unsubscribe(command_channel(meeting_id), self)
+
+    async def publish(self, meeting_id: int, text: str):
+        self.hub.publish(meeting_channel(meeting_id), text)
+
+    async def send_command(self, meeting_id: int, text: str) -> bool:
+        return self.hub.publish(command_channel(meeting_id), text) > 0
+
+    def receive(self, channel: str, text: str):
+        handler = self.command_handler if channel.startswith("meeting-commands:") else self.handler
+        handler(channel_meeting_id(channel), text)
+
+class RedisBackend(BroadcastBackend):
+    """Redis pub/sub backend - each worker subscribes to the meetings it hosts"""
+
+    # Always-subscribed channel so the listener has a connection before any meeting joins
+    CONTROL_CHANNEL = "meeting:__control__"
+
+    def __init__(self, url: str = REDIS_URL):
+        super().__init__()
+        import redis.asyncio as aioredis
+
+        self.redis = aioredis.Redis.from_url(url)
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        await self.pubsub.subscribe(self.CONTROL_CHANNEL)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        await self.pubsub.close()
+        await self.redis.close()
+
+    async def subscribe(self, meeting_id: int):
+        await self.pubsub.subscribe(meeting_channel(meeting_id))
+
+    async def unsubscribe(self, meeting_id: int):
+        await self.pubsub.unsubscribe(meeting_channel(meeting_id))
+
+    async def subscribe_commands(self, meeting_id: int):
+        await self.pubsub.subscribe(command_channel(meeting_id))
+
+    async def unsubscribe_commands(self, meeting_id: int):
+        await self.pubsub.unsubscribe(command_channel(meeting_id))
+
+    async def publish(self, meeting_id: int, text: str):
+        await self.redis.publish(meeting_channel(meeting_id), text)
+
+    async def send_command(self, meeting_id: int, text: str) -> bool:
+        # PUBLISH answers with the number of subscribers - the owner, if any
+        return await self.redis.publish(command_channel(meeting_id), text) > 0
+
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    channel = message["channel"].decode()
+                    if channel == self.CONTROL_CHANNEL:
+                        continue
+                    handler = self.command_handler if channel.startswith("meeting-commands:") else self.handler
+                    handler(channel_meeting_id(channel), message["data"].decode("utf-8"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Redis broadcast listener error: {e}")
+                await asyncio.sleep(1)
+
+def create_backend(name: str = BROADCAST_BACKEND) -> BroadcastBackend:
+    """Build the broadcast backend named by BROADCAST_BACKEND"""
+    if name == "redis":
+        return RedisBackend()
+    if name == "memory":
+        return MemoryBackend(MemoryPubSub())
+    return InProcessBackend()
@@ -0,0 +1,69 @@
+import re
+from typing import List, Optional
+
+# "Speaker: text" prefix used to detect speaker changes between segments
+SPEAKER_PATTERN = re.compile(r"^\s*([^:\n]{1,40}):")
+
+def _speaker(segment: str) -> Optional[str]:
+    match = SPEAKER_PATTERN.match(segment)
+    return match.group(1).strip() if match else None
+
+def _split_long_segment(segment: str, max_chars: int) -> List[str]:
+    """Break a single oversized segment on whitespace"""
+    pieces = []
+    while len(segment) > max_chars:
+        cut = segment.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(segment[:cut])
+        segment = segment[cut:].lstrip()
+    if segment:
+        pieces.append(segment)
+    return pieces
+
+def split_transcript(transcript: str, max_chars: int, overlap: int = 2, min_fill: float = 0.75) -> List[str]:
+    """Split a transcript into chunks on segment boundaries.
+
+    Segments are the transcript's lines. Chunks are packed greedily from the
+    start, closing early at a speaker change once they are at least
+    ``min_fill`` full, and the last ``overlap`` segments of each chunk are
+    repeated at the start of the next one for context. Because packing only
+    depends on what precedes a boundary, a transcript that grows at the tail
+    keeps producing the same leading chunks.
+    """
+    segments: List[str] = []
+    for line in transcript.splitlines():
+        if line.strip():
+            segments.extend(_split_long_segment(line, max_chars))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    carried = 0  # overlap segments at the start of "current"
+
+    for segment in segments:
+        seg_len = len(segment) + 1
+        has_new = len(current) > carried
+        if has_new and size + seg_len > max_chars:
+            close = True
+        elif has_new and size >= max_chars * min_fill:
+            # Prefer to close at a speaker change
+            close = _speaker(segment) is not None and _speaker(segment) != _speaker(current[-1])
+        else:
+            close = False
+
+        if close:
+            chunks.append("\n".join(current))
+            current = current[-overlap:] if overlap > 0 else []
+            # Drop carried segments that would not leave room for new content
+            while current and sum(len(s) + 1 for s in current) + seg_len > max_chars:
+                current.pop(0)
+            carried = len(current)
+            size = sum(len(s) + 1 for s in current)
+
+        current.append(segment)
+        size += seg_len
+
+    if len(current) > carried:
+        chunks.append("\n".join(current))
+    return chunks
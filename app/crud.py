@@ -1,24 +1,48 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+import functools
+from sqlalchemy.orm import Session, selectinload, undefer_group
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, case, func, select
 from . import models, schemas, auth
+from .pagination import Cursor, DEFAULT_PAGE_SIZE, keyset_page
 from typing import List, Optional
 from datetime import datetime
 
+def async_compatible(fn):
+    """Let a CRUD function take either a Session or an AsyncSession.
+
+    With an AsyncSession the function runs through ``run_sync`` on the async
+    driver and an awaitable is returned; with a Session it runs directly
+    (init_db.py and other sync callers).
+    """
+    @functools.wraps(fn)
+    def wrapper(db, *args, **kwargs):
+        if isinstance(db, AsyncSession):
+            return db.run_sync(fn, *args, **kwargs)
+        return fn(db, *args, **kwargs)
+    return wrapper
+
 # User CRUD operations
+@async_compatible
 def get_user(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
 
+@async_compatible
 def get_user_by_username(db: Session, username: str):
     return db.query(models.User).filter(models.User.username == username).first()
 
+@async_compatible
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
+@async_compatible
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.User).offset(skip).limit(limit).all()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = auth.get_password_hash(user.password)
+@async_compatible
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None):
+    # Async callers hash with auth.hash_password first so it stays off the event loop
+    if hashed_password is None:
+        hashed_password = auth.get_password_hash(user.password)
     db_user = models.User(
         email=user.email,
         username=user.username,
@@ -30,13 +54,34 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.refresh(db_user)
     return db_user
 
+@async_compatible
+def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate, hashed_password: Optional[str] = None):
+    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    if db_user:
+        update_data = user_update.dict(exclude_unset=True)
+        password = update_data.pop("password", None)
+        if password is not None and hashed_password is None:
+            hashed_password = auth.get_password_hash(password)
+        if hashed_password is not None:
+            db_user.hashed_password = hashed_password
+        for field, value in update_data.items():
+            setattr(db_user, field, value)
+        db.commit()
+        db.refresh(db_user)
+        # Cached principals would keep serving the old account state
+        auth.principal_cache.invalidate_user(user_id)
+    return db_user
+
 # Workspace CRUD operations
+@async_compatible
 def get_workspace(db: Session, workspace_id: int):
     return db.query(models.Workspace).filter(models.Workspace.id == workspace_id).first()
 
+@async_compatible
 def get_workspaces_by_owner(db: Session, owner_id: int):
     return db.query(models.Workspace).filter(models.Workspace.owner_id == owner_id).all()
 
+@async_compatible
 def get_user_workspaces(db: Session, user_id: int):
     return db.query(models.Workspace).join(models.WorkspaceMember).filter(
         and_(
@@ -45,6 +90,72 @@ def get_user_workspaces(db: Session, user_id: int):
         )
     ).all()
 
+@async_compatible
+def get_dashboard_tree(db: Session, user_id: int):
+    """User's workspaces with their projects eager loaded (two queries)"""
+    return db.query(models.Workspace).join(models.WorkspaceMember).filter(
+        models.WorkspaceMember.user_id == user_id
+    ).options(
+        selectinload(models.Workspace.projects).load_only(
+            models.Project.id, models.Project.workspace_id, models.Project.name, models.Project.color
+        )
+    ).order_by(models.Workspace.id).all()
+
+def _latest_per_project(db: Session, columns, project_ids: List[int], limit: int):
+    """Newest `limit` rows per project, in one query over the (project_id, created_at) index"""
+    table = columns[0].class_
+    position = func.row_number().over(
+        partition_by=table.project_id,
+        order_by=(table.created_at.desc(), table.id.desc())
+    ).label("position")
+    ranked = select(*columns, position).where(table.project_id.in_(project_ids)).subquery()
+    return db.execute(
+        select(*(ranked.c[column.key] for column in columns))
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.project_id, ranked.c.position)
+    ).all()
+
+@async_compatible
+def get_dashboard_meetings(db: Session, project_ids: List[int], limit: int):
+    """Latest meetings of each project, only the columns the dashboard shows"""
+    return _latest_per_project(db, (
+        models.Meeting.project_id, models.Meeting.id, models.Meeting.title, models.Meeting.status,
+        models.Meeting.meeting_type, models.Meeting.start_time, models.Meeting.created_at
+    ), project_ids, limit)
+
+@async_compatible
+def get_dashboard_tasks(db: Session, project_ids: List[int], limit: int):
+    """Latest tasks of each project, only the columns the dashboard shows"""
+    return _latest_per_project(db, (
+        models.Task.project_id, models.Task.id, models.Task.title, models.Task.description,
+        models.Task.status, models.Task.priority, models.Task.assigned_to_id, models.Task.due_date,
+        models.Task.created_at
+    ), project_ids, limit)
+
+@async_compatible
+def get_dashboard_counts(db: Session, project_ids: List[int]):
+    """{project_id: counts} for meetings and tasks, counted in the database"""
+    counts = {
+        project_id: {"meeting_count": 0, "active_meeting_count": 0, "task_count": 0, "completed_task_count": 0}
+        for project_id in project_ids
+    }
+    for model, total, status, done in (
+        (models.Meeting, "meeting_count", "in_progress", "active_meeting_count"),
+        (models.Task, "task_count", "done", "completed_task_count"),
+    ):
+        rows = db.execute(
+            select(
+                model.project_id,
+                func.count(),
+                func.coalesce(func.sum(case((model.status == status, 1), else_=0)), 0)
+            ).where(model.project_id.in_(project_ids)).group_by(model.project_id)
+        )
+        for project_id, count, matching in rows:
+            counts[project_id][total] = count
+            counts[project_id][done] = matching
+    return counts
+
+@async_compatible
 def create_workspace(db: Session, workspace: schemas.WorkspaceCreate, owner_id: int):
     db_workspace = models.Workspace(**workspace.dict(), owner_id=owner_id)
     db.add(db_workspace)
@@ -63,12 +174,15 @@ def create_workspace(db: Session, workspace: schemas.WorkspaceCreate, owner_id:
     return db_workspace
 
 # Project CRUD operations
+@async_compatible
 def get_project(db: Session, project_id: int):
     return db.query(models.Project).filter(models.Project.id == project_id).first()
 
+@async_compatible
 def get_projects_by_workspace(db: Session, workspace_id: int):
     return db.query(models.Project).filter(models.Project.workspace_id == workspace_id).all()
 
+@async_compatible
 def create_project(db: Session, project: schemas.ProjectCreate):
     db_project = models.Project(**project.dict())
     db.add(db_project)
@@ -77,22 +191,84 @@ def create_project(db: Session, project: schemas.ProjectCreate):
     return db_project
 
 # Meeting CRUD operations
-def get_meeting(db: Session, meeting_id: int):
-    return db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
 
-def get_meetings_by_project(db: Session, project_id: int):
-    return db.query(models.Meeting).filter(models.Meeting.project_id == project_id).all()
+# Columns behind schemas.MeetingListItem - everything but the deferred content
+MEETING_LIST_COLUMNS = (
+    models.Meeting.id, models.Meeting.title, models.Meeting.description,
+    models.Meeting.project_id, models.Meeting.created_by_id,
+    models.Meeting.start_time, models.Meeting.end_time, models.Meeting.duration,
+    models.Meeting.status, models.Meeting.meeting_type,
+    models.Meeting.participants, models.Meeting.tags,
+    models.Meeting.created_at, models.Meeting.updated_at
+)
+
+@async_compatible
+def get_meeting(db: Session, meeting_id: int, with_content: bool = False):
+    """Get a meeting; transcript, summary and action_items load only with with_content"""
+    query = db.query(models.Meeting).filter(models.Meeting.id == meeting_id)
+    if with_content:
+        query = query.options(undefer_group("content"))
+    return query.first()
 
+def _reload_meeting(db: Session, meeting_id: int):
+    # refresh() leaves deferred columns unloaded; re-select them with the rest
+    return db.query(models.Meeting).options(undefer_group("content")).populate_existing().filter(
+        models.Meeting.id == meeting_id
+    ).first()
+
+def _created_between(query, model, created_after: Optional[datetime], created_before: Optional[datetime]):
+    if created_after is not None:
+        query = query.filter(model.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(model.created_at < created_before)
+    return query
+
+@async_compatible
+def get_meetings_by_project(
+    db: Session,
+    project_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[Cursor] = None,
+    status: Optional[str] = None,
+    meeting_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    """One page of a project's meetings, newest first, and the next cursor.
+
+    Rows are plain column tuples for schemas.MeetingListItem - no ORM objects
+    and no transcript text.
+    """
+    query = db.query(*MEETING_LIST_COLUMNS).filter(models.Meeting.project_id == project_id)
+    if status is not None:
+        query = query.filter(models.Meeting.status == status)
+    if meeting_type is not None:
+        query = query.filter(models.Meeting.meeting_type == meeting_type)
+    query = _created_between(query, models.Meeting, created_after, created_before)
+    return keyset_page(query, models.Meeting, limit=limit, after=after)
+
+@async_compatible
 def get_user_meetings(db: Session, user_id: int):
-    return db.query(models.Meeting).filter(models.Meeting.created_by_id == user_id).all()
+    return db.query(*MEETING_LIST_COLUMNS).filter(models.Meeting.created_by_id == user_id).all()
 
+@async_compatible
+def get_meetings_by_ids(db: Session, meeting_ids: List[int]):
+    return db.query(*MEETING_LIST_COLUMNS).filter(models.Meeting.id.in_(meeting_ids)).all()
+
+@async_compatible
+def get_meeting_workspace_id(db: Session, meeting_id: int) -> Optional[int]:
+    return db.query(models.Project.workspace_id).join(
+        models.Meeting, models.Meeting.project_id == models.Project.id
+    ).filter(models.Meeting.id == meeting_id).scalar()
+
+@async_compatible
 def create_meeting(db: Session, meeting: schemas.MeetingCreate, created_by_id: int):
     db_meeting = models.Meeting(**meeting.dict(), created_by_id=created_by_id)
     db.add(db_meeting)
     db.commit()
-    db.refresh(db_meeting)
-    return db_meeting
+    return _reload_meeting(db, db_meeting.id)
 
+@async_compatible
 def update_meeting(db: Session, meeting_id: int, meeting_update: schemas.MeetingUpdate):
     db_meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
     if db_meeting:
@@ -100,13 +276,51 @@ def update_meeting(db: Session, meeting_id: int, meeting_update: schemas.Meeting
         for field, value in update_data.items():
             setattr(db_meeting, field, value)
         db.commit()
-        db.refresh(db_meeting)
+        db_meeting = _reload_meeting(db, meeting_id)
     return db_meeting
 
 # Meeting Note CRUD operations
-def get_meeting_notes(db: Session, meeting_id: int):
-    return db.query(models.MeetingNote).filter(models.MeetingNote.meeting_id == meeting_id).all()
+@async_compatible
+def get_meeting_notes(
+    db: Session,
+    meeting_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[Cursor] = None,
+    note_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    """One page of a meeting's notes in chronological order, and the next cursor"""
+    query = db.query(models.MeetingNote).filter(models.MeetingNote.meeting_id == meeting_id)
+    if note_type is not None:
+        query = query.filter(models.MeetingNote.note_type == note_type)
+    query = _created_between(query, models.MeetingNote, created_after, created_before)
+    return keyset_page(query, models.MeetingNote, limit=limit, after=after, ascending=True)
+
+@async_compatible
+def get_meeting_segments(db: Session, meeting_id: int):
+    """(id, content) of every note in a meeting, for the semantic index"""
+    return db.query(models.MeetingNote.id, models.MeetingNote.content).filter(
+        models.MeetingNote.meeting_id == meeting_id
+    ).order_by(models.MeetingNote.id).all()
 
+@async_compatible
+def get_meeting_ids_with_notes(db: Session, after_id: int = 0, limit: int = 500) -> List[int]:
+    """Ids of meetings that have notes, ascending from after_id, for the semantic index backfill"""
+    return [meeting_id for meeting_id, in db.query(models.MeetingNote.meeting_id).filter(
+        models.MeetingNote.meeting_id > after_id
+    ).distinct().order_by(models.MeetingNote.meeting_id).limit(limit)]
+
+@async_compatible
+def get_meeting_notes_by_ids(db: Session, note_ids: List[int]):
+    return db.query(
+        models.MeetingNote.id, models.MeetingNote.meeting_id, models.Meeting.title.label("meeting_title"),
+        models.MeetingNote.speaker, models.MeetingNote.content, models.MeetingNote.timestamp
+    ).join(models.Meeting, models.Meeting.id == models.MeetingNote.meeting_id).filter(
+        models.MeetingNote.id.in_(note_ids)
+    ).all()
+
+@async_compatible
 def create_meeting_note(db: Session, note: schemas.MeetingNoteCreate, created_by_id: int):
     db_note = models.MeetingNote(**note.dict(), created_by_id=created_by_id)
     db.add(db_note)
@@ -115,15 +329,38 @@ def create_meeting_note(db: Session, note: schemas.MeetingNoteCreate, created_by
     return db_note
 
 # Task CRUD operations
+@async_compatible
 def get_task(db: Session, task_id: int):
     return db.query(models.Task).filter(models.Task.id == task_id).first()
 
-def get_tasks_by_project(db: Session, project_id: int):
-    return db.query(models.Task).filter(models.Task.project_id == project_id).all()
+@async_compatible
+def get_tasks_by_project(
+    db: Session,
+    project_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[Cursor] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+):
+    """One page of a project's tasks, newest first, and the next cursor"""
+    query = db.query(models.Task).filter(models.Task.project_id == project_id)
+    if status is not None:
+        query = query.filter(models.Task.status == status)
+    if priority is not None:
+        query = query.filter(models.Task.priority == priority)
+    if assigned_to_id is not None:
+        query = query.filter(models.Task.assigned_to_id == assigned_to_id)
+    query = _created_between(query, models.Task, created_after, created_before)
+    return keyset_page(query, models.Task, limit=limit, after=after)
 
+@async_compatible
 def get_tasks_by_assigned_user(db: Session, user_id: int):
     return db.query(models.Task).filter(models.Task.assigned_to_id == user_id).all()
 
+@async_compatible
 def create_task(db: Session, task: schemas.TaskCreate, created_by_id: int):
     db_task = models.Task(**task.dict(), created_by_id=created_by_id)
     db.add(db_task)
@@ -131,6 +368,7 @@ def create_task(db: Session, task: schemas.TaskCreate, created_by_id: int):
     db.refresh(db_task)
     return db_task
 
+@async_compatible
 def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if db_task:
@@ -139,4 +377,21 @@ def update_task(db: Session, task_id: int, task_update: schemas.TaskUpdate):
             setattr(db_task, field, value)
         db.commit()
         db.refresh(db_task)
-    return db_task
\ No newline at end of file
+    return db_task
+
+# AI job CRUD operations
+@async_compatible
+def get_ai_job(db: Session, job_id: int):
+    return db.query(models.AIJob).filter(models.AIJob.id == job_id).first()
+
+@async_compatible
+def create_ai_jobs(db: Session, kind: str, meeting_ids: List[int], created_by_id: int, max_attempts: int):
+    db_jobs = [
+        models.AIJob(kind=kind, meeting_id=meeting_id, created_by_id=created_by_id, max_attempts=max_attempts)
+        for meeting_id in meeting_ids
+    ]
+    db.add_all(db_jobs)
+    db.commit()
+    for db_job in db_jobs:
+        db.refresh(db_job)
+    return db_jobs
@@ -0,0 +1,218 @@
+import os
+import abc
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .database import AsyncSessionLocal
+
+# Meetings are read EXPORT_BATCH_SIZE at a time and notes stream from a
+# server-side cursor in batches of the same size; output is flushed to the
+# client in chunks of about EXPORT_CHUNK_SIZE characters
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "65536"))
+
+MEETING_EXPORT_COLUMNS = (
+    models.Meeting.id, models.Meeting.title, models.Meeting.project_id,
+    models.Meeting.meeting_type, models.Meeting.status,
+    models.Meeting.start_time, models.Meeting.end_time, models.Meeting.created_at,
+    models.Meeting.summary
+)
+
+NOTE_EXPORT_COLUMNS = (
+    models.MeetingNote.id, models.MeetingNote.meeting_id, models.MeetingNote.timestamp,
+    models.MeetingNote.speaker, models.MeetingNote.note_type, models.MeetingNote.content
+)
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive UTC, Postgres aware datetimes - compare them as naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _clock(value: Optional[datetime]) -> str:
+    return value.strftime("%H:%M:%S") if value else "--:--:--"
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+class ExportFormat(abc.ABC):
+    """Renders a meeting header and its notes one row at a time"""
+    media_type = "text/plain"
+    extension = "txt"
+
+    @abc.abstractmethod
+    def meeting(self, meeting) -> str:
+        """Text written before the meeting's notes"""
+
+    @abc.abstractmethod
+    def note(self, note) -> str:
+        """Text for one note of the current meeting"""
+
+    def close(self) -> str:
+        return ""
+
+class TextExport(ExportFormat):
+    def __init__(self):
+        self.meetings = 0
+
+    def meeting(self, meeting) -> str:
+        self.meetings += 1
+        separator = "\n" if self.meetings > 1 else ""
+        header = f"{separator}{meeting.title}\n{_isoformat(meeting.start_time or meeting.created_at) or ''}\n"
+        if meeting.summary:
+            header += f"\nSummary:\n{meeting.summary}\n"
+        return header + "\n"
+
+    def note(self, note) -> str:
+        return f"[{_clock(note.timestamp)}] {note.speaker or 'Unknown'}: {note.content}\n"
+
+class MarkdownExport(ExportFormat):
+    media_type = "text/markdown"
+    extension = "md"
+
+    def meeting(self, meeting) -> str:
+        header = f"# {meeting.title}\n\n"
+        header += f"- Type: {meeting.meeting_type}\n- Status: {meeting.status}\n"
+        header += f"- Date: {_isoformat(meeting.start_time or meeting.created_at) or ''}\n\n"
+        if meeting.summary:
+            header += f"## Summary\n\n{meeting.summary}\n\n"
+        return header + "## Transcript\n\n"
+
+    def note(self, note) -> str:
+        return f"**{note.speaker or 'Unknown'}** ({_clock(note.timestamp)}): {note.content}\n\n"
+
+class NdjsonExport(ExportFormat):
+    """One JSON object per line: a "meeting" record followed by its "note" records"""
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def meeting(self, meeting) -> str:
+        return json.dumps({
+            "type": "meeting",
+            "id": meeting.id,
+            "title": meeting.title,
+            "project_id": meeting.project_id,
+            "meeting_type": meeting.meeting_type,
+            "status": meeting.status,
+            "start_time": _isoformat(meeting.start_time),
+            "end_time": _isoformat(meeting.end_time),
+            "summary": meeting.summary
+        }) + "\n"
+
+    def note(self, note) -> str:
+        return json.dumps({
+            "type": "note",
+            "id": note.id,
+            "meeting_id": note.meeting_id,
+            "timestamp": _isoformat(note.timestamp),
+            "speaker": note.speaker,
+            "note_type": note.note_type,
+            "content": note.content
+        }) + "\n"
+
+class SrtExport(ExportFormat):
+    """SubRip subtitles timed from the meeting start.
+
+    A cue ends where the next one starts, so each note is written one row
+    late; close() writes the last one.
+    """
+    media_type = "application/x-subrip"
+    extension = "srt"
+    LAST_CUE = timedelta(seconds=3)
+    MAX_CUE = timedelta(seconds=10)
+
+    def __init__(self):
+        self.origin: Optional[datetime] = None
+        self.index = 0
+        self.pending = None
+
+    def meeting(self, meeting) -> str:
+        self.origin = _utc(meeting.start_time)
+        return ""
+
+    def note(self, note) -> str:
+        start = _utc(note.timestamp)
+        if self.origin is None:
+            self.origin = start
+        previous, self.pending = self.pending, (start, note)
+        return self._cue(*previous, next_start=start) if previous else ""
+
+    def close(self) -> str:
+        return self._cue(*self.pending, next_start=None) if self.pending else ""
+
+    def _cue(self, start: Optional[datetime], note, next_start: Optional[datetime]) -> str:
+        start = start or self.origin
+        end = start + self.LAST_CUE
+        if next_start is not None and next_start > start:
+            end = min(next_start, start + self.MAX_CUE)
+        self.index += 1
+        # Blank lines end a cue in SRT
+        text = "\n".join(line for line in note.content.splitlines() if line.strip())
+        speaker = f"{note.speaker}: " if note.speaker else ""
+        return f"{self.index}\n{self._offset(start)} --> {self._offset(end)}\n{speaker}{text}\n\n"
+
+    def _offset(self, moment: datetime) -> str:
+        milliseconds = max(0, int((moment - self.origin).total_seconds() * 1000))
+        hours, rest = divmod(milliseconds, 3_600_000)
+        minutes, rest = divmod(rest, 60_000)
+        seconds, milliseconds = divmod(rest, 1000)
+        return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
+
+EXPORT_FORMATS: Dict[str, type] = {
+    "txt": TextExport,
+    "md": MarkdownExport,
+    "ndjson": NdjsonExport,
+    "srt": SrtExport,
+}
+
+async def _meeting_batches(db: AsyncSession, meeting_id: Optional[int], project_id: Optional[int]) -> AsyncIterator[List[Any]]:
+    """Meeting rows in id order, keyset-paged so no cursor stays open between batches"""
+    last_id = 0
+    while True:
+        query = select(*MEETING_EXPORT_COLUMNS).where(models.Meeting.id > last_id)
+        if meeting_id is not None:
+            query = query.where(models.Meeting.id == meeting_id)
+        else:
+            query = query.where(models.Meeting.project_id == project_id)
+        batch = (await db.execute(query.order_by(models.Meeting.id).limit(EXPORT_BATCH_SIZE))).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+async def _render(db: AsyncSession, export_format: ExportFormat, meeting_id: Optional[int], project_id: Optional[int]) -> AsyncIterator[str]:
+    async for batch in _meeting_batches(db, meeting_id, project_id):
+        for meeting in batch:
+            yield export_format.meeting(meeting)
+            notes = await db.stream(
+                select(*NOTE_EXPORT_COLUMNS)
+                .where(models.MeetingNote.meeting_id == meeting.id)
+                .order_by(models.MeetingNote.created_at, models.MeetingNote.id)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            # A partition per round trip through the driver rather than a row
+            async for partition in notes.partitions():
+                yield "".join(export_format.note(note) for note in partition)
+    yield export_format.close()
+
+async def stream_export(fmt: str, meeting_id: Optional[int] = None, project_id: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Encoded export of one meeting or every meeting in a project, in chunks.
+
+    Opens its own session, since the response body is produced after the
+    request's session may have been released.
+    """
+    export_format = EXPORT_FORMATS[fmt]()
+    pieces: List[str] = []
+    size = 0
+    async with AsyncSessionLocal() as db:
+        async for text in _render(db, export_format, meeting_id, project_id):
+            pieces.append(text)
+            size += len(text)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield "".join(pieces).encode("utf-8")
+                pieces, size = [], 0
+    if pieces:
+        yield "".join(pieces).encode("utf-8")
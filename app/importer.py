@@ -0,0 +1,170 @@
+import os
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models, schemas
+
+# Notes are written with one executemany per batch and committed with it;
+# a line longer than IMPORT_MAX_LINE_BYTES stops the import, keeping and
+# reporting everything before it
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+MAX_REPORTED_ERRORS = 100
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines, holding at most one partial line"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        if b"\n" in chunk:
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise ValueError(f"Line longer than {IMPORT_MAX_LINE_BYTES} bytes")
+    if buffer:
+        yield buffer
+
+async def upload_chunks(uploads: Iterable[Any], chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read uploaded files (already spooled by the form parser) in chunks, one after another"""
+    for upload in uploads:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        # A file without a trailing newline must not run into the next one
+        yield b"\n"
+
+class MeetingImporter:
+    """Writes NDJSON meeting and note records to one project.
+
+    Each "meeting" record is inserted when read; its segments and the
+    "note" records after it are buffered and written IMPORT_BATCH_SIZE at a
+    time in one transaction. Invalid lines are skipped and reported; an
+    oversized line ends the import with ``complete`` False.
+    """
+
+    def __init__(self, db: AsyncSession, project_id: int, user_id: int, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.project_id = project_id
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.meeting_ids: List[int] = []
+        self.notes_created = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._notes: List[Dict[str, Any]] = []
+        self._meeting: Optional[schemas.MeetingImport] = None
+        self._meeting_id: Optional[int] = None
+        self._transcript: List[str] = []
+
+    async def run(self, lines: AsyncIterator[bytes]) -> Dict[str, Any]:
+        number = 0
+        complete = True
+        try:
+            async for line in lines:
+                number += 1
+                if not line.strip():
+                    continue
+                try:
+                    await self._record(json.loads(line))
+                except ValueError as e:
+                    # Covers malformed JSON and pydantic validation errors
+                    if len(self.errors) < MAX_REPORTED_ERRORS:
+                        self.errors.append({"line": number, "error": _describe(e)})
+        except ValueError as e:
+            # Raised by iter_lines for an oversized line - the lines before it
+            # are written as usual so their meetings can still be processed
+            complete = False
+            self.errors.append({"line": number + 1, "error": f"{e}; import stopped"})
+        await self._finish_meeting()
+        await self._flush()
+        return {
+            "meetings_created": len(self.meeting_ids),
+            "notes_created": self.notes_created,
+            "meeting_ids": self.meeting_ids,
+            "errors": self.errors,
+            "complete": complete
+        }
+
+    async def _record(self, record: Any):
+        if not isinstance(record, dict):
+            raise ValueError("Expected a JSON object")
+        kind = record.get("type") or ("meeting" if "title" in record else "note")
+        if kind == "meeting":
+            # Notes after an invalid meeting record must not join the previous meeting
+            await self._finish_meeting()
+            await self._start_meeting(schemas.MeetingImport.model_validate(record))
+        elif kind == "note":
+            if self._meeting_id is None:
+                raise ValueError("Note without a valid meeting record before it")
+            await self._add_note(schemas.NoteImport.model_validate(record))
+        else:
+            raise ValueError(f"Unknown record type {kind!r}")
+
+    async def _start_meeting(self, meeting: schemas.MeetingImport):
+        duration = meeting.duration
+        if duration is None and meeting.start_time and meeting.end_time:
+            duration = (meeting.end_time - meeting.start_time).total_seconds() / 60
+        result = await self.db.execute(models.Meeting.__table__.insert().values(
+            title=meeting.title,
+            description=meeting.description,
+            project_id=self.project_id,
+            created_by_id=self.user_id,
+            start_time=meeting.start_time,
+            end_time=meeting.end_time,
+            duration=duration,
+            # An explicit null must not bypass the defaults - Core inserts skip
+            # column defaults for keys that are present (notes likewise)
+            status=meeting.status or "completed",
+            meeting_type=meeting.meeting_type or "general",
+            summary=meeting.summary,
+            action_items=meeting.action_items,
+            participants=[],
+            tags=meeting.tags or []
+        ))
+        self._meeting = meeting
+        self._meeting_id = result.inserted_primary_key[0]
+        self.meeting_ids.append(self._meeting_id)
+        for segment in meeting.segments:
+            await self._add_note(segment)
+
+    async def _add_note(self, note: schemas.NoteImport):
+        self._notes.append({
+            "meeting_id": self._meeting_id,
+            "timestamp": note.timestamp or self._meeting.start_time or datetime.now(timezone.utc),
+            "speaker": note.speaker,
+            "content": note.content,
+            "note_type": note.note_type or "transcript",
+            "created_by_id": self.user_id
+        })
+        self._transcript.append(note.content)
+        if len(self._notes) >= self.batch_size:
+            await self._flush()
+
+    async def _finish_meeting(self):
+        # The transcript column holds the joined segments, as for live meetings
+        if self._meeting_id is not None and self._transcript:
+            meetings = models.Meeting.__table__
+            await self.db.execute(
+                update(meetings).where(meetings.c.id == self._meeting_id).values(transcript="\n".join(self._transcript))
+            )
+        self._meeting = self._meeting_id = None
+        self._transcript = []
+
+    async def _flush(self):
+        if self._notes:
+            await self.db.execute(models.MeetingNote.__table__.insert(), self._notes)
+            self.notes_created += len(self._notes)
+            self._notes = []
+        await self.db.commit()
+
+def _describe(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+    return str(error)
@@ -0,0 +1,337 @@
+import os
+import abc
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import crud, models, schemas
+from .ai_service import ai_service
+from .database import AsyncSessionLocal
+from .semantic_index import semantic_index
+from .websocket_manager import MeetingManager, meeting_manager
+
+logger = logging.getLogger(__name__)
+
+# Job backend - "inprocess" runs jobs on a worker pool inside each API process,
+# "celery" hands them to Celery workers started with
+#   celery -A app.jobs.celery_app worker
+JOB_BACKEND = os.getenv("JOB_BACKEND", "inprocess")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Failed attempts are retried after JOB_RETRY_DELAY seconds, doubling each time
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "5"))
+# An attempt running longer than this is cancelled; a job left running that
+# long by a lost worker is queued again on the next start
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "600"))
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+RUN_JOB_TASK = "app.jobs.run_job"
+
+class JobError(Exception):
+    """A job failure that retrying cannot fix"""
+
+# Job handlers - each gets a session and the meeting with its content loaded
+async def _analysis(meeting: models.Meeting) -> schemas.MeetingAnalysis:
+    # One LLM call (and one cache entry) serves every analysis-based job kind
+    return await ai_service.analyze_meeting(meeting.transcript, meeting.meeting_type or "general", raise_errors=True)
+
+async def _summary_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    summary = await ai_service.generate_summary(meeting.transcript, meeting.meeting_type or "general", raise_errors=True)
+    await crud.update_meeting(db, meeting.id, schemas.MeetingUpdate(summary=summary))
+    return {"summary": summary}
+
+async def _action_items_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    action_items = [item.model_dump() for item in (await _analysis(meeting)).action_items]
+    await crud.update_meeting(db, meeting.id, schemas.MeetingUpdate(action_items=action_items))
+    return {"action_items": action_items}
+
+async def _sentiment_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    return {"sentiment": (await _analysis(meeting)).sentiment.model_dump()}
+
+async def _topics_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    return {"topics": (await _analysis(meeting)).topics}
+
+async def _insights_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    return {"insights": (await _analysis(meeting)).insights.model_dump()}
+
+async def _full_analysis_job(db: AsyncSession, meeting: models.Meeting) -> Dict[str, Any]:
+    """Everything at once; fills in a missing summary or action items and indexes the meeting"""
+    analysis = await _analysis(meeting)
+    values = {}
+    if not meeting.summary and analysis.summary:
+        values["summary"] = analysis.summary
+    if not meeting.action_items and analysis.action_items:
+        values["action_items"] = [item.model_dump() for item in analysis.action_items]
+    if values:
+        await crud.update_meeting(db, meeting.id, schemas.MeetingUpdate(**values))
+    await semantic_index.index_meeting(meeting.id)
+    return analysis.model_dump()
+
+JobHandler = Callable[[AsyncSession, models.Meeting], Awaitable[Dict[str, Any]]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    "summary": _summary_job,
+    "action_items": _action_items_job,
+    "sentiment": _sentiment_job,
+    "topics": _topics_job,
+    "insights": _insights_job,
+    "analysis": _full_analysis_job,
+}
+
+def job_event(job: models.AIJob) -> Dict:
+    return {"type": "job_completed", "data": schemas.AIJob.model_validate(job).model_dump(mode="json")}
+
+class JobBackend(abc.ABC):
+    """Delivers queued job ids to whatever runs them"""
+
+    def __init__(self):
+        self.runner: Optional[Callable[[int], Awaitable[None]]] = None
+
+    def set_runner(self, runner: Callable[[int], Awaitable[None]]):
+        self.runner = runner
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abc.abstractmethod
+    async def submit(self, job_id: int, delay: float = 0):
+        """Run job_id after delay seconds"""
+
+    async def drain(self):
+        """Wait for submitted jobs that run in this process"""
+        pass
+
+    def pending(self) -> int:
+        return 0
+
+class InProcessJobBackend(JobBackend):
+    """A pool of worker tasks on this process's event loop"""
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        super().__init__()
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Retries waiting out their backoff
+        self._delayed: Set[asyncio.Task] = set()
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Created lazily inside the running event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        # Jobs still queued stay queued in the database for the next start
+        for task in [*self._delayed, *self._tasks]:
+            task.cancel()
+        await asyncio.gather(*self._delayed, *self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, job_id: int, delay: float = 0):
+        if delay <= 0:
+            self.queue.put_nowait(job_id)
+            return
+        task = asyncio.create_task(self._submit_later(job_id, delay))
+        self._delayed.add(task)
+        task.add_done_callback(self._delayed.discard)
+
+    async def _submit_later(self, job_id: int, delay: float):
+        await asyncio.sleep(delay)
+        self.queue.put_nowait(job_id)
+
+    async def drain(self):
+        while True:
+            await self.queue.join()
+            if not self._delayed:
+                return
+            await asyncio.wait(set(self._delayed))
+
+    def pending(self) -> int:
+        return self.queue.qsize() + len(self._delayed)
+
+    async def _work(self):
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self.runner(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id} runner failed")
+            finally:
+                self.queue.task_done()
+
+class CeleryJobBackend(JobBackend):
+    """Sends job ids to Celery workers, which run them with their own JobQueue"""
+
+    async def submit(self, job_id: int, delay: float = 0):
+        # send_task blocks on the broker connection
+        await asyncio.to_thread(celery_app.send_task, RUN_JOB_TASK, args=[job_id], countdown=delay or None)
+
+class JobQueue:
+    """Persisted AI jobs with retries.
+
+    Jobs are rows in ai_jobs; a backend only carries their ids, and a worker
+    claims a job by moving it from queued to running, so a job submitted
+    twice still runs once. Each finished job is announced to the meeting's
+    participants as a job_completed event, numbered so it is replayed to
+    clients that reconnect.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[JobBackend] = None,
+        meeting_manager: Optional[MeetingManager] = meeting_manager,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_delay: float = JOB_RETRY_DELAY,
+        timeout: float = JOB_TIMEOUT
+    ):
+        self.backend = backend if backend is not None else InProcessJobBackend()
+        self.backend.set_runner(self.run_job)
+        self.meeting_manager = meeting_manager
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.counters = {"submitted": 0, "succeeded": 0, "failed": 0, "retried": 0}
+
+    async def start(self, recover: bool = True):
+        await self.backend.start()
+        if recover:
+            await self.recover()
+
+    async def stop(self):
+        await self.backend.stop()
+
+    async def drain(self):
+        await self.backend.drain()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "backend": type(self.backend).__name__, "pending": self.backend.pending()}
+
+    async def enqueue(self, db: AsyncSession, kind: str, meeting_ids: List[int], user_id: int) -> List[models.AIJob]:
+        """Record one job of this kind per meeting and submit them"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        jobs = await crud.create_ai_jobs(db, kind, meeting_ids, created_by_id=user_id, max_attempts=self.max_attempts)
+        for job in jobs:
+            await self.backend.submit(job.id)
+        self.counters["submitted"] += len(jobs)
+        return jobs
+
+    async def recover(self):
+        """Requeue jobs left running by a lost worker and resubmit every queued job"""
+        jobs = models.AIJob.__table__
+        stale = datetime.now(timezone.utc) - timedelta(seconds=self.timeout)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(jobs)
+                .where(jobs.c.status == "running", or_(jobs.c.started_at.is_(None), jobs.c.started_at < stale))
+                .values(status="queued")
+            )
+            await db.commit()
+            job_ids = (await db.execute(
+                select(jobs.c.id).where(jobs.c.status == "queued").order_by(jobs.c.created_at, jobs.c.id)
+            )).scalars().all()
+        for job_id in job_ids:
+            await self.backend.submit(job_id)
+        if job_ids:
+            logger.info(f"Resubmitted {len(job_ids)} queued AI jobs")
+
+    async def run_job(self, job_id: int):
+        """Run one attempt of a job, if no other worker has claimed it"""
+        async with AsyncSessionLocal() as db:
+            job = await self._claim(db, job_id)
+            if job is None:
+                return
+            kind, attempts = job.kind, job.attempts
+            try:
+                meeting = await crud.get_meeting(db, job.meeting_id, with_content=True)
+                if meeting is None or not meeting.transcript:
+                    raise JobError("Meeting has no transcript")
+                if not ai_service.client:
+                    raise JobError("AI model not available. Please configure Groq API key.")
+                result = await asyncio.wait_for(JOB_HANDLERS[kind](db, meeting), self.timeout)
+            except JobError as e:
+                await self._finish(db, job_id, "failed", error=str(e))
+            except asyncio.CancelledError:
+                # Shutting down - hand the attempt back for the next start
+                await asyncio.shield(self._update(db, job_id, status="queued", attempts=attempts - 1))
+                raise
+            except Exception as e:
+                logger.warning(f"Job {job_id} ({kind}) attempt {attempts} failed: {e!r}")
+                if attempts >= job.max_attempts:
+                    await self._finish(db, job_id, "failed", error=repr(e))
+                else:
+                    await self._update(db, job_id, status="queued", error=repr(e))
+                    self.counters["retried"] += 1
+                    await self.backend.submit(job_id, delay=self.retry_delay * 2 ** (attempts - 1))
+            else:
+                await self._finish(db, job_id, "succeeded", result=result)
+
+    async def _claim(self, db: AsyncSession, job_id: int) -> Optional[models.AIJob]:
+        jobs = models.AIJob.__table__
+        claimed = await db.execute(
+            update(jobs)
+            .where(jobs.c.id == job_id, jobs.c.status == "queued")
+            .values(status="running", attempts=jobs.c.attempts + 1, started_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return None
+        return await crud.get_ai_job(db, job_id)
+
+    async def _update(self, db: AsyncSession, job_id: int, **values):
+        # A failed handler may have left the session mid-transaction
+        await db.rollback()
+        jobs = models.AIJob.__table__
+        await db.execute(update(jobs).where(jobs.c.id == job_id).values(**values))
+        await db.commit()
+
+    async def _finish(self, db: AsyncSession, job_id: int, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        await self._update(db, job_id, status=status, result=result, error=error, finished_at=datetime.now(timezone.utc))
+        self.counters[status] += 1
+        job = await db.get(models.AIJob, job_id, populate_existing=True)
+        if self.meeting_manager is not None and job.meeting_id is not None:
+            try:
+                await self.meeting_manager.announce(job.meeting_id, job_event(job))
+            except Exception:
+                logger.exception(f"Could not announce job {job_id}")
+
+def create_job_backend(name: str = JOB_BACKEND) -> JobBackend:
+    """Build the job backend named by JOB_BACKEND"""
+    if name == "celery":
+        return CeleryJobBackend()
+    return InProcessJobBackend()
+
+def create_celery_app():
+    """Celery app whose worker processes run jobs on one long-lived event loop each.
+
+    Completion events reach WebSocket clients, and the worker that numbers
+    the meeting's events, through the broadcast backend, so Celery workers
+    need BROADCAST_BACKEND=redis.
+    """
+    from celery import Celery
+
+    app = Celery("meeting_notes", broker=CELERY_BROKER_URL)
+    loops: Dict[int, asyncio.AbstractEventLoop] = {}
+
+    @app.task(name=RUN_JOB_TASK, ignore_result=True)
+    def run_job(job_id: int):
+        # Pooled database and HTTP connections are bound to the loop they were opened on
+        loop = loops.get(os.getpid())
+        if loop is None:
+            loop = loops[os.getpid()] = asyncio.new_event_loop()
+        loop.run_until_complete(job_queue.run_job(job_id))
+
+    return app
+
+# Global instances
+celery_app = create_celery_app() if JOB_BACKEND == "celery" else None
+job_queue = JobQueue(create_job_backend())
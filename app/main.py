@@ -9,13 +9,15 @@ from fastapi import FastAPI, Request, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 from typing import Optional
 from contextlib import asynccontextmanager
 
 # Import our modules
-from .database import engine, get_db
-from . import models, auth
+from .database import async_engine, get_db
+from . import models, auth, search
+from .ai_service import ai_service
+from .websocket_manager import connection_manager, meeting_manager
+from .jobs import job_queue
 from .routers import auth as auth_router, api, websocket
 
 # Configure logging
@@ -25,8 +27,19 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create database tables
-    models.Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+        await conn.run_sync(search.install)
+    await connection_manager.start()
+    await job_queue.start()
     yield
+    # Let end-of-meeting processing finish, then release the shared LLM connection pool
+    await meeting_manager.shutdown()
+    await job_queue.stop()
+    await connection_manager.stop()
+    await ai_service.aclose()
+    auth.shutdown_hash_executor()
+    await async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -26,7 +26,7 @@ class Workspace(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -37,9 +37,13 @@ class Workspace(Base):
 
 class WorkspaceMember(Base):
     __tablename__ = "workspace_members"
+    __table_args__ = (
+        # Membership lookups by user; also covers the join back to workspaces
+        Index("ix_workspace_members_user_id_workspace_id", "user_id", "workspace_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    workspace_id = Column(Integer, ForeignKey("workspaces.id"))
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     role = Column(String, default="member")  # owner, admin, member
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -54,7 +58,7 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
-    workspace_id = Column(Integer, ForeignKey("workspaces.id"))
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), index=True)
     color = Column(String, default="#667eea")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -62,23 +66,29 @@ class Project(Base):
     # Relationships
     workspace = relationship("Workspace", back_populates="projects")
     meetings = relationship("Meeting", back_populates="project")
+    tasks = relationship("Task", back_populates="project")
 
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Project listings filter by project and page on (created_at, id)
+        Index("ix_meetings_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    created_by_id = Column(Integer, ForeignKey("users.id"))
+    created_by_id = Column(Integer, ForeignKey("users.id"), index=True)
     start_time = Column(DateTime(timezone=True))
     end_time = Column(DateTime(timezone=True))
     duration = Column(Float)  # in minutes
     status = Column(String, default="scheduled")  # scheduled, in_progress, completed, cancelled
     meeting_type = Column(String, default="general")  # general, standup, retrospective, client_call, etc.
-    transcript = Column(Text)
-    summary = Column(Text)
-    action_items = Column(JSON)  # Store as JSON array
+    # Large columns load only when asked for (undefer_group("content"))
+    transcript = deferred(Column(Text), group="content")
+    summary = deferred(Column(Text), group="content")
+    action_items = deferred(Column(JSON), group="content")  # Store as JSON array
     participants = Column(JSON)  # Store as JSON array of user IDs
     tags = Column(JSON)  # Store as JSON array
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -91,6 +101,9 @@ class Meeting(Base):
 
 class MeetingNote(Base):
     __tablename__ = "meeting_notes"
+    __table_args__ = (
+        Index("ix_meeting_notes_meeting_id_created_at", "meeting_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"))
@@ -107,13 +120,16 @@ class MeetingNote(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=True)  # If created from meeting
-    assigned_to_id = Column(Integer, ForeignKey("users.id"))
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=True, index=True)  # If created from meeting
+    assigned_to_id = Column(Integer, ForeignKey("users.id"), index=True)
     created_by_id = Column(Integer, ForeignKey("users.id"))
     status = Column(String, default="todo")  # todo, in_progress, done, cancelled
     priority = Column(String, default="medium")  # low, medium, high, urgent
@@ -124,11 +140,35 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    project = relationship("Project")
+    project = relationship("Project", back_populates="tasks")
     meeting = relationship("Meeting")
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
     created_by = relationship("User", foreign_keys=[created_by_id])
 
+class AIJob(Base):
+    __tablename__ = "ai_jobs"
+    __table_args__ = (
+        # Workers pick up queued jobs and recover stale running ones by status
+        Index("ix_ai_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # summary, action_items, sentiment, topics, insights, analysis
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), index=True)
+    created_by_id = Column(Integer, ForeignKey("users.id"))
+    status = Column(String, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    # Relationships
+    meeting = relationship("Meeting")
+    created_by = relationship("User")
+
 class MeetingTemplate(Base):
     __tablename__ = "meeting_templates"
 
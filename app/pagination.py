@@ -0,0 +1,90 @@
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Query as OrmQuery
+
+# List endpoints return at most this many rows per page
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Position of the last row of a page: (created_at, id)
+Cursor = Tuple[datetime, int]
+
+# server_default=func.now() stores whole seconds on SQLite while the DateTime
+# type binds with microseconds, so cursor values are bound in the stored format
+_SQLITE_SECONDS = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the given row"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+def cursor_param(cursor: Optional[str] = Query(None, description="next_cursor from the previous page")) -> Optional[Cursor]:
+    """FastAPI dependency decoding the ``cursor`` query parameter"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def limit_param(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)) -> int:
+    """FastAPI dependency for the page size"""
+    return limit
+
+def keyset_page(
+    query: OrmQuery,
+    model: Any,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[Cursor] = None,
+    ascending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of ``query`` ordered by (created_at, id).
+
+    Seeks past ``after`` instead of using OFFSET, so with an index on the
+    filter columns plus created_at every page costs the same regardless of
+    how deep it is. Returns the rows and the cursor for the next page, or
+    None on the last page.
+    """
+    if after is not None:
+        created_at, row_id = after
+        if query.session.get_bind().dialect.name == "sqlite" and not created_at.microsecond:
+            created_at = bindparam("cursor_created_at", created_at, type_=_SQLITE_SECONDS)
+        if ascending:
+            query = query.filter(or_(
+                model.created_at > created_at,
+                and_(model.created_at == created_at, model.id > row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id)
+            ))
+
+    if ascending:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+    else:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    # One extra row tells whether another page follows
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
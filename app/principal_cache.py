@@ -0,0 +1,88 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from sqlalchemy.orm import make_transient_to_detached
+from . import models
+
+# Authenticated users are cached per bearer token for this many seconds (0 disables)
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+class PrincipalCache:
+    """Token -> authenticated user, so repeat requests skip the JWT decode and users query.
+
+    Entries live for ``ttl_seconds`` at most and never past the token's own
+    expiry. Cached users are detached copies, independent of the session that
+    loaded them. ``invalidate_user`` drops every token of a user whose account
+    changed; other workers pick the change up when their entries expire.
+    """
+
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL, max_entries: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[models.User, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self.counters = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def get(self, token: str) -> Optional[models.User]:
+        entry = self._entries.get(token)
+        if entry is not None:
+            user, expires_at = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(token)
+                self.counters["hits"] += 1
+                return user
+            self._drop(token)
+        self.counters["misses"] += 1
+        return None
+
+    def set(self, token: str, user: models.User, token_expires_at: Optional[float] = None):
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        self._drop(token)
+        self._entries[token] = (self._detached_copy(user), expires_at)
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.counters["evictions"] += 1
+
+    def invalidate_user(self, user_id: int):
+        """Forget every cached token of a user"""
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self._drop(token)
+            self.counters["invalidations"] += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+    @staticmethod
+    def _detached_copy(user: models.User) -> models.User:
+        values = {attr.key: getattr(user, attr.key) for attr in models.User.__mapper__.column_attrs}
+        copy = models.User(**values)
+        make_transient_to_detached(copy)
+        return copy
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(self._entries)
+        }
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from .. import crud, models, schemas
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from .. import crud, models, schemas, search
+from ..export import EXPORT_FORMATS, stream_export
+from ..importer import MeetingImporter, iter_lines, upload_chunks
+from ..jobs import job_queue
 from ..database import get_db
-from ..auth import get_current_active_user
+from ..auth import get_current_active_user, principal_cache
+from ..pagination import Cursor, cursor_param, limit_param
+from ..ai_service import ai_service
+from ..semantic_index import semantic_index
 
 router = APIRouter(prefix="/api", tags=["api"])
 
@@ -12,27 +21,27 @@ router = APIRouter(prefix="/api", tags=["api"])
 async def create_workspace(
     workspace: schemas.WorkspaceCreate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new workspace"""
-    return crud.create_workspace(db=db, workspace=workspace, owner_id=current_user.id)
+    return await crud.create_workspace(db=db, workspace=workspace, owner_id=current_user.id)
 
 @router.get("/workspaces", response_model=List[schemas.Workspace])
 async def get_user_workspaces(
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user's workspaces"""
-    return crud.get_user_workspaces(db=db, user_id=current_user.id)
+    return await crud.get_user_workspaces(db=db, user_id=current_user.id)
 
 @router.get("/workspaces/{workspace_id}", response_model=schemas.Workspace)
 async def get_workspace(
     workspace_id: int,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get workspace by ID"""
-    workspace = crud.get_workspace(db=db, workspace_id=workspace_id)
+    workspace = await crud.get_workspace(db=db, workspace_id=workspace_id)
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
     return workspace
@@ -42,57 +51,67 @@ async def get_workspace(
 async def create_project(
     project: schemas.ProjectCreate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new project"""
     # Verify user has access to workspace
-    workspace = crud.get_workspace(db=db, workspace_id=project.workspace_id)
+    workspace = await crud.get_workspace(db=db, workspace_id=project.workspace_id)
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
 
-    return crud.create_project(db=db, project=project)
+    return await crud.create_project(db=db, project=project)
 
 @router.get("/workspaces/{workspace_id}/projects", response_model=List[schemas.Project])
 async def get_workspace_projects(
     workspace_id: int,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get projects in a workspace"""
-    return crud.get_projects_by_workspace(db=db, workspace_id=workspace_id)
+    return await crud.get_projects_by_workspace(db=db, workspace_id=workspace_id)
 
 # Meeting routes
 @router.post("/meetings", response_model=schemas.Meeting)
 async def create_meeting(
     meeting: schemas.MeetingCreate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new meeting"""
     # Verify user has access to project
-    project = crud.get_project(db=db, project_id=meeting.project_id)
+    project = await crud.get_project(db=db, project_id=meeting.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return crud.create_meeting(db=db, meeting=meeting, created_by_id=current_user.id)
+    return await crud.create_meeting(db=db, meeting=meeting, created_by_id=current_user.id)
 
-@router.get("/projects/{project_id}/meetings", response_model=List[schemas.Meeting])
+@router.get("/projects/{project_id}/meetings", response_model=schemas.MeetingPage)
 async def get_project_meetings(
     project_id: int,
+    status: Optional[str] = None,
+    meeting_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    limit: int = Depends(limit_param),
+    after: Optional[Cursor] = Depends(cursor_param),
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get meetings in a project"""
-    return crud.get_meetings_by_project(db=db, project_id=project_id)
+    """Get meetings in a project, newest first"""
+    items, next_cursor = await crud.get_meetings_by_project(
+        db=db, project_id=project_id, limit=limit, after=after, status=status,
+        meeting_type=meeting_type, created_after=created_after, created_before=created_before
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/meetings/{meeting_id}", response_model=schemas.Meeting)
 async def get_meeting(
     meeting_id: int,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get meeting by ID"""
-    meeting = crud.get_meeting(db=db, meeting_id=meeting_id)
+    """Get meeting by ID, including transcript and summary"""
+    meeting = await crud.get_meeting(db=db, meeting_id=meeting_id, with_content=True)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
@@ -102,67 +121,300 @@ async def update_meeting(
     meeting_id: int,
     meeting_update: schemas.MeetingUpdate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update meeting"""
-    meeting = crud.update_meeting(db=db, meeting_id=meeting_id, meeting_update=meeting_update)
+    meeting = await crud.update_meeting(db=db, meeting_id=meeting_id, meeting_update=meeting_update)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
 # Meeting Notes routes
-@router.get("/meetings/{meeting_id}/notes", response_model=List[schemas.MeetingNote])
+@router.get("/meetings/{meeting_id}/notes", response_model=schemas.MeetingNotePage)
 async def get_meeting_notes(
     meeting_id: int,
+    note_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    limit: int = Depends(limit_param),
+    after: Optional[Cursor] = Depends(cursor_param),
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get notes for a meeting"""
-    return crud.get_meeting_notes(db=db, meeting_id=meeting_id)
+    """Get notes for a meeting in chronological order"""
+    items, next_cursor = await crud.get_meeting_notes(
+        db=db, meeting_id=meeting_id, limit=limit, after=after, note_type=note_type,
+        created_after=created_after, created_before=created_before
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.post("/meetings/{meeting_id}/notes", response_model=schemas.MeetingNote)
 async def create_meeting_note(
     meeting_id: int,
     note: schemas.MeetingNoteCreate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a note for a meeting"""
     # Verify meeting exists
-    meeting = crud.get_meeting(db=db, meeting_id=meeting_id)
+    meeting = await crud.get_meeting(db=db, meeting_id=meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    return crud.create_meeting_note(db=db, note=note, created_by_id=current_user.id)
+    return await crud.create_meeting_note(db=db, note=note, created_by_id=current_user.id)
 
 # Task routes
 @router.post("/tasks", response_model=schemas.Task)
 async def create_task(
     task: schemas.TaskCreate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new task"""
-    return crud.create_task(db=db, task=task, created_by_id=current_user.id)
+    return await crud.create_task(db=db, task=task, created_by_id=current_user.id)
 
-@router.get("/projects/{project_id}/tasks", response_model=List[schemas.Task])
+@router.get("/projects/{project_id}/tasks", response_model=schemas.TaskPage)
 async def get_project_tasks(
     project_id: int,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    limit: int = Depends(limit_param),
+    after: Optional[Cursor] = Depends(cursor_param),
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get tasks in a project"""
-    return crud.get_tasks_by_project(db=db, project_id=project_id)
+    """Get tasks in a project, newest first"""
+    items, next_cursor = await crud.get_tasks_by_project(
+        db=db, project_id=project_id, limit=limit, after=after, status=status, priority=priority,
+        assigned_to_id=assigned_to_id, created_after=created_after, created_before=created_before
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.put("/tasks/{task_id}", response_model=schemas.Task)
 async def update_task(
     task_id: int,
     task_update: schemas.TaskUpdate,
     current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update task"""
-    task = crud.update_task(db=db, task_id=task_id, task_update=task_update)
+    task = await crud.update_task(db=db, task_id=task_id, task_update=task_update)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
\ No newline at end of file
+    return task
+
+# Export routes
+async def _user_workspace_ids(db: AsyncSession, user_id: int) -> List[int]:
+    return [workspace.id for workspace in await crud.get_user_workspaces(db, user_id=user_id)]
+
+def _export_response(fmt: str, filename: str, **scope) -> StreamingResponse:
+    export_format = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        stream_export(fmt, **scope),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.extension}"'}
+    )
+
+@router.get("/meetings/{meeting_id}/export")
+async def export_meeting(
+    meeting_id: int,
+    format: str = Query("txt", pattern="^(txt|md|ndjson|srt)$"),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream a meeting and its notes as text, Markdown, NDJSON or SRT subtitles"""
+    workspace_id = await crud.get_meeting_workspace_id(db, meeting_id)
+    if workspace_id is None or workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return _export_response(format, f"meeting-{meeting_id}", meeting_id=meeting_id)
+
+@router.get("/projects/{project_id}/export")
+async def export_project(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(txt|md|ndjson)$"),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream every meeting in a project with its notes"""
+    project = await crud.get_project(db=db, project_id=project_id)
+    if not project or project.workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return _export_response(format, f"project-{project_id}", project_id=project_id)
+
+# Import routes
+@router.post("/projects/{project_id}/import", response_model=schemas.ImportResult)
+async def import_meetings(
+    project_id: int,
+    request: Request,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk import meetings with their segments into a project.
+
+    Accepts an NDJSON body, or multipart/form-data with one or more NDJSON
+    files, in the format the export endpoints write. Summaries and action
+    items for the imported meetings are generated by background jobs.
+    """
+    project = await crud.get_project(db=db, project_id=project_id)
+    if not project or project.workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        uploads = [value for _, value in form.multi_items() if isinstance(value, UploadFile)]
+        if not uploads:
+            raise HTTPException(status_code=400, detail="No files uploaded")
+        chunks = upload_chunks(uploads)
+    else:
+        chunks = request.stream()
+
+    # An oversized line stops the import with a partial result rather than an
+    # error, so the meetings already committed still get their jobs
+    result = await MeetingImporter(db, project_id=project_id, user_id=current_user.id).run(iter_lines(chunks))
+    jobs = await job_queue.enqueue(db, "analysis", result["meeting_ids"], user_id=current_user.id)
+    return {**result, "job_ids": [job.id for job in jobs]}
+
+# AI job routes
+@router.post("/meetings/{meeting_id}/jobs", response_model=schemas.AIJob, status_code=202)
+async def create_meeting_job(
+    meeting_id: int,
+    job: schemas.AIJobCreate,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a summary, action items, sentiment, topics, insights or full analysis job.
+
+    Poll /api/jobs/{id}, or listen for job_completed on the meeting's WebSocket.
+    """
+    workspace_id = await crud.get_meeting_workspace_id(db, meeting_id)
+    if workspace_id is None or workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    jobs = await job_queue.enqueue(db, job.kind, [meeting_id], user_id=current_user.id)
+    return jobs[0]
+
+@router.get("/jobs/{job_id}", response_model=schemas.AIJob)
+async def get_job(
+    job_id: int,
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get an AI job's status, and its result once it has succeeded"""
+    job = await crud.get_ai_job(db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    workspace_id = await crud.get_meeting_workspace_id(db, job.meeting_id)
+    if workspace_id is None or workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# Search routes
+@router.get("/search", response_model=schemas.SearchResults)
+async def search_meetings(
+    q: str = Query(..., min_length=1, max_length=500),
+    workspace_id: Optional[int] = None,
+    speaker: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over meeting titles, summaries, transcripts and notes"""
+    results = await search.search(
+        db, q, user_id=current_user.id, workspace_id=workspace_id, speaker=speaker, limit=limit
+    )
+    return {"query": q, **results}
+
+@router.get("/semantic-search", response_model=schemas.SemanticSearchResults)
+async def semantic_search(
+    q: str = Query(..., min_length=1, max_length=2000),
+    workspace_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Note segments from ended meetings most similar to the query text"""
+    workspace_ids = await _user_workspace_ids(db, current_user.id)
+    if workspace_id is not None:
+        workspace_ids = [i for i in workspace_ids if i == workspace_id]
+    matches = await semantic_index.search(workspace_ids, q, k=limit)
+    notes = {note.id: note for note in await crud.get_meeting_notes_by_ids(db, [m[1] for m in matches])}
+    hits = [
+        {**notes[note_id]._mapping, "note_id": note_id, "score": score}
+        for score, note_id, _ in matches if note_id in notes
+    ]
+    return {"query": q, "hits": hits}
+
+@router.get("/meetings/{meeting_id}/related", response_model=List[schemas.RelatedMeeting])
+async def get_related_meetings(
+    meeting_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Meetings in the same workspace whose discussion is closest to this one"""
+    workspace_id = await crud.get_meeting_workspace_id(db, meeting_id)
+    if workspace_id is None or workspace_id not in await _user_workspace_ids(db, current_user.id):
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    related = await semantic_index.related_meetings(workspace_id, meeting_id, k=limit)
+    meetings = {meeting.id: meeting for meeting in await crud.get_meetings_by_ids(db, [i for i, _ in related])}
+    return [
+        {**meetings[i]._mapping, "score": score}
+        for i, score in related if i in meetings
+    ]
+
+# Dashboard routes
+@router.get("/dashboard", response_model=schemas.Dashboard)
+async def get_dashboard(
+    items_per_project: int = Query(10, ge=1, le=50),
+    current_user: models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the user's workspace -> project -> latest meetings/tasks tree with counts"""
+    tree = await crud.get_dashboard_tree(db=db, user_id=current_user.id)
+    project_ids = [project.id for workspace in tree for project in workspace.projects]
+    meetings = {project_id: [] for project_id in project_ids}
+    tasks = {project_id: [] for project_id in project_ids}
+    if project_ids:
+        for meeting in await crud.get_dashboard_meetings(db, project_ids, items_per_project):
+            meetings[meeting.project_id].append(meeting._mapping)
+        for task in await crud.get_dashboard_tasks(db, project_ids, items_per_project):
+            tasks[task.project_id].append(task._mapping)
+        counts = await crud.get_dashboard_counts(db, project_ids)
+
+    workspaces = [{
+        "id": workspace.id,
+        "name": workspace.name,
+        "description": workspace.description,
+        "created_at": workspace.created_at,
+        "project_count": len(workspace.projects),
+        "projects": [{
+            "id": project.id,
+            "name": project.name,
+            "color": project.color,
+            **counts[project.id],
+            "meetings": meetings[project.id],
+            "tasks": tasks[project.id]
+        } for project in workspace.projects]
+    } for workspace in tree]
+
+    projects = [project for workspace in workspaces for project in workspace["projects"]]
+    return {
+        "workspaces": workspaces,
+        **{
+            key: sum(project[key] for project in projects)
+            for key in ("meeting_count", "active_meeting_count", "task_count", "completed_task_count")
+        }
+    }
+
+# Metrics routes
+@router.get("/metrics")
+async def get_metrics(current_user: models.User = Depends(get_current_active_user)):
+    """Get cache hit/miss, AI job and token usage counters"""
+    return {
+        "llm_cache": ai_service.cache.stats(),
+        "token_usage": ai_service.usage.stats(),
+        "principal_cache": principal_cache.stats(),
+        "jobs": job_queue.stats()
+    }
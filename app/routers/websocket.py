@@ -1,5 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from ..database import get_db
 from ..websocket_manager import meeting_manager
 from .. import crud, models, auth
@@ -15,13 +16,19 @@ async def meeting_websocket(
     websocket: WebSocket,
     meeting_id: int,
     token: str,
-    db: Session = Depends(get_db)
+    last_seq: Optional[int] = None,
+    epoch: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    """WebSocket endpoint for real-time meeting collaboration"""
+    """WebSocket endpoint for real-time meeting collaboration.
+
+    Clients reconnecting with ``last_seq`` (and the ``epoch`` it belongs to)
+    receive the broadcasts they missed, or a resync message.
+    """
 
     # Authenticate user from token
     try:
-        current_user = auth.get_current_user(token=token, db=db)
+        current_user = await auth.get_current_user(token=token, db=db)
         if not current_user or not current_user.is_active:
             await websocket.close(code=1008)  # Policy violation
             return
@@ -31,7 +38,7 @@ async def meeting_websocket(
         return
 
     # Verify user has access to meeting
-    meeting = crud.get_meeting(db=db, meeting_id=meeting_id)
+    meeting = await crud.get_meeting(db=db, meeting_id=meeting_id)
     if not meeting:
         await websocket.close(code=1003)  # Unsupported data
         return
@@ -45,8 +52,14 @@ async def meeting_websocket(
         await websocket.close(code=1008)
         return
 
-    # Connect to meeting
-    await meeting_manager.connection_manager.connect(websocket, meeting_id)
+    # The session is not needed while the socket is open - release its connection
+    await db.close()
+
+    # Connect to meeting, replaying missed broadcasts on reconnect
+    backlog = None
+    if last_seq is not None:
+        backlog = lambda limit: meeting_manager.replay_messages(meeting_id, last_seq, epoch, limit)
+    await meeting_manager.connection_manager.connect(websocket, meeting_id, backlog=backlog)
 
     try:
         while True:
@@ -65,31 +78,48 @@ async def meeting_websocket(
                     "text": data.get("text", ""),
                     "speaker": data.get("speaker", current_user.username),
                     "timestamp": data.get("timestamp"),
-                    "user_id": current_user.id
+                    "user_id": current_user.id,
+                    "idempotency_key": data.get("idempotency_key")
                 }
-                await meeting_manager.add_transcript(meeting_id, transcript_data)
+                # Resent frames carry the same idempotency key and are ignored;
+                # the worker owning the meeting's session checks them
+                accepted = await meeting_manager.add_transcript(
+                    meeting_id, transcript_data, idempotency_key=data.get("idempotency_key")
+                )
+                if not accepted and data.get("idempotency_key"):
+                    # Let the client stop resending a frame that will not be broadcast
+                    await meeting_manager.connection_manager.send_personal_message(
+                        websocket,
+                        {
+                            "type": "transcript_ack",
+                            "data": {"idempotency_key": data.get("idempotency_key")}
+                        }
+                    )
 
             elif message_type == "generate_summary":
-                # Generate AI summary
-                summary = await meeting_manager.generate_summary(meeting_id)
-                await meeting_manager.connection_manager.send_personal_message(
-                    websocket,
-                    {
-                        "type": "summary_generated",
-                        "data": {"summary": summary}
-                    }
-                )
+                # Generate AI summary, streamed as summary_delta frames if asked;
+                # None when another worker owns the meeting and broadcasts it
+                summary = await meeting_manager.generate_summary(meeting_id, stream=bool(data.get("stream")))
+                if summary is not None:
+                    await meeting_manager.connection_manager.send_personal_message(
+                        websocket,
+                        {
+                            "type": "summary_generated",
+                            "data": {"summary": summary}
+                        }
+                    )
 
             elif message_type == "extract_action_items":
                 # Extract action items
                 action_items = await meeting_manager.extract_action_items(meeting_id)
-                await meeting_manager.connection_manager.send_personal_message(
-                    websocket,
-                    {
-                        "type": "action_items_extracted",
-                        "data": {"action_items": action_items}
-                    }
-                )
+                if action_items is not None:
+                    await meeting_manager.connection_manager.send_personal_message(
+                        websocket,
+                        {
+                            "type": "action_items_extracted",
+                            "data": {"action_items": action_items}
+                        }
+                    )
 
             elif message_type == "end_meeting":
                 # End meeting
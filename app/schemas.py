@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -11,6 +11,12 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
+class UserUpdate(BaseModel):
+    email: Optional[str] = None
+    full_name: Optional[str] = None
+    password: Optional[str] = None
+    is_active: Optional[bool] = None
+
 class User(UserBase):
     id: int
     is_active: bool
@@ -108,6 +114,19 @@ class Meeting(MeetingBase):
     class Config:
         from_attributes = True
 
+class MeetingListItem(MeetingBase):
+    """Meeting without transcript, summary and action_items, for list responses"""
+    id: int
+    created_by_id: int
+    end_time: Optional[datetime]
+    duration: Optional[float]
+    status: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
 # Meeting Note schemas
 class MeetingNoteBase(BaseModel):
     content: str
@@ -161,6 +180,167 @@ class Task(TaskBase):
     class Config:
         from_attributes = True
 
+# Paginated list schemas - pass next_cursor back as ?cursor= for the next page
+class MeetingPage(BaseModel):
+    items: List[MeetingListItem]
+    next_cursor: Optional[str] = None
+
+class MeetingNotePage(BaseModel):
+    items: List[MeetingNote]
+    next_cursor: Optional[str] = None
+
+class TaskPage(BaseModel):
+    items: List[Task]
+    next_cursor: Optional[str] = None
+
+# Dashboard schemas - the whole workspace tree in one response
+class DashboardMeeting(BaseModel):
+    id: int
+    title: str
+    status: Optional[str]
+    meeting_type: Optional[str]
+    start_time: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DashboardTask(BaseModel):
+    id: int
+    title: str
+    description: Optional[str]
+    status: Optional[str]
+    priority: Optional[str]
+    assigned_to_id: Optional[int]
+    due_date: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class DashboardProject(BaseModel):
+    id: int
+    name: str
+    color: Optional[str]
+    meeting_count: int
+    active_meeting_count: int
+    task_count: int
+    completed_task_count: int
+    # The latest items_per_project of each; the counts cover all of them
+    meetings: List[DashboardMeeting]
+    tasks: List[DashboardTask]
+
+class DashboardWorkspace(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    created_at: datetime
+    project_count: int
+    projects: List[DashboardProject]
+
+class Dashboard(BaseModel):
+    workspaces: List[DashboardWorkspace]
+    meeting_count: int
+    active_meeting_count: int
+    task_count: int
+    completed_task_count: int
+
+# Search schemas - snippets are HTML-escaped with matches wrapped in <mark>
+class MeetingSearchHit(BaseModel):
+    id: int
+    title: str
+    project_id: int
+    status: Optional[str]
+    created_at: Optional[datetime]
+    snippet: str
+    rank: float
+
+class NoteSearchHit(BaseModel):
+    id: int
+    meeting_id: int
+    meeting_title: str
+    speaker: Optional[str]
+    note_type: Optional[str]
+    timestamp: Optional[datetime]
+    snippet: str
+    rank: float
+
+class SearchResults(BaseModel):
+    query: str
+    meetings: List[MeetingSearchHit]
+    notes: List[NoteSearchHit]
+
+class SemanticSearchHit(BaseModel):
+    note_id: int
+    meeting_id: int
+    meeting_title: str
+    speaker: Optional[str]
+    content: str
+    timestamp: Optional[datetime]
+    score: float
+
+class SemanticSearchResults(BaseModel):
+    query: str
+    hits: List[SemanticSearchHit]
+
+class RelatedMeeting(MeetingListItem):
+    score: float
+
+# Import schemas - the NDJSON records written by the meeting export
+class NoteImport(BaseModel):
+    content: str
+    speaker: Optional[str] = None
+    note_type: Optional[str] = "transcript"
+    timestamp: Optional[datetime] = None
+
+class MeetingImport(BaseModel):
+    title: str
+    description: Optional[str] = None
+    meeting_type: Optional[str] = "general"
+    status: Optional[str] = "completed"
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    duration: Optional[float] = None
+    tags: Optional[List[str]] = []
+    summary: Optional[str] = None
+    action_items: Optional[List[Dict[str, Any]]] = None
+    # Segments inline; "note" records on the following lines are added too
+    segments: List[NoteImport] = []
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+class ImportResult(BaseModel):
+    meetings_created: int
+    notes_created: int
+    meeting_ids: List[int]
+    # Background analysis jobs for the imported meetings
+    job_ids: List[int] = []
+    errors: List[ImportLineError]
+    # False when an oversized line stopped the import; earlier lines were imported
+    complete: bool = True
+
+# AI job schemas - poll /api/jobs/{id} or wait for the job_completed WebSocket event
+class AIJobCreate(BaseModel):
+    kind: str = Field(pattern="^(summary|action_items|sentiment|topics|insights|analysis)$")
+
+class AIJob(BaseModel):
+    id: int
+    kind: str
+    meeting_id: Optional[int]
+    status: str
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
 # WebSocket schemas
 class WebSocketMessage(BaseModel):
     type: str
@@ -183,6 +363,33 @@ class AIActionItemsRequest(BaseModel):
     transcript: str
     summary: Optional[str] = None
 
+class ActionItem(BaseModel):
+    title: str
+    description: Optional[str] = None
+    assignee: Optional[str] = None
+    due_date: Optional[str] = None
+    priority: Optional[str] = "medium"
+
+class SentimentAnalysis(BaseModel):
+    overall: str = "neutral"
+    confidence: float = 0
+    positive_aspects: List[str] = []
+    concerns: List[str] = []
+
+class MeetingInsights(BaseModel):
+    key_decisions: List[str] = []
+    risks_identified: List[str] = []
+    unanswered_questions: List[str] = []
+    recommendations: List[str] = []
+    follow_up_needed: bool = False
+
+class MeetingAnalysis(BaseModel):
+    summary: str = ""
+    action_items: List[ActionItem] = []
+    sentiment: SentimentAnalysis = SentimentAnalysis()
+    topics: List[str] = []
+    insights: MeetingInsights = MeetingInsights()
+
 class AIResponse(BaseModel):
     success: bool
     content: Optional[str] = None
@@ -0,0 +1,294 @@
+import os
+import re
+import html
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Postgres text search configuration used for the tsvector columns and queries
+SEARCH_TS_CONFIG = os.getenv("SEARCH_TS_CONFIG", "english")
+
+# Snippet highlight markers - control characters that cannot survive in user
+# text, swapped for <mark> tags after the snippet has been HTML-escaped
+_MARK_START, _MARK_END = "\x02", "\x03"
+_SNIPPET_TOKENS = 16
+
+SQLITE_DDL = [
+    # External-content FTS5 tables index the rows in place without storing a copy
+    """CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+        title, summary, transcript, content='meetings', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS meeting_notes_fts USING fts5(
+        content, content='meeting_notes', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN
+        INSERT INTO meetings_fts(rowid, title, summary, transcript)
+        VALUES (new.id, new.title, new.summary, new.transcript);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, title, summary, transcript)
+        VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE OF title, summary, transcript ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, title, summary, transcript)
+        VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+        INSERT INTO meetings_fts(rowid, title, summary, transcript)
+        VALUES (new.id, new.title, new.summary, new.transcript);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_insert AFTER INSERT ON meeting_notes BEGIN
+        INSERT INTO meeting_notes_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_delete AFTER DELETE ON meeting_notes BEGIN
+        INSERT INTO meeting_notes_fts(meeting_notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meeting_notes_fts_update AFTER UPDATE OF content ON meeting_notes BEGIN
+        INSERT INTO meeting_notes_fts(meeting_notes_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO meeting_notes_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+def postgres_ddl(ts_config: str = SEARCH_TS_CONFIG) -> List[str]:
+    """Generated tsvector columns (maintained by Postgres on every write) and their GIN indexes"""
+    return [
+        f"""ALTER TABLE meetings ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{ts_config}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{ts_config}', coalesce(summary, '')), 'B') ||
+            setweight(to_tsvector('{ts_config}', coalesce(transcript, '')), 'C')
+        ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_meetings_search_vector ON meetings USING GIN (search_vector)",
+        f"""ALTER TABLE meeting_notes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('{ts_config}', coalesce(content, ''))
+        ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_meeting_notes_search_vector ON meeting_notes USING GIN (search_vector)",
+    ]
+
+def install(connection: Connection):
+    """Create the search index structures if missing.
+
+    Safe to run on every startup, for databases created without the
+    migrations; alembic revision 003 holds its own frozen copy of this DDL.
+    On SQLite, FTS tables created here are back-filled from existing rows;
+    afterwards triggers keep them current.
+    Other databases get no index and search falls back to LIKE.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        existing = {
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE name IN ('meetings_fts', 'meeting_notes_fts')"
+            )
+        }
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        for table in ("meetings_fts", "meeting_notes_fts"):
+            if table not in existing:
+                logger.info(f"Building full-text index {table}")
+                connection.exec_driver_sql(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        for statement in postgres_ddl():
+            connection.exec_driver_sql(statement)
+    else:
+        logger.warning(f"Full-text search is not available on {dialect}; search falls back to LIKE")
+
+def _query_terms(query: str) -> List[List[str]]:
+    """Quoted phrases and single words of a free-text query, each as its list of words"""
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\w+)', query):
+        words = re.findall(r"\w+", phrase) if phrase else [word]
+        if words:
+            terms.append(words)
+    return terms
+
+def fts5_query(query: str) -> str:
+    """Turn free text into an FTS5 query: quoted phrases kept, every other word required"""
+    return " ".join('"' + " ".join(words) + '"' for words in _query_terms(query))
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet and turn the match markers into <mark> tags"""
+    return html.escape(snippet or "").replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+def _scope(user_id: int, workspace_id: Optional[int], params: Dict[str, Any]) -> str:
+    # Only meetings in workspaces the user belongs to are ever searched
+    params["user_id"] = user_id
+    clause = "p.workspace_id IN (SELECT workspace_id FROM workspace_members WHERE user_id = :user_id)"
+    if workspace_id is not None:
+        params["workspace_id"] = workspace_id
+        clause += " AND p.workspace_id = :workspace_id"
+    return clause
+
+def _sqlite_meetings_sql(scope: str) -> str:
+    return f"""
+        SELECT m.id, m.title, m.project_id, m.status, m.created_at,
+               snippet(meetings_fts, -1, char(2), char(3), '…', {_SNIPPET_TOKENS}) AS snippet,
+               -bm25(meetings_fts, 10.0, 4.0, 1.0) AS rank
+        FROM meetings_fts
+        JOIN meetings m ON m.id = meetings_fts.rowid
+        JOIN projects p ON p.id = m.project_id
+        WHERE meetings_fts MATCH :query AND {scope}
+        ORDER BY bm25(meetings_fts, 10.0, 4.0, 1.0)
+        LIMIT :limit
+    """
+
+def _sqlite_notes_sql(scope: str, speaker_filter: str) -> str:
+    return f"""
+        SELECT n.id, n.meeting_id, m.title AS meeting_title, n.speaker, n.note_type, n.timestamp,
+               snippet(meeting_notes_fts, 0, char(2), char(3), '…', {_SNIPPET_TOKENS}) AS snippet,
+               -bm25(meeting_notes_fts) AS rank
+        FROM meeting_notes_fts
+        JOIN meeting_notes n ON n.id = meeting_notes_fts.rowid
+        JOIN meetings m ON m.id = n.meeting_id
+        JOIN projects p ON p.id = m.project_id
+        WHERE meeting_notes_fts MATCH :query AND {scope}{speaker_filter}
+        ORDER BY bm25(meeting_notes_fts)
+        LIMIT :limit
+    """
+
+_HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=35, MinWords=10, MaxFragments=2, FragmentDelimiter=\" … \""
+
+def _postgres_meetings_sql(scope: str) -> str:
+    # ts_headline is costly on long transcripts, so it runs only on the top hits
+    return f"""
+        WITH q AS (SELECT websearch_to_tsquery('{SEARCH_TS_CONFIG}', :query) AS query),
+        hits AS (
+            SELECT m.id, ts_rank_cd(m.search_vector, q.query) AS rank
+            FROM meetings m JOIN projects p ON p.id = m.project_id, q
+            WHERE m.search_vector @@ q.query AND {scope}
+            ORDER BY rank DESC
+            LIMIT :limit
+        )
+        SELECT m.id, m.title, m.project_id, m.status, m.created_at,
+               ts_headline('{SEARCH_TS_CONFIG}', concat_ws(' ', m.title, m.summary, m.transcript), q.query, :headline) AS snippet,
+               hits.rank
+        FROM hits JOIN meetings m ON m.id = hits.id, q
+        ORDER BY hits.rank DESC
+    """
+
+def _postgres_notes_sql(scope: str, speaker_filter: str) -> str:
+    return f"""
+        WITH q AS (SELECT websearch_to_tsquery('{SEARCH_TS_CONFIG}', :query) AS query),
+        hits AS (
+            SELECT n.id, ts_rank_cd(n.search_vector, q.query) AS rank
+            FROM meeting_notes n
+            JOIN meetings m ON m.id = n.meeting_id
+            JOIN projects p ON p.id = m.project_id, q
+            WHERE n.search_vector @@ q.query AND {scope}{speaker_filter}
+            ORDER BY rank DESC
+            LIMIT :limit
+        )
+        SELECT n.id, n.meeting_id, m.title AS meeting_title, n.speaker, n.note_type, n.timestamp,
+               ts_headline('{SEARCH_TS_CONFIG}', n.content, q.query, :headline) AS snippet,
+               hits.rank
+        FROM hits
+        JOIN meeting_notes n ON n.id = hits.id
+        JOIN meetings m ON m.id = n.meeting_id, q
+        ORDER BY hits.rank DESC
+    """
+
+def _like_clause(columns: List[str], terms: List[str], params: Dict[str, Any]) -> str:
+    # Every term must appear in one of the columns
+    clauses = []
+    for i, term in enumerate(terms):
+        escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params[f"term_{i}"] = f"%{escaped}%"
+        clauses.append("(" + " OR ".join(f"lower({column}) LIKE :term_{i} ESCAPE '\\'" for column in columns) + ")")
+    return " AND ".join(clauses)
+
+def _like_snippet(texts: List[Optional[str]], terms: List[str], width: int = 120) -> str:
+    """Marked window around the first term found in the first text containing one"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    for value in texts:
+        match = pattern.search(value or "")
+        if match:
+            start = max(0, match.start() - width // 2)
+            window = value[start:start + width]
+            marked = pattern.sub(lambda m: f"{_MARK_START}{m.group(0)}{_MARK_END}", window)
+            return ("…" if start else "") + marked + ("…" if start + width < len(value) else "")
+    return ""
+
+async def _like_search(
+    db: AsyncSession,
+    query: str,
+    scope: str,
+    speaker_filter: str,
+    params: Dict[str, Any],
+    include_meetings: bool
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Unindexed substring search for databases without full-text support; newest first, unranked"""
+    results = {"meetings": [], "notes": []}
+    terms = [" ".join(words) for words in _query_terms(query)]
+    if not terms:
+        return results
+
+    if include_meetings:
+        rows = (await db.execute(text(f"""
+            SELECT m.id, m.title, m.project_id, m.status, m.created_at, m.summary, m.transcript
+            FROM meetings m JOIN projects p ON p.id = m.project_id
+            WHERE {_like_clause(["m.title", "m.summary", "m.transcript"], terms, params)} AND {scope}
+            ORDER BY m.created_at DESC, m.id DESC
+            LIMIT :limit
+        """), params)).mappings().all()
+        results["meetings"] = [{
+            "id": row["id"], "title": row["title"], "project_id": row["project_id"],
+            "status": row["status"], "created_at": row["created_at"], "rank": 0.0,
+            "snippet": highlight(_like_snippet([row["title"], row["summary"], row["transcript"]], terms))
+        } for row in rows]
+
+    rows = (await db.execute(text(f"""
+        SELECT n.id, n.meeting_id, m.title AS meeting_title, n.speaker, n.note_type, n.timestamp, n.content
+        FROM meeting_notes n
+        JOIN meetings m ON m.id = n.meeting_id
+        JOIN projects p ON p.id = m.project_id
+        WHERE {_like_clause(["n.content"], terms, params)} AND {scope}{speaker_filter}
+        ORDER BY n.timestamp DESC, n.id DESC
+        LIMIT :limit
+    """), params)).mappings().all()
+    results["notes"] = [{
+        **{key: value for key, value in row.items() if key != "content"}, "rank": 0.0,
+        "snippet": highlight(_like_snippet([row["content"]], terms))
+    } for row in rows]
+    return results
+
+async def search(
+    db: AsyncSession,
+    query: str,
+    user_id: int,
+    workspace_id: Optional[int] = None,
+    speaker: Optional[str] = None,
+    limit: int = 20
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Ranked meeting and note matches with highlighted snippets.
+
+    Meetings match on title, summary and transcript; notes on their content.
+    A speaker filter applies to notes only, so meeting hits are skipped then.
+    """
+    results = {"meetings": [], "notes": []}
+    dialect = db.get_bind().dialect.name
+    params: Dict[str, Any] = {"limit": limit}
+    scope = _scope(user_id, workspace_id, params)
+    speaker_filter = ""
+    if speaker is not None:
+        params["speaker"] = speaker
+        speaker_filter = " AND n.speaker = :speaker"
+
+    if dialect == "sqlite":
+        query = fts5_query(query)
+        meetings_sql, notes_sql = _sqlite_meetings_sql(scope), _sqlite_notes_sql(scope, speaker_filter)
+    elif dialect == "postgresql":
+        params["headline"] = _HEADLINE_OPTIONS
+        meetings_sql, notes_sql = _postgres_meetings_sql(scope), _postgres_notes_sql(scope, speaker_filter)
+    else:
+        return await _like_search(db, query, scope, speaker_filter, params, include_meetings=speaker is None)
+    if not query.strip():
+        return results
+    params["query"] = query
+
+    if speaker is None:
+        rows = (await db.execute(text(meetings_sql), params)).mappings().all()
+        results["meetings"] = [{**row, "snippet": highlight(row["snippet"])} for row in rows]
+    rows = (await db.execute(text(notes_sql), params)).mappings().all()
+    results["notes"] = [{**row, "snippet": highlight(row["snippet"])} for row in rows]
+    return results
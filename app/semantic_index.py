@@ -0,0 +1,234 @@
+import os
+import re
+import math
+import zlib
+import fcntl
+import asyncio
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from . import crud
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Local embedding index over meeting note segments. One partition per
+# workspace, each a memory-mapped float32 matrix plus a (note_id, meeting_id)
+# table, appended to as meetings end or are imported. Meetings from before
+# the index existed are added by index_meetings.py.
+SEMANTIC_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", "./semantic_index")
+SEMANTIC_INDEX_DIM = int(os.getenv("SEMANTIC_INDEX_DIM", "512"))
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here
+hers him his how i if in into is it its just me more most my no nor not now of off on once only or other
+our out over own same she should so some such than that the their them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would
+you your yeah okay ok um uh like really think going know get got go
+""".split())
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping so "pricing", "priced" and "prices" share a feature
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+class HashingVectorizer:
+    """Stateless text -> vector mapping: hashed unigrams and bigrams, sublinear TF, L2-normalized"""
+
+    def __init__(self, dim: int = SEMANTIC_INDEX_DIM):
+        self.dim = dim
+
+    def features(self, text: str) -> List[str]:
+        words = [_stem(w) for w in TOKEN_PATTERN.findall(text.lower()) if len(w) > 1 and w not in STOP_WORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def transform(self, texts: Iterable[str]) -> np.ndarray:
+        rows, cols, values = [], [], []
+        n = 0
+        for n, text in enumerate(texts, start=1):
+            for feature, count in Counter(self.features(text or "")).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                rows.append(n - 1)
+                cols.append(h % self.dim)
+                # A hash-derived sign keeps collisions from only ever adding up
+                values.append((1.0 + math.log(count)) * (1.0 if h & 0x80000000 else -1.0))
+
+        matrix = np.zeros((n, self.dim), dtype=np.float32)
+        if rows:
+            np.add.at(matrix, (np.array(rows), np.array(cols)), np.array(values, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+class _Partition:
+    """One workspace's vectors (n x dim float32) and ids (n x 2 int64: note_id, meeting_id)"""
+
+    def __init__(self, directory: Path, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = directory / "vectors.f32"
+        self.ids_path = directory / "ids.i64"
+        self._rows = -1
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+
+    def load(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Memory-map the partition, remapping only when rows were appended"""
+        if not self.vectors_path.exists() or not self.ids_path.exists():
+            return np.zeros((0, self.dim), dtype=np.float32), np.zeros((0, 2), dtype=np.int64)
+        # Another worker may be mid-append; only rows present in both files count
+        rows = min(
+            self.vectors_path.stat().st_size // (4 * self.dim),
+            self.ids_path.stat().st_size // 16
+        )
+        if rows != self._rows:
+            if rows == 0:
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+                self._ids = np.zeros((0, 2), dtype=np.int64)
+            else:
+                self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                self._ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(rows, 2))
+            self._rows = rows
+        return self._vectors, self._ids
+
+    def contains(self, meeting_id: int) -> bool:
+        _, ids = self.load()
+        return bool(len(ids)) and bool(np.any(ids[:, 1] == meeting_id))
+
+    def append(self, meeting_id: int, vectors: np.ndarray, ids: np.ndarray) -> bool:
+        """Append one meeting's rows; False when it is already in the partition"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "lock", "w") as lock:
+            # Serializes appends across worker processes sharing the directory;
+            # the check runs under the lock so two workers cannot both add a meeting
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self.contains(meeting_id):
+                return False
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self.ids_path, "ab") as f:
+                f.write(np.ascontiguousarray(ids, dtype=np.int64).tobytes())
+        return True
+
+class SemanticIndex:
+    """Cosine top-k over hashed segment vectors, partitioned by workspace.
+
+    Vectors are unit length, so cosine similarity is a single matrix-vector
+    product over the memory-mapped partition. Numeric work runs in the
+    default executor to keep the event loop free.
+    """
+
+    def __init__(self, root: str = SEMANTIC_INDEX_DIR, dim: int = SEMANTIC_INDEX_DIM):
+        self.root = Path(root)
+        self.vectorizer = HashingVectorizer(dim)
+        self._partitions: Dict[int, _Partition] = {}
+        self._lock = threading.Lock()
+
+    def _partition(self, workspace_id: int) -> _Partition:
+        with self._lock:
+            if workspace_id not in self._partitions:
+                self._partitions[workspace_id] = _Partition(
+                    self.root / f"workspace_{workspace_id}", self.vectorizer.dim
+                )
+            return self._partitions[workspace_id]
+
+    def add(self, workspace_id: int, meeting_id: int, notes: List[Tuple[int, str]]) -> int:
+        """Append a meeting's (note_id, content) segments; a meeting already indexed is skipped"""
+        partition = self._partition(workspace_id)
+        # Skips the vectorizing in the common case; append checks again under its lock
+        if not notes or partition.contains(meeting_id):
+            return 0
+        vectors = self.vectorizer.transform(content for _, content in notes)
+        ids = np.array([(note_id, meeting_id) for note_id, _ in notes], dtype=np.int64)
+        return len(notes) if partition.append(meeting_id, vectors, ids) else 0
+
+    def query(self, workspace_ids: List[int], text: str, k: int = 10) -> List[Tuple[float, int, int]]:
+        """Top-k (score, note_id, meeting_id) segments across the given workspaces"""
+        q = self.vectorizer.transform([text])[0]
+        if not q.any():
+            return []
+        hits: List[Tuple[float, int, int]] = []
+        for workspace_id in workspace_ids:
+            vectors, ids = self._partition(workspace_id).load()
+            if not len(vectors):
+                continue
+            scores = vectors @ q
+            top = _top_k(scores, k)
+            hits.extend((float(scores[i]), int(ids[i, 0]), int(ids[i, 1])) for i in top if scores[i] > 0)
+        hits.sort(reverse=True)
+        return hits[:k]
+
+    def related(self, workspace_id: int, meeting_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        """Meetings whose segments best match the centroid of this meeting's segments"""
+        vectors, ids = self._partition(workspace_id).load()
+        own = ids[:, 1] == meeting_id if len(ids) else np.zeros(0, dtype=bool)
+        if not own.any():
+            return []
+        centroid = np.asarray(vectors[own]).mean(axis=0)
+        norm = np.linalg.norm(centroid)
+        if norm == 0:
+            return []
+        scores = vectors @ (centroid / norm)
+
+        # Best segment score per other meeting
+        meetings, inverse = np.unique(np.asarray(ids[:, 1]), return_inverse=True)
+        best = np.full(len(meetings), -np.inf, dtype=np.float32)
+        np.maximum.at(best, inverse, scores)
+        best[meetings == meeting_id] = -np.inf
+        top = _top_k(best, k)
+        return [(int(meetings[i]), float(best[i])) for i in top if best[i] > 0]
+
+    async def search(self, workspace_ids: List[int], text: str, k: int = 10) -> List[Tuple[float, int, int]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.query, workspace_ids, text, k)
+
+    async def related_meetings(self, workspace_id: int, meeting_id: int, k: int = 5) -> List[Tuple[int, float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.related, workspace_id, meeting_id, k)
+
+    async def index_meeting(self, meeting_id: int) -> int:
+        """Load a meeting's notes and append them to its workspace partition"""
+        async with AsyncSessionLocal() as db:
+            workspace_id = await crud.get_meeting_workspace_id(db, meeting_id)
+            notes = await crud.get_meeting_segments(db, meeting_id)
+        if workspace_id is None or not notes:
+            return 0
+        loop = asyncio.get_running_loop()
+        added = await loop.run_in_executor(
+            None, self.add, workspace_id, meeting_id, [(note.id, note.content) for note in notes]
+        )
+        logger.info(f"Indexed {added} segments of meeting {meeting_id} for semantic search")
+        return added
+
+    async def backfill(self, batch_size: int = 500) -> Tuple[int, int]:
+        """Index every meeting with notes that is not indexed yet; returns (meetings, segments) added"""
+        meetings = segments = 0
+        after_id = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                meeting_ids = await crud.get_meeting_ids_with_notes(db, after_id=after_id, limit=batch_size)
+            if not meeting_ids:
+                return meetings, segments
+            for meeting_id in meeting_ids:
+                added = await self.index_meeting(meeting_id)
+                if added:
+                    meetings += 1
+                    segments += added
+            after_id = meeting_ids[-1]
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first"""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates])]
+
+semantic_index = SemanticIndex()
@@ -0,0 +1,163 @@
+import os
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+# Models by cost - the small tier is fast and cheap, the large tier is kept
+# for long meetings, where the extra quality is worth the latency
+AI_SMALL_MODEL = os.getenv("AI_SMALL_MODEL", "llama-3.1-8b-instant")
+AI_SMALL_CONTEXT_TOKENS = int(os.getenv("AI_SMALL_CONTEXT_TOKENS", "131072"))
+AI_LARGE_MODEL = os.getenv("AI_LARGE_MODEL", "llama-3.3-70b-versatile")
+AI_LARGE_CONTEXT_TOKENS = int(os.getenv("AI_LARGE_CONTEXT_TOKENS", "131072"))
+# Meetings up to this many transcript tokens (about half an hour of speech)
+# use the small tier
+AI_SMALL_TIER_MAX_TOKENS = int(os.getenv("AI_SMALL_TIER_MAX_TOKENS", "6000"))
+
+# English text runs about four characters per token with the Llama
+# tokenizers; chat formatting adds a few tokens per message
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 8
+# Part of each context window left free for estimation error
+CONTEXT_SAFETY_MARGIN = 0.1
+MIN_OUTPUT_TOKENS = 256
+RECENT_CALLS = 50
+
+@dataclass(frozen=True)
+class ModelTier:
+    name: str
+    model: str
+    context_tokens: int
+
+    @property
+    def usable_tokens(self) -> int:
+        return int(self.context_tokens * (1 - CONTEXT_SAFETY_MARGIN))
+
+def build_tiers(small: ModelTier, large: ModelTier) -> Dict[str, ModelTier]:
+    """Tiers by name; long meetings move to the large tier, so it must hold at least as much"""
+    if large.context_tokens < small.context_tokens:
+        raise ValueError(
+            f"Large model {large.model} has a smaller context ({large.context_tokens} tokens) "
+            f"than small model {small.model} ({small.context_tokens} tokens)"
+        )
+    return {"small": small, "large": large}
+
+MODEL_TIERS: Dict[str, ModelTier] = build_tiers(
+    ModelTier("small", AI_SMALL_MODEL, AI_SMALL_CONTEXT_TOKENS),
+    ModelTier("large", AI_LARGE_MODEL, AI_LARGE_CONTEXT_TOKENS),
+)
+
+@dataclass
+class BudgetPlan:
+    tier: ModelTier
+    prompt: str
+    max_tokens: int
+    prompt_tokens: int  # estimated, including message overhead
+    source_tokens: int
+    trimmed_tokens: int = 0
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def choose_tier(source_tokens: int) -> ModelTier:
+    """Tier for a call standing for a transcript of this many tokens"""
+    if source_tokens <= AI_SMALL_TIER_MAX_TOKENS:
+        return MODEL_TIERS["small"]
+    return MODEL_TIERS["large"]
+
+def trim_middle(text: str, max_chars: int) -> str:
+    """Cut the middle of text, at line boundaries, keeping its opening and the latest lines"""
+    if len(text) <= max_chars:
+        return text
+    half = max(0, max_chars // 2)
+    head, tail = text[:half], text[len(text) - half:] if half else ""
+    if "\n" in head:
+        head = head[:head.rfind("\n")]
+    if "\n" in tail:
+        tail = tail[tail.find("\n") + 1:]
+    omitted = len(text) - len(head) - len(tail)
+    return f"{head}\n[... {omitted} characters omitted to fit the model context ...]\n{tail}"
+
+def plan_completion(
+    build_prompt: Callable[[str], str],
+    source: str,
+    max_tokens: int,
+    source_tokens: Optional[int] = None
+) -> BudgetPlan:
+    """Pick a model for a prompt built around source, and make it fit.
+
+    The tier follows source_tokens - the size of the transcript the call
+    stands for, which is larger than source when the transcript was
+    condensed first. A prompt that does not fit moves to a tier with room
+    for it; failing that, max_tokens shrinks to MIN_OUTPUT_TOKENS and then
+    the middle of source is cut.
+    """
+    prompt = build_prompt(source)
+    prompt_tokens = estimate_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS
+    if source_tokens is None:
+        source_tokens = estimate_tokens(source)
+
+    def fits(tier: ModelTier) -> bool:
+        return prompt_tokens + max_tokens <= tier.usable_tokens
+
+    tier = choose_tier(source_tokens)
+    if not fits(tier):
+        roomier = [candidate for candidate in MODEL_TIERS.values() if fits(candidate)]
+        tier = roomier[0] if roomier else max(MODEL_TIERS.values(), key=lambda candidate: candidate.context_tokens)
+
+    max_tokens = max(MIN_OUTPUT_TOKENS, min(max_tokens, tier.usable_tokens - prompt_tokens))
+    trimmed_tokens = 0
+    overflow = prompt_tokens + max_tokens - tier.usable_tokens
+    if overflow > 0:
+        prompt = build_prompt(trim_middle(source, len(source) - overflow * CHARS_PER_TOKEN))
+        trimmed_prompt_tokens = estimate_tokens(prompt) + MESSAGE_OVERHEAD_TOKENS
+        trimmed_tokens = prompt_tokens - trimmed_prompt_tokens
+        prompt_tokens = trimmed_prompt_tokens
+
+    return BudgetPlan(tier, prompt, max_tokens, prompt_tokens, source_tokens, trimmed_tokens)
+
+class TokenUsage:
+    """Estimated against reported token counts per model, for /api/metrics"""
+
+    def __init__(self, recent: int = RECENT_CALLS):
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=recent)
+
+    def record(self, plan: BudgetPlan, usage: Any):
+        """Count one completion; usage is the API's usage block, if it sent one"""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        totals = self.models.setdefault(plan.tier.model, {
+            "calls": 0, "trimmed_calls": 0, "estimated_prompt_tokens": 0,
+            "reported_calls": 0, "reported_estimated_prompt_tokens": 0,
+            "prompt_tokens": 0, "completion_tokens": 0
+        })
+        totals["calls"] += 1
+        totals["trimmed_calls"] += bool(plan.trimmed_tokens)
+        totals["estimated_prompt_tokens"] += plan.prompt_tokens
+        if prompt_tokens is not None:
+            totals["reported_calls"] += 1
+            totals["reported_estimated_prompt_tokens"] += plan.prompt_tokens
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens or 0
+        self.recent.append({
+            "model": plan.tier.model,
+            "tier": plan.tier.name,
+            "source_tokens": plan.source_tokens,
+            "estimated_prompt_tokens": plan.prompt_tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "max_tokens": plan.max_tokens,
+            "trimmed_tokens": plan.trimmed_tokens
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        models = {}
+        for model, totals in self.models.items():
+            # Above 1 the estimator overcounts, below 1 it undercounts
+            ratio = (
+                round(totals["reported_estimated_prompt_tokens"] / totals["prompt_tokens"], 3)
+                if totals["prompt_tokens"] else None
+            )
+            models[model] = {**totals, "estimate_ratio": ratio}
+        return {"models": models, "recent": list(self.recent)}
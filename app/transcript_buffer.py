@@ -0,0 +1,150 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy.exc import DataError, IntegrityError
+from . import models
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Live transcript segments are written to meeting_notes in batches, once this
+# many are pending or this many milliseconds after the first pending one
+TRANSCRIPT_FLUSH_SEGMENTS = int(os.getenv("TRANSCRIPT_FLUSH_SEGMENTS", "50"))
+TRANSCRIPT_FLUSH_INTERVAL_MS = int(os.getenv("TRANSCRIPT_FLUSH_INTERVAL_MS", "2000"))
+# Failed writes are retried with exponential backoff up to this delay; past
+# TRANSCRIPT_MAX_PENDING queued segments the oldest are dropped
+TRANSCRIPT_RETRY_MAX_MS = int(os.getenv("TRANSCRIPT_RETRY_MAX_MS", "60000"))
+TRANSCRIPT_MAX_PENDING = int(os.getenv("TRANSCRIPT_MAX_PENDING", "10000"))
+
+RowWriter = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            pass
+    return datetime.now(timezone.utc)
+
+def segment_to_row(meeting_id: int, segment: Dict) -> Dict[str, Any]:
+    """MeetingNote column values for a live transcript segment"""
+    return {
+        "meeting_id": meeting_id,
+        "timestamp": _parse_timestamp(segment.get("timestamp")),
+        "speaker": segment.get("speaker"),
+        "content": segment.get("text", ""),
+        "note_type": "transcript",
+        "created_by_id": segment.get("user_id")
+    }
+
+async def insert_note_rows(rows: List[Dict[str, Any]]):
+    """Bulk insert meeting_notes rows in one transaction"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(models.MeetingNote.__table__.insert(), rows)
+        await db.commit()
+
+class TranscriptWriteBuffer:
+    """Write-behind buffer batching live transcript segments into meeting_notes.
+
+    A batch the database rejects row by row (integrity or data errors) is
+    split until the offending rows are found; those are logged and dropped.
+    Any other failure keeps the batch and retries it with backoff.
+    """
+
+    def __init__(
+        self,
+        flush_segments: int = TRANSCRIPT_FLUSH_SEGMENTS,
+        flush_interval_ms: int = TRANSCRIPT_FLUSH_INTERVAL_MS,
+        writer: RowWriter = insert_note_rows,
+        retry_max_ms: int = TRANSCRIPT_RETRY_MAX_MS,
+        max_pending: int = TRANSCRIPT_MAX_PENDING
+    ):
+        self.flush_segments = flush_segments
+        self.flush_interval = flush_interval_ms / 1000
+        self.writer = writer
+        self.retry_max = retry_max_ms / 1000
+        self.max_pending = max_pending
+        self.rows: List[Dict[str, Any]] = []
+        # Consecutive failed flushes; while non-zero, only the retry timer flushes
+        self.failures = 0
+        self.counters = {"written": 0, "rejected": 0, "overflowed": 0}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def add(self, meeting_id: int, segment: Dict):
+        """Queue a segment; a flush is scheduled by count or time"""
+        self.rows.append(segment_to_row(meeting_id, segment))
+        if len(self.rows) > self.max_pending:
+            overflow = len(self.rows) - self.max_pending
+            del self.rows[:overflow]
+            self.counters["overflowed"] += overflow
+            logger.error(f"Transcript buffer full, dropped the {overflow} oldest unsaved segments")
+        if len(self.rows) >= self.flush_segments and not self.failures:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._schedule_flush)
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        """Write every pending segment now"""
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            rows, self.rows = self.rows, []
+            if not rows:
+                return
+            try:
+                await self._write(rows)
+            except _WriteFailed as e:
+                # Keep what was not written for the next attempt
+                self.rows = e.rows + self.rows
+                self.failures += 1
+                delay = min(self.retry_max, self.flush_interval * 2 ** self.failures)
+                logger.warning(
+                    f"Failed to persist {len(e.rows)} transcript segments "
+                    f"(attempt {self.failures}), retrying in {delay:.1f}s: {e.__cause__!r}"
+                )
+                self._timer = asyncio.get_running_loop().call_later(delay, self._schedule_flush)
+                return
+            self.failures = 0
+
+        # Segments that arrived while writing may already be due
+        if len(self.rows) >= self.flush_segments:
+            self._schedule_flush()
+        elif self.rows and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._schedule_flush)
+
+    async def _write(self, rows: List[Dict[str, Any]]):
+        """Write rows, bisecting batches the database rejects to drop just the bad rows"""
+        batches = [rows]
+        while batches:
+            batch = batches.pop()
+            try:
+                await self.writer(batch)
+                self.counters["written"] += len(batch)
+            except (IntegrityError, DataError) as e:
+                if len(batch) == 1:
+                    self.counters["rejected"] += 1
+                    logger.error(f"Dropping transcript segment the database rejects: {batch[0]!r} ({e.orig!r})")
+                    continue
+                middle = len(batch) // 2
+                batches += [batch[middle:], batch[:middle]]
+            except Exception as e:
+                raise _WriteFailed([row for pending in [batch] + batches[::-1] for row in pending]) from e
+
+class _WriteFailed(Exception):
+    """A write failed for a reason other than the rows themselves"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        super().__init__(f"{len(rows)} rows not written")
+        self.rows = rows
@@ -1,26 +1,133 @@
-from typing import Dict, List, Set
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+import os
 import json
+import time
+import uuid
+import asyncio
 import logging
+import itertools
+from collections import OrderedDict, deque
 from fastapi import WebSocket
-from . import models, schemas
+from . import crud, models, schemas
 from .ai_service import ai_service
+from .database import AsyncSessionLocal
+from .broadcast import BroadcastBackend, DeliverHandler, InProcessBackend, create_backend
+from .transcript_buffer import TranscriptWriteBuffer
+from .semantic_index import SemanticIndex, semantic_index
 
 logger = logging.getLogger(__name__)
 
+# Rolling summary settings - the running summary is refreshed once this many
+# new segments have arrived, or after this many seconds with pending segments
+ROLLING_SUMMARY_ENABLED = os.getenv("ROLLING_SUMMARY_ENABLED", "true").lower() == "true"
+ROLLING_SUMMARY_SEGMENTS = int(os.getenv("ROLLING_SUMMARY_SEGMENTS", "20"))
+ROLLING_SUMMARY_INTERVAL = float(os.getenv("ROLLING_SUMMARY_INTERVAL", "60"))
+
+# Token streaming of summaries - the end-of-meeting rolling summary update
+# streams when enabled, requested summaries when the client asks; deltas are
+# coalesced into at most one frame per interval
+SUMMARY_STREAMING = os.getenv("SUMMARY_STREAMING", "true").lower() == "true"
+SUMMARY_STREAM_INTERVAL = float(os.getenv("SUMMARY_STREAM_INTERVAL", "0.05"))
+
+# Outbound messages buffered per connection before it counts as a slow consumer
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+
+# Recent broadcasts kept per meeting for reconnecting clients, and transcript
+# idempotency keys remembered per meeting for duplicate suppression. A
+# replay must fit in a fresh send queue, so the buffer is the smaller of the two
+REPLAY_BUFFER_SIZE = int(os.getenv("REPLAY_BUFFER_SIZE", "200"))
+IDEMPOTENCY_KEYS_PER_MEETING = 1000
+
+if REPLAY_BUFFER_SIZE >= WS_SEND_QUEUE_SIZE:
+    raise ValueError(
+        f"REPLAY_BUFFER_SIZE ({REPLAY_BUFFER_SIZE}) must be smaller than WS_SEND_QUEUE_SIZE ({WS_SEND_QUEUE_SIZE})"
+    )
+
+class ConnectionWriter:
+    """Bounded outbound queue for one websocket, drained by its own task.
+
+    A slow client only fills its own queue; it never delays delivery to
+    other participants.
+    """
+
+    def __init__(self, websocket: WebSocket, on_error: Callable[[WebSocket], None], max_queue: int):
+        self.websocket = websocket
+        self.on_error = on_error
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.task = asyncio.create_task(self._run())
+
+    def send(self, text: str) -> bool:
+        """Queue an encoded message; False when the queue is past its high-water mark"""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self):
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to send message to connection: {e}")
+            self.on_error(self.websocket)
+
+    def close(self):
+        self.task.cancel()
+
+def encode_message(message: Dict) -> str:
+    """Serialize a message once for every recipient"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, send_queue_size: int = WS_SEND_QUEUE_SIZE, backend: Optional[BroadcastBackend] = None):
+        self.send_queue_size = send_queue_size
+        # Carries broadcasts to every worker; delivery to local sockets happens in _deliver_local
+        self.backend = backend if backend is not None else InProcessBackend()
+        self.backend.set_handler(self._deliver_local)
+        # Meetings this worker is subscribed to on the backend
+        self.subscribed_meetings: Set[int] = set()
+        self._subscription_lock = asyncio.Lock()
         # meeting_id -> set of websockets
         self.active_connections: Dict[int, Set[WebSocket]] = {}
         # websocket -> meeting_id
         self.connection_meetings: Dict[WebSocket, int] = {}
+        # websocket -> outbound writer
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        # Sees every message delivered here, and every meeting this worker stops receiving
+        self.on_deliver: Optional[DeliverHandler] = None
+        self.on_unsubscribe: Optional[Callable[[int], None]] = None
+        # Unsubscribes and slow-consumer closes started from sync callbacks
+        self.background_tasks: Set[asyncio.Task] = set()
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        meeting_id: int,
+        backlog: Optional[Callable[[int], List[Dict]]] = None
+    ):
+        """Connect a websocket to a meeting.
 
-    async def connect(self, websocket: WebSocket, meeting_id: int):
-        """Connect a websocket to a meeting"""
+        ``backlog(limit)`` returns at most ``limit`` messages - what fits in
+        the new connection's send queue. They are queued ahead of any live
+        broadcast, so a reconnecting client sees events in order.
+        """
         await websocket.accept()
+        writer = self.writers[websocket] = ConnectionWriter(websocket, self.disconnect, self.send_queue_size)
+        for message in (backlog(self.send_queue_size) if backlog is not None else ()):
+            self._enqueue(websocket, encode_message(message))
+        if websocket not in self.writers:
+            # The backlog overflowed the queue and the connection was dropped
+            return
         if meeting_id not in self.active_connections:
             self.active_connections[meeting_id] = set()
         self.active_connections[meeting_id].add(websocket)
         self.connection_meetings[websocket] = meeting_id
+        await self._sync_subscription(meeting_id)
         logger.info(f"WebSocket connected to meeting {meeting_id}")
 
     def disconnect(self, websocket: WebSocket):
@@ -30,49 +137,184 @@ class ConnectionManager:
             self.active_connections[meeting_id].discard(websocket)
             if not self.active_connections[meeting_id]:
                 del self.active_connections[meeting_id]
+                task = asyncio.create_task(self._sync_subscription(meeting_id))
+                self.background_tasks.add(task)
+                task.add_done_callback(self.background_tasks.discard)
         if websocket in self.connection_meetings:
             del self.connection_meetings[websocket]
+        writer = self.writers.pop(websocket, None)
+        if writer is not None:
+            writer.close()
         logger.info(f"WebSocket disconnected from meeting {meeting_id}")
 
+    async def _sync_subscription(self, meeting_id: int):
+        """Subscribe while the meeting has local connections, unsubscribe after the last leaves"""
+        async with self._subscription_lock:
+            wanted = meeting_id in self.active_connections
+            if wanted and meeting_id not in self.subscribed_meetings:
+                await self.backend.subscribe(meeting_id)
+                self.subscribed_meetings.add(meeting_id)
+            elif not wanted and meeting_id in self.subscribed_meetings:
+                await self.backend.unsubscribe(meeting_id)
+                self.subscribed_meetings.discard(meeting_id)
+                if self.on_unsubscribe is not None:
+                    self.on_unsubscribe(meeting_id)
+
+    async def start(self):
+        await self.backend.start()
+
+    async def stop(self):
+        if self.background_tasks:
+            await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        await self.backend.stop()
+
+    def _enqueue(self, websocket: WebSocket, text: str):
+        writer = self.writers.get(websocket)
+        if writer is None or writer.send(text):
+            return
+
+        # Slow consumer past the high-water mark - drop it so it reconnects
+        logger.warning(f"Dropping slow WebSocket consumer in meeting {self.connection_meetings.get(websocket)}")
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close_slow_consumer(websocket))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def _close_slow_consumer(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception as e:
+            # Usually already gone - the reason it stopped reading
+            logger.debug(f"Closing slow WebSocket consumer failed: {e}")
+
     async def broadcast_to_meeting(self, meeting_id: int, message: Dict):
-        """Broadcast message to all connections in a meeting"""
-        if meeting_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[meeting_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send message to connection: {e}")
-                    disconnected.add(connection)
+        """Broadcast message to all connections in a meeting, on every worker"""
+        await self.backend.publish(meeting_id, encode_message(message))
 
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.disconnect(conn)
+    def _deliver_local(self, meeting_id: int, text: str):
+        """Hand an encoded message to this worker's connections in the meeting"""
+        if self.on_deliver is not None:
+            self.on_deliver(meeting_id, text)
+        for connection in list(self.active_connections.get(meeting_id, ())):
+            self._enqueue(connection, text)
 
     async def send_personal_message(self, websocket: WebSocket, message: Dict):
         """Send message to a specific websocket"""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.warning(f"Failed to send personal message: {e}")
-            self.disconnect(websocket)
+        self._enqueue(websocket, encode_message(message))
+
+class SummaryStream:
+    """Relays one summary to a meeting's participants while it is generated.
+
+    Deltas go out as "summary_delta" frames without a sequence number, so
+    they are not replayed on reconnect; the final event carrying the full
+    text and the same stream_id is.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, connection_manager: ConnectionManager, meeting_id: int):
+        self.connection_manager = connection_manager
+        self.meeting_id = meeting_id
+        self.id = next(self._ids)
+
+    async def relay(self, chunks: AsyncIterator[str]) -> str:
+        """Broadcast chunks as they arrive and return the full text.
+
+        The first chunk is sent at once; later ones are batched per interval.
+        """
+        parts: List[str] = []
+        pending: List[str] = []
+        last_sent: Optional[float] = None
+        async for delta in chunks:
+            parts.append(delta)
+            pending.append(delta)
+            now = time.monotonic()
+            if last_sent is None or now - last_sent >= SUMMARY_STREAM_INTERVAL:
+                await self._send("".join(pending))
+                pending.clear()
+                last_sent = now
+        if pending:
+            await self._send("".join(pending))
+        return "".join(parts)
+
+    async def _send(self, delta: str):
+        await self.connection_manager.broadcast_to_meeting(
+            self.meeting_id,
+            {
+                "type": "summary_delta",
+                "data": {"meeting_id": self.meeting_id, "stream_id": self.id, "delta": delta}
+            }
+        )
+
+def summary_event_data(meeting_id: int, summary: str, summary_stream: Optional[SummaryStream]) -> Dict:
+    data = {"summary": summary, "meeting_id": meeting_id}
+    if summary_stream is not None:
+        data["stream_id"] = summary_stream.id
+    return data
 
 class MeetingManager:
-    def __init__(self, connection_manager: ConnectionManager):
+    def __init__(
+        self,
+        connection_manager: ConnectionManager,
+        rolling_summary: bool = ROLLING_SUMMARY_ENABLED,
+        transcript_buffer: Optional[TranscriptWriteBuffer] = None,
+        semantic_index: Optional[SemanticIndex] = None,
+        stream_summaries: bool = False
+    ):
         self.connection_manager = connection_manager
+        self.rolling_summary = rolling_summary
+        # Stream the end-of-meeting summary as summary_delta frames
+        self.stream_summaries = stream_summaries
+        # Persists live transcript segments to meeting_notes in batches
+        self.transcript_buffer = transcript_buffer
+        # Ended meetings' segments are appended here for related/semantic search
+        self.semantic_index = semantic_index
         # meeting_id -> meeting data
         self.active_meetings: Dict[int, Dict] = {}
+        # (meeting_id, operation, transcript length, options) -> pending AI request
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        # End-of-meeting processing still running
+        self.background_tasks: Set[asyncio.Task] = set()
+        # meeting_id -> {"epoch": id of this numbering, "seq": last sequence number,
+        # "events": recent broadcasts, "owned": numbered here rather than mirrored}
+        self.event_logs: Dict[int, Dict] = {}
+        # Sessions live on the worker that started them; other workers forward
+        # commands there and mirror the numbered events they deliver, for replay
+        connection_manager.backend.set_command_handler(self._on_command)
+        connection_manager.on_deliver = self._mirror_event
+        connection_manager.on_unsubscribe = self._drop_mirror
 
     async def start_meeting(self, meeting_id: int, meeting_data: Dict):
-        """Start a meeting session"""
+        """Start a meeting session, on this worker unless another one already owns it"""
+        if meeting_id in self.active_meetings:
+            self._cancel_rolling_timer(self.active_meetings[meeting_id])
+        elif await self._forward(meeting_id, "start_meeting", meeting_data=meeting_data):
+            return
         self.active_meetings[meeting_id] = {
             "data": meeting_data,
             "transcript": [],
             "participants": set(),
-            "start_time": meeting_data.get("start_time")
+            "start_time": meeting_data.get("start_time"),
+            # Running summary plus a cursor into "transcript" marking the
+            # first segment not yet folded into it
+            "rolling_summary": {
+                "summary": "",
+                "cursor": 0,
+                # Last refresh attempt, for the time trigger
+                "updated_at": time.monotonic(),
+                "lock": asyncio.Lock(),
+                "task": None,
+                # Fires the time trigger while segments are pending
+                "timer": None,
+                "failed": False
+            },
+            # Idempotency keys of transcript frames already accepted
+            "seen_keys": OrderedDict()
         }
+        # Only once the session exists, so no command is forwarded back here
+        await self.connection_manager.backend.subscribe_commands(meeting_id)
 
-        await self.connection_manager.broadcast_to_meeting(
+        await self._broadcast(
             meeting_id,
             {
                 "type": "meeting_started",
@@ -81,16 +323,140 @@ class MeetingManager:
             }
         )
 
-    async def add_transcript(self, meeting_id: int, transcript_data: Dict):
-        """Add transcript to meeting"""
-        if meeting_id not in self.active_meetings:
+    async def _broadcast(self, meeting_id: int, message: Dict):
+        """Stamp a broadcast with the meeting's next sequence number and keep it for replay.
+
+        The epoch names this run of sequence numbers; a log created after the
+        previous one was dropped starts again at 1 under a new epoch.
+        """
+        log = self.event_logs.get(meeting_id)
+        if log is None or not log["owned"]:
+            log = self.event_logs[meeting_id] = self._new_log(uuid.uuid4().hex[:12], owned=True)
+        log["seq"] += 1
+        message = {**message, "seq": log["seq"], "epoch": log["epoch"]}
+        log["events"].append(message)
+        await self.connection_manager.broadcast_to_meeting(meeting_id, message)
+
+    @staticmethod
+    def _new_log(epoch: str, owned: bool) -> Dict:
+        return {"epoch": epoch, "seq": 0, "events": deque(maxlen=REPLAY_BUFFER_SIZE), "owned": owned}
+
+    def _mirror_event(self, meeting_id: int, text: str):
+        """Keep numbered events of meetings owned by another worker, for replay here"""
+        log = self.event_logs.get(meeting_id)
+        if log is not None and log["owned"]:
+            return
+        message = json.loads(text)
+        if "seq" not in message:
             return
+        if log is None or log["epoch"] != message["epoch"]:
+            log = self.event_logs[meeting_id] = self._new_log(message["epoch"], owned=False)
+        if message["seq"] > log["seq"]:
+            log["seq"] = message["seq"]
+            log["events"].append(message)
+
+    def _drop_mirror(self, meeting_id: int):
+        log = self.event_logs.get(meeting_id)
+        if log is not None and not log["owned"]:
+            del self.event_logs[meeting_id]
+
+    async def announce(self, meeting_id: int, message: Dict):
+        """Broadcast an event raised outside the session, such as a finished AI job.
+
+        It is numbered like the session's own events so reconnecting clients
+        get it replayed; the numbering lives on the worker that owns the
+        session, so the event is forwarded there when another worker does.
+        """
+        log = self.event_logs.get(meeting_id)
+        owned_here = meeting_id in self.active_meetings or (log is not None and log["owned"])
+        if owned_here or not await self._forward(meeting_id, "announce", message=message):
+            await self._broadcast(meeting_id, message)
+
+    async def _forward(self, meeting_id: int, op: str, **args) -> bool:
+        """Send a command to the worker owning the meeting's session; False when none does"""
+        return await self.connection_manager.backend.send_command(
+            meeting_id, encode_message({"op": op, "args": args})
+        )
+
+    def _on_command(self, meeting_id: int, text: str):
+        """Run a command forwarded by another worker"""
+        task = asyncio.create_task(self._run_command(meeting_id, json.loads(text)))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def _run_command(self, meeting_id: int, command: Dict):
+        handlers = {
+            "start_meeting": self.start_meeting,
+            "add_transcript": self.add_transcript,
+            "generate_summary": self.generate_summary,
+            "extract_action_items": self.extract_action_items,
+            "end_meeting": self.end_meeting,
+            "announce": self.announce
+        }
+        try:
+            await handlers[command["op"]](meeting_id, **command["args"])
+        except Exception:
+            logger.exception(f"Forwarded {command.get('op')} failed for meeting {meeting_id}")
+
+    def replay_messages(
+        self,
+        meeting_id: int,
+        last_seq: int,
+        epoch: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Broadcasts a client missed after last_seq.
+
+        Returns a single "resync" message, telling the client to reload over
+        REST, when the gap is no longer in the ring buffer, when last_seq is
+        from another epoch, or when more than limit messages were missed.
+        """
+        log = self.event_logs.get(meeting_id)
+        current = log["seq"] if log else 0
+        events = log["events"] if log else ()
+        resync = [{
+            "type": "resync",
+            "data": {"meeting_id": meeting_id, "seq": current, "epoch": log["epoch"] if log else None}
+        }]
+        if epoch is not None and (log is None or epoch != log["epoch"]):
+            return resync
+        if last_seq == current:
+            return []
+
+        oldest = events[0]["seq"] if events else current + 1
+        if last_seq > current or last_seq + 1 < oldest:
+            return resync
+        missed = [event for event in events if event["seq"] > last_seq]
+        if limit is not None and len(missed) > limit:
+            return resync
+        return missed
+
+    async def add_transcript(self, meeting_id: int, transcript_data: Dict, idempotency_key: Optional[str] = None) -> bool:
+        """Add transcript to meeting.
+
+        Returns False for a frame whose idempotency key was already accepted,
+        or when no worker has the meeting started.
+        """
+        if meeting_id not in self.active_meetings:
+            return await self._forward(
+                meeting_id, "add_transcript", transcript_data=transcript_data, idempotency_key=idempotency_key
+            )
 
         meeting = self.active_meetings[meeting_id]
+        if idempotency_key:
+            seen_keys = meeting["seen_keys"]
+            if idempotency_key in seen_keys:
+                return False
+            seen_keys[idempotency_key] = True
+            if len(seen_keys) > IDEMPOTENCY_KEYS_PER_MEETING:
+                seen_keys.popitem(last=False)
+
         meeting["transcript"].append(transcript_data)
+        if self.transcript_buffer is not None:
+            self.transcript_buffer.add(meeting_id, transcript_data)
 
         # Broadcast to all participants
-        await self.connection_manager.broadcast_to_meeting(
+        await self._broadcast(
             meeting_id,
             {
                 "type": "transcript",
@@ -98,38 +464,181 @@ class MeetingManager:
             }
         )
 
-    async def generate_summary(self, meeting_id: int) -> str:
-        """Generate AI summary for meeting"""
+        if self.rolling_summary:
+            self._maybe_refresh_rolling_summary(meeting_id)
+        return True
+
+    def _maybe_refresh_rolling_summary(self, meeting_id: int):
+        """Schedule a background rolling summary refresh when a trigger fires.
+
+        Pending segments below the count trigger arm a timer for the time
+        trigger, so a quiet meeting still gets its summary refreshed.
+        """
+        meeting = self.active_meetings.get(meeting_id)
+        if meeting is None:
+            return
+        state = meeting["rolling_summary"]
+        if state["task"] is not None and not state["task"].done():
+            return
+
+        pending = len(meeting["transcript"]) - state["cursor"]
+        if pending <= 0:
+            return
+
+        elapsed = time.monotonic() - state["updated_at"]
+        by_count = pending >= ROLLING_SUMMARY_SEGMENTS and not state["failed"]
+        if by_count or elapsed >= ROLLING_SUMMARY_INTERVAL:
+            self._cancel_rolling_timer(meeting)
+            state["task"] = asyncio.create_task(self._refresh_and_broadcast_summary(meeting_id))
+        elif state["timer"] is None:
+            state["timer"] = asyncio.get_running_loop().call_later(
+                ROLLING_SUMMARY_INTERVAL - elapsed, self._on_rolling_timer, meeting_id
+            )
+
+    def _on_rolling_timer(self, meeting_id: int):
+        meeting = self.active_meetings.get(meeting_id)
+        if meeting is not None:
+            meeting["rolling_summary"]["timer"] = None
+            self._maybe_refresh_rolling_summary(meeting_id)
+
+    @staticmethod
+    def _cancel_rolling_timer(meeting: Dict):
+        state = meeting["rolling_summary"]
+        if state["timer"] is not None:
+            state["timer"].cancel()
+            state["timer"] = None
+
+    async def _refresh_and_broadcast_summary(self, meeting_id: int):
+        """Background refresh of the rolling summary, pushed to participants"""
+        meeting = self.active_meetings[meeting_id]
+        state = meeting["rolling_summary"]
+        cursor = state["cursor"]
+        try:
+            previous = state["summary"]
+            summary = await self._refresh_rolling_summary(meeting)
+            if summary and summary != previous and meeting_id in self.active_meetings:
+                await self._broadcast(
+                    meeting_id,
+                    {
+                        "type": "summary",
+                        "data": {
+                            "summary": summary,
+                            "meeting_id": meeting_id
+                        }
+                    }
+                )
+        except Exception:
+            logger.exception(f"Rolling summary refresh failed for meeting {meeting_id}")
+        finally:
+            if self.active_meetings.get(meeting_id) is meeting:
+                state["task"] = None
+                # After a failure only the time trigger retries, not every new segment
+                state["failed"] = state["cursor"] == cursor
+                # Segments that arrived during the refresh re-arm the triggers
+                self._maybe_refresh_rolling_summary(meeting_id)
+
+    async def _refresh_rolling_summary(self, meeting: Dict, summary_stream: Optional[SummaryStream] = None) -> str:
+        """Fold segments after the cursor into the running summary"""
+        state = meeting["rolling_summary"]
+
+        async with state["lock"]:
+            end = len(meeting["transcript"])
+            if end <= state["cursor"]:
+                return state["summary"]
+
+            new_text = "\n".join([t.get("text", "") for t in meeting["transcript"][state["cursor"]:end]])
+            meeting_type = meeting["data"].get("meeting_type", "general")
+            if summary_stream is None:
+                summary = await ai_service.update_rolling_summary(state["summary"], new_text, meeting_type)
+            else:
+                try:
+                    summary = await summary_stream.relay(
+                        ai_service.stream_rolling_summary(state["summary"], new_text, meeting_type)
+                    ) or None
+                except Exception:
+                    logger.exception("Error streaming rolling summary")
+                    summary = None
+
+            # Keep the previous state if the update failed; the time trigger
+            # retries after a full interval either way
+            state["updated_at"] = time.monotonic()
+            if summary is not None:
+                state["summary"] = summary
+                state["cursor"] = end
+                if end == len(meeting["transcript"]):
+                    self._cancel_rolling_timer(meeting)
+            return state["summary"]
+
+    async def _current_rolling_summary(self, meeting_id: int, summary_stream: Optional[SummaryStream] = None) -> str:
+        """Return the running summary, first folding in any pending segments"""
+        summary = await self._refresh_rolling_summary(self.active_meetings[meeting_id], summary_stream)
+        return summary or "Summary not available yet."
+
+    async def _single_flight(self, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run factory() once per key; concurrent callers await the same result"""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def generate_summary(self, meeting_id: int, stream: bool = False) -> Optional[str]:
+        """Generate AI summary for meeting.
+
+        With stream, participants receive summary_delta frames while the
+        summary is generated, before the final summary event. Returns None
+        when the request went to the worker owning the meeting; the summary
+        event reaches participants from there.
+        """
         if meeting_id not in self.active_meetings:
+            if await self._forward(meeting_id, "generate_summary", stream=stream):
+                return None
             return "Meeting not found"
 
+        # Requests for the same transcript version share one LLM call and one
+        # broadcast; a streamed request never joins an unstreamed one, or the
+        # other way round
+        key = (meeting_id, "summary", len(self.active_meetings[meeting_id]["transcript"]), stream)
+        return await self._single_flight(key, lambda: self._generate_summary(meeting_id, stream))
+
+    async def _generate_summary(self, meeting_id: int, stream: bool = False) -> str:
         meeting = self.active_meetings[meeting_id]
         transcript_text = "\n".join([t.get("text", "") for t in meeting["transcript"]])
 
         if not transcript_text:
             return "No transcript available for summarization."
 
-        summary = await ai_service.generate_summary(transcript_text)
+        summary_stream = SummaryStream(self.connection_manager, meeting_id) if stream else None
+        if self.rolling_summary:
+            summary = await self._current_rolling_summary(meeting_id, summary_stream)
+        elif summary_stream is not None:
+            summary = await summary_stream.relay(ai_service.stream_summary(transcript_text))
+        else:
+            summary = await ai_service.generate_summary(transcript_text)
 
         # Broadcast summary to participants
-        await self.connection_manager.broadcast_to_meeting(
+        await self._broadcast(
             meeting_id,
             {
                 "type": "summary",
-                "data": {
-                    "summary": summary,
-                    "meeting_id": meeting_id
-                }
+                "data": summary_event_data(meeting_id, summary, summary_stream)
             }
         )
 
         return summary
 
-    async def extract_action_items(self, meeting_id: int) -> List[Dict]:
-        """Extract action items from meeting"""
+    async def extract_action_items(self, meeting_id: int) -> Optional[List[Dict]]:
+        """Extract action items from meeting; None when another worker owns it"""
         if meeting_id not in self.active_meetings:
+            if await self._forward(meeting_id, "extract_action_items"):
+                return None
             return []
 
+        key = (meeting_id, "action_items", len(self.active_meetings[meeting_id]["transcript"]), False)
+        return await self._single_flight(key, lambda: self._extract_action_items(meeting_id))
+
+    async def _extract_action_items(self, meeting_id: int) -> List[Dict]:
         meeting = self.active_meetings[meeting_id]
         transcript_text = "\n".join([t.get("text", "") for t in meeting["transcript"]])
 
@@ -139,7 +648,7 @@ class MeetingManager:
         action_items = await ai_service.extract_action_items(transcript_text)
 
         # Broadcast action items to participants
-        await self.connection_manager.broadcast_to_meeting(
+        await self._broadcast(
             meeting_id,
             {
                 "type": "action_items",
@@ -153,31 +662,136 @@ class MeetingManager:
         return action_items
 
     async def end_meeting(self, meeting_id: int):
-        """End a meeting session"""
-        if meeting_id in self.active_meetings:
-            meeting_data = self.active_meetings[meeting_id]
+        """End a meeting session.
 
-            # Generate final summary and insights
-            transcript_text = "\n".join([t.get("text", "") for t in meeting_data["transcript"]])
+        Participants are told right away; the final summary and analysis run
+        in a background task and are pushed as separate events.
+        """
+        if meeting_id not in self.active_meetings:
+            await self._forward(meeting_id, "end_meeting")
+            return
 
-            if transcript_text:
-                # Generate comprehensive insights
-                insights = await ai_service.generate_meeting_insights(transcript_text)
+        # Stop taking commands first, so none is forwarded back here once the session is gone
+        await self.connection_manager.backend.unsubscribe_commands(meeting_id)
+        meeting_data = self.active_meetings.pop(meeting_id, None)
+        if meeting_data is None:
+            return
+        self._cancel_rolling_timer(meeting_data)
+        transcript_text = "\n".join([t.get("text", "") for t in meeting_data["transcript"]])
+        end_time = datetime.now(timezone.utc)
 
-                await self.connection_manager.broadcast_to_meeting(
+        await self._broadcast(
+            meeting_id,
+            {
+                "type": "meeting_ended",
+                "data": {
+                    "meeting_id": meeting_id,
+                    "end_time": end_time.isoformat()
+                }
+            }
+        )
+
+        task = asyncio.create_task(self._finalize_meeting(meeting_id, meeting_data, transcript_text, end_time))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def _finalize_meeting(self, meeting_id: int, meeting_data: Dict, transcript_text: str, end_time: datetime):
+        """Persist the ended meeting and run the final AI calls concurrently"""
+        try:
+            if self.transcript_buffer is not None:
+                await self.transcript_buffer.flush()
+            await self._save_meeting(meeting_id, {
+                "status": "completed",
+                "end_time": end_time,
+                "transcript": transcript_text
+            })
+            if self.semantic_index is not None:
+                # Runs alongside the AI calls; a failure here must not lose the summary
+                task = asyncio.create_task(self._index_segments(meeting_id))
+                self.background_tasks.add(task)
+                task.add_done_callback(self.background_tasks.discard)
+            if not transcript_text:
+                return
+
+            meeting_type = meeting_data["data"].get("meeting_type", "general")
+
+            async def insights() -> schemas.MeetingAnalysis:
+                analysis = await ai_service.analyze_meeting(transcript_text, meeting_type)
+                await self._broadcast(
                     meeting_id,
                     {
-                        "type": "meeting_ended",
+                        "type": "insights",
                         "data": {
                             "meeting_id": meeting_id,
-                            "insights": insights,
-                            "final_summary": await ai_service.generate_summary(transcript_text)
+                            "insights": analysis.insights.model_dump(),
+                            "action_items": [item.model_dump() for item in analysis.action_items],
+                            "sentiment": analysis.sentiment.model_dump(),
+                            "topics": analysis.topics
                         }
                     }
                 )
+                return analysis
+
+            async def final_summary() -> str:
+                summary = None
+                summary_stream = None
+                if self.rolling_summary:
+                    # Only the segments after the cursor still need folding in
+                    summary_stream = SummaryStream(self.connection_manager, meeting_id) if self.stream_summaries else None
+                    summary = await self._refresh_rolling_summary(meeting_data, summary_stream)
+                if not summary:
+                    # The analysis already sends the whole transcript and returns a
+                    # summary; a separate summary call would send it twice
+                    summary_stream = None
+                    summary = (await analysis_task).summary or await ai_service.generate_summary(transcript_text, meeting_type)
+                await self._broadcast(
+                    meeting_id,
+                    {
+                        "type": "final_summary",
+                        "data": summary_event_data(meeting_id, summary, summary_stream)
+                    }
+                )
+                return summary
+
+            # The summary starts first: with a rolling summary it only folds in the tail
+            summary_task = asyncio.ensure_future(final_summary())
+            analysis_task = asyncio.ensure_future(insights())
+            summary, analysis = await asyncio.gather(summary_task, analysis_task)
+
+            await self._save_meeting(meeting_id, {
+                "summary": summary,
+                "action_items": [item.model_dump() for item in analysis.action_items]
+            })
+        except Exception:
+            logger.exception(f"End-of-meeting processing failed for meeting {meeting_id}")
+        finally:
+            # Clients reconnecting after this get a resync and reload over REST
+            if meeting_id not in self.active_meetings:
+                self.event_logs.pop(meeting_id, None)
+
+    async def _index_segments(self, meeting_id: int):
+        try:
+            await self.semantic_index.index_meeting(meeting_id)
+        except Exception:
+            logger.exception(f"Semantic indexing failed for meeting {meeting_id}")
+
+    async def _save_meeting(self, meeting_id: int, values: Dict[str, Any]):
+        """Write end-of-meeting results to the Meeting row"""
+        async with AsyncSessionLocal() as db:
+            await crud.update_meeting(db, meeting_id, schemas.MeetingUpdate(**values))
 
-            del self.active_meetings[meeting_id]
+    async def shutdown(self):
+        """Wait for end-of-meeting processing still in flight and flush pending segments"""
+        if self.background_tasks:
+            await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        if self.transcript_buffer is not None:
+            await self.transcript_buffer.flush()
 
 # Global instances
-connection_manager = ConnectionManager()
-meeting_manager = MeetingManager(connection_manager)
\ No newline at end of file
+connection_manager = ConnectionManager(backend=create_backend())
+meeting_manager = MeetingManager(
+    connection_manager,
+    transcript_buffer=TranscriptWriteBuffer(),
+    semantic_index=semantic_index,
+    stream_summaries=SUMMARY_STREAMING
+)
\ No newline at end of file
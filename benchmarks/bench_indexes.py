@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Index usage benchmark
+Seeds large tables, runs the list queries from app/crud.py and asserts via
+EXPLAIN that each one is answered from an index rather than a table scan.
+
+Runs against a temporary SQLite file by default. Set BENCH_POSTGRES_URL to a
+throwaway Postgres database to check the Postgres plans as well - its tables
+are dropped and recreated. BENCH_SCALE multiplies the seeded row counts.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import crud, models
+from app.pagination import decode_cursor
+
+BENCH_SCALE = float(os.getenv("BENCH_SCALE", "1"))
+BENCH_POSTGRES_URL = os.getenv("BENCH_POSTGRES_URL")
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "20"))
+
+DASHBOARD_USER = 11
+DASHBOARD_ITEMS = 10
+
+# Projects on DASHBOARD_USER's dashboard, filled in after seeding
+dashboard_projects = []
+
+ROWS = {
+    "users": 500,
+    "workspaces": 100,
+    "projects": 1000,
+    "meetings": 50000,
+    "meeting_notes": 200000,
+    "tasks": 50000,
+}
+
+# Tables large enough that a sequential scan is a bug
+LARGE_TABLES = {"workspace_members", "projects", "meetings", "meeting_notes", "tasks"}
+
+def scaled(table: str) -> int:
+    return max(1, int(ROWS[table] * BENCH_SCALE))
+
+def insert_chunked(conn, table, rows, chunk: int = 10000):
+    for start in range(0, len(rows), chunk):
+        conn.execute(table.insert(), rows[start:start + chunk])
+
+def seed(engine):
+    """Fill every table with synthetic rows"""
+    rng = random.Random(42)
+    epoch = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    n_users, n_workspaces, n_projects = scaled("users"), scaled("workspaces"), scaled("projects")
+    n_meetings, n_notes, n_tasks = scaled("meetings"), scaled("meeting_notes"), scaled("tasks")
+
+    def at(i: int, total: int) -> datetime:
+        return epoch + timedelta(seconds=int(i * 365 * 86400 / total))
+
+    with engine.begin() as conn:
+        insert_chunked(conn, models.User.__table__, [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, n_users + 1)
+        ])
+        insert_chunked(conn, models.Workspace.__table__, [
+            {"id": i, "name": f"Workspace {i}", "owner_id": rng.randint(1, n_users)}
+            for i in range(1, n_workspaces + 1)
+        ])
+        insert_chunked(conn, models.WorkspaceMember.__table__, [
+            {"workspace_id": w, "user_id": u, "role": "member"}
+            for w in range(1, n_workspaces + 1)
+            for u in rng.sample(range(1, n_users + 1), max(1, n_users // 25))
+        ] + [
+            # The user the dashboard cases load belongs to a few workspaces - a small
+            # share of them at every scale, so the plans stay index lookups
+            {"workspace_id": w, "user_id": DASHBOARD_USER, "role": "member"}
+            for w in range(1, max(1, min(3, n_workspaces // 20)) + 1)
+        ])
+        insert_chunked(conn, models.Project.__table__, [
+            {"id": i, "name": f"Project {i}", "workspace_id": rng.randint(1, n_workspaces)}
+            for i in range(1, n_projects + 1)
+        ])
+        insert_chunked(conn, models.Meeting.__table__, [
+            {
+                "id": i, "title": f"Meeting {i}", "project_id": rng.randint(1, n_projects),
+                "created_by_id": rng.randint(1, n_users), "status": rng.choice(["scheduled", "completed"]),
+                "meeting_type": "general", "transcript": "lorem ipsum " * 50, "created_at": at(i, n_meetings)
+            }
+            for i in range(1, n_meetings + 1)
+        ])
+        insert_chunked(conn, models.MeetingNote.__table__, [
+            {
+                "meeting_id": rng.randint(1, n_meetings), "content": f"Segment {i}", "speaker": "Speaker",
+                "note_type": "transcript", "created_by_id": rng.randint(1, n_users), "created_at": at(i, n_notes)
+            }
+            for i in range(1, n_notes + 1)
+        ])
+        insert_chunked(conn, models.Task.__table__, [
+            {
+                "title": f"Task {i}", "project_id": rng.randint(1, n_projects),
+                "assigned_to_id": rng.randint(1, n_users), "created_by_id": rng.randint(1, n_users),
+                "status": "todo", "priority": "medium", "created_at": at(i, n_tasks)
+            }
+            for i in range(1, n_tasks + 1)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+
+def capture_statements(engine, fn):
+    """Run fn(session) and return the (statement, parameters) it executed"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with Session(engine) as db:
+            fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+def explain(engine, statement, parameters):
+    """Return (indexes used, tables read by a full scan) for one statement"""
+    indexes, full_scans = set(), set()
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+                detail = row[-1]
+                words = detail.split()
+                if "INDEX" in words:
+                    indexes.add(words[words.index("INDEX") + 1])
+                elif words[0] == "SCAN" and "PRIMARY" not in words:
+                    full_scans.add(words[1])
+        else:
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes = [plan[0]["Plan"]]
+            while nodes:
+                node = nodes.pop()
+                if "Index Name" in node:
+                    indexes.add(node["Index Name"])
+                if node["Node Type"] == "Seq Scan":
+                    full_scans.add(node["Relation Name"])
+                nodes.extend(node.get("Plans", []))
+    return indexes, full_scans
+
+def second_meetings_page(db):
+    _, next_cursor = crud.get_meetings_by_project(db, 7, limit=20)
+    return crud.get_meetings_by_project(db, 7, limit=20, after=decode_cursor(next_cursor))
+
+def load_dashboard_projects(engine):
+    with Session(engine) as db:
+        dashboard_projects[:] = [
+            project.id for workspace in crud.get_dashboard_tree(db, DASHBOARD_USER) for project in workspace.projects
+        ]
+
+# (label, query, indexes the plan must use) - the dashboard cases are the
+# queries api.get_dashboard runs, one case per helper
+CASES = [
+    ("project meetings", lambda db: crud.get_meetings_by_project(db, 7), {"ix_meetings_project_id_created_at"}),
+    ("project meetings page 2", second_meetings_page, {"ix_meetings_project_id_created_at"}),
+    ("user meetings", lambda db: crud.get_user_meetings(db, 11), {"ix_meetings_created_by_id"}),
+    ("meeting notes", lambda db: crud.get_meeting_notes(db, 1234), {"ix_meeting_notes_meeting_id_created_at"}),
+    ("project tasks", lambda db: crud.get_tasks_by_project(db, 7), {"ix_tasks_project_id_created_at"}),
+    ("assigned tasks", lambda db: crud.get_tasks_by_assigned_user(db, 11), {"ix_tasks_assigned_to_id"}),
+    ("user workspaces", lambda db: crud.get_user_workspaces(db, 11), {"ix_workspace_members_user_id_workspace_id"}),
+    ("workspace projects", lambda db: crud.get_projects_by_workspace(db, 3), {"ix_projects_workspace_id"}),
+    ("dashboard tree", lambda db: crud.get_dashboard_tree(db, DASHBOARD_USER), {
+        "ix_workspace_members_user_id_workspace_id", "ix_projects_workspace_id"
+    }),
+    ("dashboard meetings", lambda db: crud.get_dashboard_meetings(db, dashboard_projects, DASHBOARD_ITEMS),
+     {"ix_meetings_project_id_created_at"}),
+    ("dashboard tasks", lambda db: crud.get_dashboard_tasks(db, dashboard_projects, DASHBOARD_ITEMS),
+     {"ix_tasks_project_id_created_at"}),
+    ("dashboard counts", lambda db: crud.get_dashboard_counts(db, dashboard_projects), {
+        "ix_meetings_project_id_created_at", "ix_tasks_project_id_created_at"
+    }),
+]
+
+def run(engine) -> bool:
+    print(f"\n== {engine.dialect.name} ==")
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    seed(engine)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s "
+          f"({', '.join(f'{table}={scaled(table)}' for table in ROWS)})")
+    load_dashboard_projects(engine)
+
+    ok = True
+    for label, fn, expected in CASES:
+        indexes, full_scans = set(), set()
+        for statement, parameters in capture_statements(engine, fn):
+            used, scanned = explain(engine, statement, parameters)
+            indexes |= used
+            full_scans |= scanned & LARGE_TABLES
+
+        timings = []
+        for _ in range(BENCH_REPEAT):
+            with Session(engine) as db:
+                started = time.perf_counter()
+                fn(db)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        missing = expected - indexes
+        status = "ok" if not missing and not full_scans else "FAIL"
+        ok = ok and status == "ok"
+        print(f"{status:4} {label:24} median {statistics.median(timings):7.2f} ms  indexes: {', '.join(sorted(indexes))}")
+        if missing:
+            print(f"     missing index: {', '.join(sorted(missing))}")
+        if full_scans:
+            print(f"     full scan of: {', '.join(sorted(full_scans))}")
+
+    models.Base.metadata.drop_all(bind=engine)
+    return ok
+
+def main() -> int:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        results.append(run(engine))
+        engine.dispose()
+
+    if BENCH_POSTGRES_URL:
+        engine = create_engine(BENCH_POSTGRES_URL)
+        results.append(run(engine))
+        engine.dispose()
+    else:
+        print("\nBENCH_POSTGRES_URL not set - skipping Postgres")
+
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark
+Fires concurrent /auth/login requests while a live meeting broadcasts to a
+connected participant, and reports logins/sec together with the broadcast
+delivery latency the participant sees (p50/p99).
+
+Runs twice: once verifying passwords inline on the event loop (the old
+behaviour) and once on the dedicated hashing executor.
+BENCH_LOGINS, BENCH_CONCURRENCY and PASSWORD_HASH_ROUNDS tune the load.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import statistics
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ.setdefault("LLM_CACHE_PATH", "")
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from fastapi import FastAPI
+
+from app import auth, crud, models, schemas
+from app.database import async_engine, SessionLocal, engine
+from app.routers import auth as auth_router
+from app.websocket_manager import ConnectionManager
+
+BENCH_USERS = int(os.getenv("BENCH_USERS", "50"))
+BENCH_LOGINS = int(os.getenv("BENCH_LOGINS", "200"))
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "20"))
+PROBE_INTERVAL = 0.005
+
+app = FastAPI()
+app.include_router(auth_router.router)
+
+class ProbeWebSocket:
+    """Participant socket recording how long each broadcast took to arrive"""
+
+    def __init__(self):
+        self.latencies = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        sent_at = float(text.split('"sent_at":', 1)[1].rstrip("}"))
+        self.latencies.append((time.perf_counter() - sent_at) * 1000)
+
+    async def close(self, code=1000):
+        pass
+
+def seed_users():
+    models.Base.metadata.create_all(bind=engine)
+    hashed_password = auth.get_password_hash("password")
+    db = SessionLocal()
+    try:
+        for i in range(BENCH_USERS):
+            crud.create_user(db, schemas.UserCreate(
+                email=f"user{i}@example.com", username=f"user{i}", password="password"
+            ), hashed_password=hashed_password)
+    finally:
+        db.close()
+
+async def broadcast_probe(manager: ConnectionManager, stop: asyncio.Event):
+    while not stop.is_set():
+        await manager.broadcast_to_meeting(1, {"type": "ping", "sent_at": time.perf_counter()})
+        await asyncio.sleep(PROBE_INTERVAL)
+
+async def login_storm(client: httpx.AsyncClient) -> float:
+    semaphore = asyncio.Semaphore(BENCH_CONCURRENCY)
+
+    async def login(i: int):
+        async with semaphore:
+            response = await client.post("/auth/login", data={
+                "username": f"user{i % BENCH_USERS}", "password": "password"
+            })
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*[login(i) for i in range(BENCH_LOGINS)])
+    return time.perf_counter() - started
+
+async def run(label: str):
+    manager = ConnectionManager()
+    probe = ProbeWebSocket()
+    await manager.connect(probe, 1)
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(broadcast_probe(manager, stop))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        elapsed = await login_storm(client)
+
+    stop.set()
+    await probe_task
+    manager.disconnect(probe)
+
+    latencies = sorted(probe.latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:10} {BENCH_LOGINS / elapsed:8.1f} logins/s   "
+          f"broadcast latency p50 {statistics.median(latencies):7.2f} ms  p99 {p99:7.2f} ms  "
+          f"({len(latencies)} broadcasts)")
+
+async def main():
+    seed_users()
+    print(f"{BENCH_LOGINS} logins, concurrency {BENCH_CONCURRENCY}, "
+          f"pbkdf2_sha256 rounds {auth.PASSWORD_HASH_ROUNDS}, {auth.PASSWORD_HASH_WORKERS} hash workers")
+
+    offloaded = auth.verify_and_update_password
+
+    async def verify_inline(plain_password, hashed_password):
+        return auth.pwd_context.verify_and_update(plain_password, hashed_password)
+
+    auth.verify_and_update_password = verify_inline
+    await run("inline")
+    auth.verify_and_update_password = offloaded
+    await run("executor")
+
+    auth.shutdown_hash_executor()
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Bulk meeting import script
+Imports NDJSON meeting exports (the format of /api/meetings/{id}/export and
+/api/projects/{id}/export) into a project, then optionally generates
+summaries and action items for the imported meetings.
+
+Usage: python import_meetings.py --project-id 1 --username demo meetings.ndjson [more.ndjson ...]
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from app.database import AsyncSessionLocal, async_engine
+from app import crud
+from app.importer import MeetingImporter, UPLOAD_CHUNK_SIZE, iter_lines
+from app.jobs import job_queue
+
+async def file_chunks(paths):
+    for path in paths:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield b"\n"
+
+async def import_meetings(paths, project_id: int, username: str, process: bool):
+    async with AsyncSessionLocal() as db:
+        user = await crud.get_user_by_username(db, username=username)
+        if not user:
+            print(f"User {username} not found")
+            return
+        if not await crud.get_project(db, project_id=project_id):
+            print(f"Project {project_id} not found")
+            return
+
+        result = await MeetingImporter(db, project_id=project_id, user_id=user.id).run(iter_lines(file_chunks(paths)))
+
+        print(f"Imported {result['meetings_created']} meetings with {result['notes_created']} notes")
+        for error in result["errors"]:
+            print(f"  line {error['line']}: {error['error']}")
+        if not result["complete"]:
+            print("Import stopped early - lines after the one above were not read")
+
+        if process and result["meeting_ids"]:
+            # With JOB_BACKEND=celery the jobs are left to the workers
+            await job_queue.start(recover=False)
+            try:
+                jobs = await job_queue.enqueue(db, "analysis", result["meeting_ids"], user_id=user.id)
+                print(f"Queued {len(jobs)} summary and action item jobs")
+                await job_queue.drain()
+            finally:
+                await job_queue.stop()
+            stats = job_queue.stats()
+            if stats["succeeded"] or stats["failed"]:
+                print(f"Done: {stats['succeeded']} succeeded, {stats['failed']} failed")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Import meetings from NDJSON files")
+    parser.add_argument("files", nargs="+", help="NDJSON files to import")
+    parser.add_argument("--project-id", type=int, required=True, help="Project to import into")
+    parser.add_argument("--username", required=True, help="User recorded as the creator")
+    parser.add_argument("--skip-ai", action="store_true", help="Do not generate summaries and action items")
+    args = parser.parse_args()
+
+    try:
+        await import_meetings(args.files, args.project_id, args.username, process=not args.skip_ai)
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
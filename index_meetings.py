@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Semantic index backfill script
+Adds every meeting with notes to the local semantic index used by
+/api/semantic-search and /api/meetings/{id}/related. Meetings that are
+already indexed are skipped, so it is safe to re-run.
+
+Usage: python index_meetings.py [--batch-size 500]
+"""
+
+import os
+import sys
+import argparse
+import asyncio
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from app.database import async_engine
+from app.semantic_index import semantic_index
+
+async def main():
+    parser = argparse.ArgumentParser(description="Add existing meetings to the semantic index")
+    parser.add_argument("--batch-size", type=int, default=500, help="Meeting ids read per query")
+    args = parser.parse_args()
+
+    try:
+        meetings, segments = await semantic_index.backfill(batch_size=args.batch_size)
+        print(f"Indexed {segments} segments from {meetings} meetings")
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
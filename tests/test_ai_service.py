@@ -0,0 +1,313 @@
+"""
+Tests for the AI service
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import ai_service as ai_service_module
+from app import token_budget
+from app.ai_service import AIService
+from app.chunking import split_transcript
+from app.llm_cache import LLMCache
+from app.token_budget import ModelTier, plan_completion
+
+
+class FakeCompletions:
+    """Stand-in for the Groq async completions API"""
+
+    def __init__(self, reply="Fake reply", delay=0.05):
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        reply = self.reply(kwargs) if callable(self.reply) else self.reply
+        if kwargs.get("stream"):
+            return self._stream(reply)
+        message = SimpleNamespace(content=reply)
+        usage = SimpleNamespace(prompt_tokens=len(kwargs["messages"][0]["content"]) // 5, completion_tokens=len(reply or "") // 4)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def _stream(self, reply):
+        for token in reply.split(" "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token + " "))])
+
+
+def make_service(reply="Fake reply", delay=0.05, max_concurrency=8):
+    service = AIService(max_concurrency=max_concurrency, cache=LLMCache(path=None))
+    completions = FakeCompletions(reply=reply, delay=delay)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return service, completions
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_respect_concurrency_limit():
+    """No more than max_concurrency completions run at once"""
+    service, completions = make_service(max_concurrency=2)
+
+    results = await asyncio.gather(*[
+        service.generate_summary(f"Transcript {i}") for i in range(6)
+    ])
+
+    assert results == ["Fake reply"] * 6
+    assert completions.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_do_not_block_event_loop():
+    """Other coroutines keep running while a summary is generated"""
+    service, _ = make_service(delay=0.2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        await service.generate_summary("Long meeting")
+        ticks_during_call = ticks
+    finally:
+        ticking.cancel()
+
+    # A client that blocked the loop for the 0.2s call would leave the ticker at zero
+    assert ticks_during_call >= 5
+
+    # Independent calls overlap rather than queueing behind each other
+    started = asyncio.get_running_loop().time()
+    await asyncio.gather(*[service.generate_summary(f"Meeting {i}") for i in range(5)])
+    assert asyncio.get_running_loop().time() - started < 0.2 * 2
+
+
+def test_split_transcript_is_stable_as_transcript_grows():
+    """Leading chunks do not change when segments are appended"""
+    lines = [f"Speaker {i % 3}: segment number {i} " + "x" * 40 for i in range(60)]
+    chunks = split_transcript("\n".join(lines[:40]), max_chars=500, overlap=1)
+    grown = split_transcript("\n".join(lines), max_chars=500, overlap=1)
+
+    assert all(len(chunk) <= 500 for chunk in grown)
+    assert grown[:len(chunks) - 1] == chunks[:-1]
+    # Each chunk starts with the last segment of the previous one
+    for previous, current in zip(grown, grown[1:]):
+        assert current.splitlines()[0] == previous.splitlines()[-1]
+
+
+@pytest.mark.asyncio
+async def test_chunked_summary_reuses_chunk_results(monkeypatch):
+    """Long transcripts are map-reduced and unchanged chunks are not re-sent"""
+    monkeypatch.setattr(ai_service_module, "SUMMARY_CHUNK_CHARS", 500)
+    service, completions = make_service(reply="partial", delay=0.01)
+    lines = [f"Speaker {i % 3}: segment number {i} " + "x" * 40 for i in range(60)]
+
+    summary = await service.generate_summary("\n".join(lines[:40]))
+    first_calls = len(completions.calls)
+    assert summary == "partial"
+    assert first_calls > 1
+
+    await service.generate_summary("\n".join(lines))
+    chunk_prompts = [c for c in completions.calls[first_calls:] if "Transcript part:" in c["messages"][0]["content"]]
+    new_chunks = len(split_transcript("\n".join(lines), 500, overlap=ai_service_module.SUMMARY_CHUNK_OVERLAP))
+    old_chunks = len(split_transcript("\n".join(lines[:40]), 500, overlap=ai_service_module.SUMMARY_CHUNK_OVERLAP))
+    assert len(chunk_prompts) == new_chunks - old_chunks + 1
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_are_served_from_cache():
+    """Repeating a request does not call the LLM again"""
+    service, completions = make_service()
+
+    first = await service.generate_summary("Same transcript")
+    second = await service.generate_summary("Same transcript")
+
+    assert first == second == "Fake reply"
+    assert len(completions.calls) == 1
+    assert service.cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_summary_shares_cache_with_generate_summary():
+    """A fully streamed summary answers the same non-streamed request from cache"""
+    service, completions = make_service(reply="Decided to ship")
+
+    deltas = [delta async for delta in service.stream_summary("Same transcript")]
+    assert deltas == ["Decided ", "to ", "ship "]
+    assert completions.calls[0]["stream"] is True
+
+    assert await service.generate_summary("Same transcript") == "Decided to ship "
+    assert [delta async for delta in service.stream_summary("Same transcript")] == ["Decided to ship "]
+    assert len(completions.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_disk_tier_persists_and_expires(tmp_path):
+    """Entries survive a new cache instance and expire after the TTL"""
+    path = str(tmp_path / "cache.db")
+    key = LLMCache.make_key("model", "1", "prompt", {"temperature": 0.1})
+
+    cache = LLMCache(path=path)
+    await cache.set(key, "cached reply")
+    cache.close()
+
+    reopened = LLMCache(path=path)
+    assert await reopened.get(key) == "cached reply"
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+    expired = LLMCache(path=path, ttl_seconds=0)
+    assert await expired.get(key) is None
+    assert expired.stats()["misses"] == 1
+    expired.close()
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_evicts_least_recently_used_rows(tmp_path):
+    """The disk tier is trimmed to max_entries"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), memory_size=1, max_entries=2)
+    for i in range(3):
+        await cache.set(f"key-{i}", f"value-{i}")
+
+    assert await cache.get("key-0") is None
+    assert await cache.get("key-1") == "value-1"
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+ANALYSIS_REPLY = json.dumps({
+    "summary": "We agreed on the launch date.",
+    "action_items": [{"title": "Write release notes", "assignee": "Ana", "priority": "high"}],
+    "sentiment": {"overall": "positive", "confidence": 0.9, "positive_aspects": ["Clear plan"], "concerns": []},
+    "topics": ["Launch"],
+    "insights": {"key_decisions": ["Launch on Monday"], "follow_up_needed": True}
+})
+
+
+@pytest.mark.asyncio
+async def test_analyze_meeting_validates_structured_output():
+    """The combined analysis is parsed into the MeetingAnalysis schema"""
+    service, completions = make_service(reply=ANALYSIS_REPLY)
+
+    analysis = await service.analyze_meeting("Ana: let's launch on Monday")
+
+    assert analysis.summary == "We agreed on the launch date."
+    assert analysis.action_items[0].assignee == "Ana"
+    assert analysis.insights.follow_up_needed is True
+    assert completions.calls[0]["response_format"] == {"type": "json_object"}
+
+
+@pytest.mark.asyncio
+async def test_analysis_views_share_one_llm_call():
+    """Action items, sentiment, topics and insights come from one request"""
+    service, completions = make_service(reply=ANALYSIS_REPLY)
+    transcript = "Ana: let's launch on Monday"
+
+    action_items, sentiment, topics, insights = await asyncio.gather(
+        service.extract_action_items(transcript),
+        service.analyze_sentiment(transcript),
+        service.identify_topics(transcript),
+        service.generate_meeting_insights(transcript)
+    )
+
+    assert len(completions.calls) == 1
+    assert action_items[0]["title"] == "Write release notes"
+    assert sentiment["overall"] == "positive"
+    assert topics == ["Launch"]
+    assert insights["key_decisions"] == ["Launch on Monday"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_meeting_falls_back_on_invalid_json():
+    """Unparseable output yields an empty analysis, is not cached, and raises on request"""
+    service, completions = make_service(reply="not json")
+    transcript = "Ana: let's launch on Monday"
+
+    analysis = await service.analyze_meeting(transcript)
+
+    assert analysis.action_items == []
+    assert analysis.sentiment.overall == "neutral"
+
+    with pytest.raises(json.JSONDecodeError):
+        await service.analyze_meeting(transcript, raise_errors=True)
+    completions.reply = ANALYSIS_REPLY
+    analysis = await service.analyze_meeting(transcript)
+
+    assert len(completions.calls) == 3
+    assert analysis.summary == "We agreed on the launch date."
+
+
+@pytest.mark.asyncio
+async def test_empty_analysis_completion_falls_back_to_empty_analysis():
+    """A completion without content is treated like unparseable output"""
+    service, completions = make_service(reply=None)
+    transcript = "Ana: let's launch on Monday"
+
+    assert await service.extract_action_items(transcript) == []
+    assert (await service.analyze_sentiment(transcript))["overall"] == "neutral"
+    with pytest.raises(ValueError):
+        await service.analyze_meeting(transcript, raise_errors=True)
+    assert len(completions.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_analysis_model_follows_transcript_size(monkeypatch):
+    """Short meetings use the small model, long ones the large one, and usage is recorded"""
+    monkeypatch.setattr(token_budget, "AI_SMALL_TIER_MAX_TOKENS", 50)
+    service, completions = make_service(reply=ANALYSIS_REPLY)
+
+    await service.analyze_meeting("Ana: standup, nothing blocked")
+    await service.analyze_meeting("Ana: quarterly planning. " * 20)
+
+    assert [call["model"] for call in completions.calls] == [
+        token_budget.AI_SMALL_MODEL, token_budget.AI_LARGE_MODEL
+    ]
+    small = service.usage.stats()["models"][token_budget.AI_SMALL_MODEL]
+    assert small["calls"] == small["reported_calls"] == 1
+    assert small["estimated_prompt_tokens"] == service.usage.recent[0]["estimated_prompt_tokens"]
+    # The fake API counts five characters per token, the estimator four
+    assert small["estimate_ratio"] == pytest.approx(1.25, rel=0.05)
+
+
+def test_over_budget_prompts_are_trimmed_in_the_middle(monkeypatch):
+    """When no tier has room, output is capped and the middle of the source is cut"""
+    monkeypatch.setattr(token_budget, "MODEL_TIERS", {
+        "small": ModelTier("small", "small-model", 1000),
+        "large": ModelTier("large", "large-model", 2000),
+    })
+    source = "\n".join(f"segment {i:04d} " + "x" * 30 for i in range(400))
+
+    plan = plan_completion(lambda text: f"Summarize:\n{text}", source, max_tokens=1000)
+
+    assert plan.tier.model == "large-model"
+    assert plan.max_tokens == token_budget.MIN_OUTPUT_TOKENS
+    assert plan.prompt_tokens + plan.max_tokens <= plan.tier.usable_tokens
+    assert plan.trimmed_tokens > 0
+    assert "segment 0000" in plan.prompt and "segment 0399" in plan.prompt
+    assert "characters omitted" in plan.prompt
+
+
+def test_large_tier_must_not_have_less_context_than_small():
+    with pytest.raises(ValueError):
+        token_budget.build_tiers(
+            ModelTier("small", "small-model", 131072),
+            ModelTier("large", "large-model", 32768)
+        )
@@ -0,0 +1,78 @@
+"""
+Tests for authentication helpers and the principal cache
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from passlib.context import CryptContext
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import auth, models
+from app.principal_cache import PrincipalCache
+
+
+def make_user(user_id=1, **values):
+    return models.User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", **values)
+
+
+def test_cached_principal_expires_and_is_invalidated():
+    """Entries end at the token expiry at the latest and on invalidate_user"""
+    cache = PrincipalCache(ttl_seconds=60)
+    user = make_user(full_name="Ana")
+
+    cache.set("t1", user)
+    cache.set("t2", user)
+    cache.set("expired", user, token_expires_at=time.time() - 1)
+    cached = cache.get("t1")
+    assert cached.full_name == "Ana" and cached is not user
+    assert cache.get("expired") is None
+
+    cache.invalidate_user(1)
+    assert cache.get("t1") is None and cache.get("t2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_oldest_tokens_are_evicted_past_max_entries():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    for i in range(3):
+        cache.set(f"t{i}", make_user(i))
+
+    assert cache.get("t0") is None
+    assert cache.get("t2").id == 2
+    assert cache.stats()["evictions"] == 1
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_made_with_old_cost(monkeypatch):
+    """A hash with a different round count is replaced after a successful login"""
+    old_hash = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=1000).hash("secret")
+    user = make_user(hashed_password=old_hash)
+
+    async def get_user(db, username):
+        return user
+
+    monkeypatch.setattr(auth, "_get_user_by_username", get_user)
+    db = FakeSession()
+
+    assert await auth.authenticate_user(db, "user1", "wrong") is False
+    assert user.hashed_password == old_hash
+
+    assert await auth.authenticate_user(db, "user1", "secret") is user
+    assert user.hashed_password != old_hash
+    assert f"${auth.PASSWORD_HASH_ROUNDS}$" in user.hashed_password
+    assert db.commits == 1
+    assert auth.verify_password("secret", user.hashed_password)
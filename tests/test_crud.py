@@ -0,0 +1,48 @@
+"""
+Tests for CRUD operations on the async session
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import crud, schemas
+from app.database import Base, to_async_url
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'crud.db'}"))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_crud_round_trip_through_async_session(db):
+    user = await crud.create_user(
+        db, schemas.UserCreate(email="ana@example.com", username="ana", password="x"), hashed_password="hashed"
+    )
+    workspace = await crud.create_workspace(db, schemas.WorkspaceCreate(name="W"), owner_id=user.id)
+    project = await crud.create_project(db, schemas.ProjectCreate(name="P", workspace_id=workspace.id))
+    meeting = await crud.create_meeting(db, schemas.MeetingCreate(title="Kickoff", project_id=project.id), user.id)
+
+    # Deferred content columns come back loaded, so no lazy load runs outside the greenlet
+    assert (meeting.title, meeting.status, meeting.transcript) == ("Kickoff", "scheduled", None)
+
+    updated = await crud.update_meeting(db, meeting.id, schemas.MeetingUpdate(status="completed", summary="Done"))
+    assert (updated.status, updated.summary) == ("completed", "Done")
+
+    assert [w.id for w in await crud.get_user_workspaces(db, user.id)] == [workspace.id]
+    assert await crud.get_meeting_workspace_id(db, meeting.id) == workspace.id
+    page, _ = await crud.get_meetings_by_project(db, project.id)
+    assert [row.title for row in page] == ["Kickoff"]
+    assert (await crud.get_meeting(db, meeting.id, with_content=True)).summary == "Done"
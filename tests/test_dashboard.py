@@ -0,0 +1,104 @@
+"""
+Tests for the dashboard endpoint
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import models, schemas
+from app.database import Base
+from app.routers import api
+
+
+@pytest.mark.asyncio
+async def test_dashboard_nests_latest_items_and_counts_everything(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dashboard.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        ana = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        workspace = models.Workspace(name="W", owner=ana, members=[models.WorkspaceMember(user=ana, role="owner")])
+        busy = models.Project(name="Busy", workspace=workspace)
+        quiet = models.Project(name="Quiet", workspace=workspace)
+        start = datetime(2024, 1, 1)
+        for i, status in enumerate(["completed", "in_progress", "scheduled", "in_progress"]):
+            db.add(models.Meeting(title=f"M{i}", project=busy, created_by=ana, status=status,
+                                  created_at=start + timedelta(days=i)))
+        for i, status in enumerate(["done", "todo", "done"]):
+            db.add(models.Task(title=f"T{i}", project=busy, created_by=ana, status=status,
+                               created_at=start + timedelta(days=i)))
+        db.add(models.Project(name="Elsewhere", workspace=models.Workspace(name="Other", owner=ana)))
+        db.add(quiet)
+        await db.commit()
+        # Rows written around the ORM can hold NULLs the column defaults never filled
+        await db.execute(update(models.Meeting).where(models.Meeting.title == "M2").values(status=None))
+        await db.commit()
+
+        response = await api.get_dashboard(items_per_project=2, current_user=ana, db=db)
+        dashboard = schemas.Dashboard.model_validate(response)
+
+    await engine.dispose()
+
+    (only,) = dashboard.workspaces
+    assert (only.name, only.project_count) == ("W", 2)
+    busy, quiet = sorted(only.projects, key=lambda project: project.name)
+    assert [m.title for m in busy.meetings] == ["M3", "M2"]
+    assert busy.meetings[1].status is None
+    assert [t.title for t in busy.tasks] == ["T2", "T1"]
+    assert (busy.meeting_count, busy.active_meeting_count, busy.task_count, busy.completed_task_count) == (4, 2, 3, 2)
+    assert (quiet.meetings, quiet.tasks, quiet.meeting_count, quiet.task_count) == ([], [], 0, 0)
+    assert (dashboard.meeting_count, dashboard.active_meeting_count) == (4, 2)
+    assert (dashboard.task_count, dashboard.completed_task_count) == (3, 2)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_query_count_does_not_grow_with_projects(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dashboard.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def count_dashboard_queries(db, user):
+        statements.clear()
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await api.get_dashboard(items_per_project=10, current_user=user, db=db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        return len(statements)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        ana = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        workspace = models.Workspace(name="W", owner=ana, members=[models.WorkspaceMember(user=ana, role="owner")])
+
+        def add_project(name, workspace):
+            project = models.Project(name=name, workspace=workspace)
+            db.add(models.Meeting(title=f"{name} meeting", project=project, created_by=ana))
+            db.add(models.Task(title=f"{name} task", project=project, created_by=ana))
+
+        add_project("P0", workspace)
+        await db.commit()
+        with_one = await count_dashboard_queries(db, ana)
+
+        other = models.Workspace(name="Other", owner=ana, members=[models.WorkspaceMember(user=ana, role="owner")])
+        for i in range(1, 20):
+            add_project(f"P{i}", workspace if i % 2 else other)
+        await db.commit()
+        with_many = await count_dashboard_queries(db, ana)
+
+    await engine.dispose()
+
+    assert 0 < with_one == with_many
@@ -0,0 +1,59 @@
+"""
+Tests for streaming meeting exports
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import export, models
+from app.database import Base
+
+
+async def render(db, fmt, **scope):
+    pieces = [text async for text in export._render(db, export.EXPORT_FORMATS[fmt](), scope.get("meeting_id"), scope.get("project_id"))]
+    return "".join(pieces)
+
+
+@pytest.mark.asyncio
+async def test_exports_stream_notes_in_order_per_meeting(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        owner = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        project = models.Project(name="P", workspace=models.Workspace(name="W", owner=owner))
+        for title, offset in (("Sync", 0), ("Retro", 3), ("Empty", None)):
+            notes = [] if offset is None else [
+                models.MeetingNote(content=f"{title} line {i}", speaker="Bob",
+                                   timestamp=datetime(2024, 1, 1, 10, 0, offset + i * 2))
+                for i in range(3)
+            ]
+            db.add(models.Meeting(title=title, project=project, created_by=owner,
+                                  start_time=datetime(2024, 1, 1, 10), notes=notes))
+        await db.commit()
+
+        records = [json.loads(line) for line in (await render(db, "ndjson", project_id=1)).splitlines()]
+        assert [(r["type"], r.get("title") or r["content"]) for r in records] == [
+            ("meeting", "Sync"), ("note", "Sync line 0"), ("note", "Sync line 1"), ("note", "Sync line 2"),
+            ("meeting", "Retro"), ("note", "Retro line 0"), ("note", "Retro line 1"), ("note", "Retro line 2"),
+            ("meeting", "Empty"),
+        ]
+
+        srt = await render(db, "srt", meeting_id=2)
+        assert srt.split("\n\n")[:3] == [
+            "1\n00:00:03,000 --> 00:00:05,000\nBob: Retro line 0",
+            "2\n00:00:05,000 --> 00:00:07,000\nBob: Retro line 1",
+            "3\n00:00:07,000 --> 00:00:10,000\nBob: Retro line 2",
+        ]
+
+    await engine.dispose()
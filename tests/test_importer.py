@@ -0,0 +1,101 @@
+"""
+Tests for the bulk meeting importer
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import models
+from app.database import Base
+from app.importer import MeetingImporter, iter_lines
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_lines_are_split_across_chunk_boundaries():
+    lines = [line async for line in iter_lines(chunked(b'{"a": 1}\n\n{"b": 22}\n{"c": 3}', 3))]
+    assert lines == [b'{"a": 1}', b"", b'{"b": 22}', b'{"c": 3}']
+
+
+@pytest.mark.asyncio
+async def test_import_writes_batches_and_skips_invalid_lines(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    body = "\n".join([
+        json.dumps({"type": "meeting", "title": "Kickoff", "start_time": "2024-01-01T10:00:00",
+                    "end_time": "2024-01-01T10:45:00", "segments": [{"content": "hello", "speaker": "Ana"}]}),
+        json.dumps({"type": "note", "content": "pricing", "timestamp": "2024-01-01T10:05:00"}),
+        json.dumps({"type": "note", "content": "hiring"}),
+        "{not json",
+        json.dumps({"type": "meeting", "description": "no title"}),
+        json.dumps({"type": "note", "content": "orphan"}),
+        json.dumps({"title": "Retro", "summary": "Went well", "status": None, "meeting_type": None}),
+        json.dumps({"content": "shipped", "note_type": None}),
+    ]).encode()
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        result = await MeetingImporter(db, project_id=1, user_id=1, batch_size=2).run(iter_lines(chunked(body, 16)))
+
+        assert (result["meetings_created"], result["notes_created"]) == (2, 4)
+        assert [error["line"] for error in result["errors"]] == [4, 5, 6]
+        assert result["errors"][1]["error"] == "title: Field required"
+
+        kickoff = (await db.execute(
+            select(models.Meeting.duration, models.Meeting.status, models.Meeting.transcript)
+            .where(models.Meeting.id == result["meeting_ids"][0])
+        )).one()
+        assert kickoff == (45.0, "completed", "hello\npricing\nhiring")
+        retro = (await db.execute(
+            select(models.Meeting.status, models.Meeting.meeting_type)
+            .where(models.Meeting.id == result["meeting_ids"][1])
+        )).one()
+        assert retro == ("completed", "general")
+        notes = (await db.execute(
+            select(models.MeetingNote.meeting_id, models.MeetingNote.content, models.MeetingNote.note_type)
+            .order_by(models.MeetingNote.id)
+        )).all()
+        assert [tuple(note) for note in notes] == [
+            (1, "hello", "transcript"), (1, "pricing", "transcript"),
+            (1, "hiring", "transcript"), (2, "shipped", "transcript")
+        ]
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_oversized_line_stops_the_import_and_keeps_earlier_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.importer.IMPORT_MAX_LINE_BYTES", 200)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    body = "\n".join([
+        json.dumps({"title": "Kickoff", "segments": [{"content": "hello"}]}),
+        json.dumps({"content": "pricing"}),
+        json.dumps({"content": "x" * 500}),
+        json.dumps({"title": "Never read"}),
+    ]).encode()
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        result = await MeetingImporter(db, project_id=1, user_id=1, batch_size=1).run(iter_lines(chunked(body, 64)))
+
+        assert (result["complete"], result["meetings_created"], result["notes_created"]) == (False, 1, 2)
+        assert [error["line"] for error in result["errors"]] == [3]
+        titles = (await db.execute(select(models.Meeting.title))).scalars().all()
+        assert titles == ["Kickoff"]
+
+    await engine.dispose()
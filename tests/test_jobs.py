@@ -0,0 +1,110 @@
+"""
+Tests for the AI job queue
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import crud, jobs, models, schemas
+from app.database import Base
+from app.jobs import InProcessJobBackend, JobQueue
+from app.websocket_manager import ConnectionManager, MeetingManager
+
+
+class FakeAIService:
+    """Fails the first `failures` analyses, then returns a fixed one"""
+
+    client = object()
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    async def analyze_meeting(self, transcript, meeting_type="general", raise_errors=False):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("LLM unavailable")
+        return schemas.MeetingAnalysis(
+            summary=f"summary of {transcript}",
+            action_items=[{"title": "Ship it"}],
+            topics=["launch"]
+        )
+
+
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(jobs, "AsyncSessionLocal", factory)
+    async with factory() as db:
+        owner = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        db.add(models.Meeting(id=1, title="Launch", created_by=owner, transcript="Ana: ship on Monday"))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_are_retried_and_completion_is_broadcast(session_factory, monkeypatch):
+    fake_ai = FakeAIService(failures=1)
+    monkeypatch.setattr(jobs, "ai_service", fake_ai)
+    meetings = MeetingManager(ConnectionManager())
+    queue = JobQueue(InProcessJobBackend(workers=2), meetings, max_attempts=3, retry_delay=0.01)
+    await queue.start(recover=False)
+
+    async with session_factory() as db:
+        job, = await queue.enqueue(db, "action_items", [1], user_id=1)
+        # A duplicate delivery must not run the job twice
+        await queue.backend.submit(job.id)
+    await queue.drain()
+    await queue.stop()
+
+    async with session_factory() as db:
+        job = await db.get(models.AIJob, job.id)
+        meeting = await crud.get_meeting(db, 1, with_content=True)
+        assert (job.status, job.attempts, job.result) == ("succeeded", 2, {"action_items": meeting.action_items})
+        assert meeting.action_items[0]["title"] == "Ship it"
+
+    assert fake_ai.calls == 2
+    assert queue.counters == {"submitted": 1, "succeeded": 1, "failed": 0, "retried": 1}
+    # Numbered and kept, so a client reconnecting with an earlier seq gets it replayed
+    message, = meetings.replay_messages(1, last_seq=0)
+    assert (message["seq"], message["type"], message["data"]["status"]) == (1, "job_completed", "succeeded")
+
+
+@pytest.mark.asyncio
+async def test_recover_resubmits_stale_jobs_until_attempts_run_out(session_factory, monkeypatch):
+    monkeypatch.setattr(jobs, "ai_service", FakeAIService(failures=10))
+    queue = JobQueue(InProcessJobBackend(workers=1), None, max_attempts=2, retry_delay=0.01, timeout=60)
+
+    async with session_factory() as db:
+        long_ago = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db.add_all([
+            models.AIJob(kind="topics", meeting_id=1, status="running", attempts=1, max_attempts=2, started_at=long_ago),
+            models.AIJob(kind="topics", meeting_id=1, status="running", attempts=1, max_attempts=2,
+                         started_at=datetime.now(timezone.utc)),
+        ])
+        await db.commit()
+
+    await queue.start()
+    await queue.drain()
+    await queue.stop()
+
+    async with session_factory() as db:
+        stale = await db.get(models.AIJob, 1)
+        running = await db.get(models.AIJob, 2)
+        assert (stale.status, stale.attempts, stale.error) == ("failed", 2, "ConnectionError('LLM unavailable')")
+        assert running.status == "running"
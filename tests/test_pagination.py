@@ -0,0 +1,76 @@
+"""
+Tests for keyset pagination on list queries
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import crud, models
+from app.database import Base
+from app.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    user = models.User(email="a@example.com", username="a", hashed_password="x")
+    workspace = models.Workspace(name="W", owner=user)
+    session.add(models.Project(name="P", workspace=workspace))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_pages_cover_every_row_once(db):
+    """Rows sharing a created_at second are split across pages without gaps or repeats"""
+    for i in range(7):
+        db.add(models.Meeting(title=f"M{i}", project_id=1, created_by_id=1, status="completed" if i % 2 else "scheduled"))
+    db.commit()
+
+    titles, after = [], None
+    while True:
+        items, next_cursor = crud.get_meetings_by_project(db, 1, limit=3, after=after)
+        titles += [meeting.title for meeting in items]
+        if next_cursor is None:
+            break
+        after = decode_cursor(next_cursor)
+
+    assert titles == [f"M{i}" for i in reversed(range(7))]
+
+    items, next_cursor = crud.get_meetings_by_project(db, 1, status="completed")
+    assert [meeting.title for meeting in items] == ["M5", "M3", "M1"]
+    assert next_cursor is None
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Cursors decode to what was encoded; anything else is a ValueError"""
+    assert decode_cursor(encode_cursor(datetime(2024, 1, 2, 3, 4, 5), 42)) == (datetime(2024, 1, 2, 3, 4, 5), 42)
+
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_meeting_lists_skip_transcript_columns(db):
+    """List rows are column tuples without content; get_meeting loads it on request"""
+    db.add(models.Meeting(title="M", project_id=1, created_by_id=1, transcript="long text", summary="s"))
+    db.commit()
+    db.expunge_all()
+
+    items, _ = crud.get_meetings_by_project(db, 1)
+    assert items[0].title == "M"
+    assert "transcript" not in items[0]._fields
+
+    meeting = crud.get_meeting(db, items[0].id)
+    assert "transcript" not in meeting.__dict__
+    db.expunge_all()
+    assert crud.get_meeting(db, items[0].id, with_content=True).__dict__["transcript"] == "long text"
@@ -0,0 +1,89 @@
+"""
+Tests for full-text search on SQLite FTS5
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import models, search
+from app.database import Base
+
+
+@pytest.mark.asyncio
+async def test_search_is_indexed_on_write_scoped_and_highlighted(tmp_path):
+    """Rows written after install are found, escaped, and only in the user's workspaces"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'search.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(search.install)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        for user_id, name in ((1, "ana"), (2, "bob")):
+            owner = models.User(id=user_id, username=name, email=f"{name}@example.com", hashed_password="x")
+            workspace = models.Workspace(name=name, owner=owner, members=[models.WorkspaceMember(user=owner)])
+            project = models.Project(name=name, workspace=workspace)
+            db.add(models.Meeting(title=f"{name} sync", project=project, created_by=owner, notes=[
+                models.MeetingNote(content="Raise <b>pricing</b> next quarter", speaker="Alice"),
+                models.MeetingNote(content="Prices look fine to me", speaker="Bob"),
+            ]))
+        await db.commit()
+
+        meeting = await db.get(models.Meeting, 1)
+        meeting.summary = "Agreed on the pricing change"
+        await db.commit()
+
+        results = await search.search(db, "pricing", user_id=1)
+        assert [hit["id"] for hit in results["meetings"]] == [1]
+        # Stemming matches "Prices" as well
+        snippets = {hit["speaker"]: hit["snippet"] for hit in results["notes"] if hit["meeting_id"] == 1}
+        assert len(results["notes"]) == 2
+        assert snippets["Alice"] == "Raise &lt;b&gt;<mark>pricing</mark>&lt;/b&gt; next quarter"
+        assert snippets["Bob"] == "<mark>Prices</mark> look fine to me"
+
+        results = await search.search(db, "price", user_id=1, speaker="Bob")
+        assert results["meetings"] == []
+        assert [hit["speaker"] for hit in results["notes"]] == ["Bob"]
+
+        assert (await search.search(db, "AND (", user_id=1))["notes"] == []
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_like_fallback_matches_every_term_in_scope(tmp_path):
+    """Databases without full-text support get an unranked substring search"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'like.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        owner = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        workspace = models.Workspace(name="ana", owner=owner, members=[models.WorkspaceMember(user=owner)])
+        project = models.Project(name="ana", workspace=workspace)
+        db.add(models.Meeting(title="Pricing sync", project=project, created_by=owner,
+                              summary="Raise <b>pricing</b> for 100% of plans", notes=[
+            models.MeetingNote(content="pricing_v2 next quarter", speaker="Alice"),
+            models.MeetingNote(content="pricing looks fine", speaker="Bob"),
+        ]))
+        await db.commit()
+
+        params = {"limit": 20}
+        scope = search._scope(1, None, params)
+        results = await search._like_search(db, 'PRICING "next quarter"', scope, "", params, include_meetings=True)
+        plans = await search._like_search(db, "plans 100", scope, "", params, include_meetings=True)
+
+    await engine.dispose()
+
+    (meeting,) = plans["meetings"]
+    assert meeting["snippet"] == "Raise &lt;b&gt;pricing&lt;/b&gt; for <mark>100</mark>% of <mark>plans</mark>"
+
+    assert results["meetings"] == []
+    (note,) = results["notes"]
+    assert note["snippet"] == "<mark>pricing</mark>_v2 <mark>next quarter</mark>"
+    assert "content" not in note
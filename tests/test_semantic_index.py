@@ -0,0 +1,86 @@
+"""
+Tests for the local semantic index
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import models
+from app import semantic_index as semantic_index_module
+from app.database import Base
+from app.semantic_index import HashingVectorizer, SemanticIndex
+
+
+def test_vectors_are_unit_length_and_share_stemmed_features():
+    vectors = HashingVectorizer(dim=256).transform(["Pricing for the enterprise plan", "enterprise prices", "", "the and"])
+    assert vectors.shape == (4, 256) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2:].any()
+    assert vectors[0] @ vectors[1] > 0.3
+
+
+def test_search_and_related_stay_within_workspace_partitions(tmp_path):
+    index = SemanticIndex(root=str(tmp_path), dim=512)
+    assert index.add(1, 10, [(1, "raise enterprise pricing next quarter"), (2, "hiring plan for the support team")]) == 2
+    assert index.add(1, 11, [(3, "enterprise pricing tiers and discounts")]) == 1
+    assert index.add(1, 12, [(4, "office move and parking")]) == 1
+    assert index.add(2, 20, [(5, "enterprise pricing in the other workspace")]) == 1
+    # Re-indexing an ended meeting is a no-op
+    assert index.add(1, 10, [(1, "raise enterprise pricing next quarter")]) == 0
+
+    hits = index.query([1], "enterprise pricing", k=2)
+    assert [note_id for _, note_id, _ in hits] == [3, 1]
+    assert {meeting_id for _, _, meeting_id in index.query([1, 2], "enterprise pricing", k=10)} == {10, 11, 20}
+
+    related = index.related(1, 10, k=5)
+    assert related[0][0] == 11
+    assert 10 not in [meeting_id for meeting_id, _ in related]
+    assert index.related(2, 10) == []
+
+    # A fresh instance maps the appended files from disk
+    assert SemanticIndex(root=str(tmp_path), dim=512).query([1], "parking", k=1)[0][1] == 4
+
+
+def test_append_checks_for_the_meeting_under_the_lock(tmp_path):
+    """A writer that passed the early check cannot add a meeting another writer added"""
+    index = SemanticIndex(root=str(tmp_path), dim=64)
+    partition = index._partition(1)
+    vectors = index.vectorizer.transform(["pricing"])
+    ids = np.array([(1, 10)], dtype=np.int64)
+
+    assert partition.append(10, vectors, ids) is True
+    assert partition.append(10, vectors, ids) is False
+    assert len(partition.load()[1]) == 1
+
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_existing_meetings_once(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'index.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(semantic_index_module, "AsyncSessionLocal", factory)
+    async with factory() as db:
+        ana = models.User(id=1, username="ana", email="ana@example.com", hashed_password="x")
+        project = models.Project(name="P", workspace=models.Workspace(name="W", owner=ana))
+        for i, content in enumerate(["enterprise pricing", "hiring plan", None]):
+            meeting = models.Meeting(title=f"M{i}", project=project, created_by=ana)
+            if content:
+                db.add(models.MeetingNote(meeting=meeting, content=content, created_by=ana))
+            db.add(meeting)
+        await db.commit()
+
+    index = SemanticIndex(root=str(tmp_path / "index"), dim=256)
+    assert await index.backfill(batch_size=1) == (2, 2)
+    assert await index.backfill() == (0, 0)
+    assert index.query([1], "pricing", k=1)[0][2] == 1
+
+    await engine.dispose()
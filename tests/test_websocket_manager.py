@@ -0,0 +1,503 @@
+"""
+Tests for the real-time meeting manager
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import schemas, websocket_manager
+from app.broadcast import MemoryBackend, MemoryPubSub
+from app.transcript_buffer import TranscriptWriteBuffer
+from app.websocket_manager import ConnectionManager, MeetingManager
+
+
+class FakeAIService:
+    """Records rolling summary updates instead of calling the LLM"""
+
+    def __init__(self):
+        self.rolling_calls = []
+
+    async def update_rolling_summary(self, previous_summary, new_transcript, meeting_type="general"):
+        self.rolling_calls.append((previous_summary, new_transcript))
+        return f"{previous_summary}|{new_transcript}".strip("|")
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    fake = FakeAIService()
+    monkeypatch.setattr(websocket_manager, "ai_service", fake)
+    return fake
+
+
+async def add_segments(manager, meeting_id, texts):
+    for text in texts:
+        await manager.add_transcript(meeting_id, {"text": text})
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_sends_only_new_segments(fake_ai, monkeypatch):
+    """Each refresh sends the previous summary plus segments after the cursor"""
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_SEGMENTS", 1000)
+    manager = MeetingManager(ConnectionManager(), rolling_summary=True)
+    await manager.start_meeting(1, {})
+
+    await add_segments(manager, 1, ["a", "b"])
+    assert await manager.generate_summary(1) == "a\nb"
+
+    await add_segments(manager, 1, ["c"])
+    # Pending segments are folded in before the summary is returned
+    assert await manager.generate_summary(1) == "a\nb|c"
+    # Nothing pending - the current state is returned as is
+    assert await manager.generate_summary(1) == "a\nb|c"
+
+    assert fake_ai.rolling_calls == [("", "a\nb"), ("a\nb", "c")]
+    assert manager.active_meetings[1]["rolling_summary"]["cursor"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_refreshes_on_segment_count(fake_ai, monkeypatch):
+    """Reaching the segment threshold triggers a background refresh"""
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_SEGMENTS", 3)
+    manager = MeetingManager(ConnectionManager(), rolling_summary=True)
+    await manager.start_meeting(1, {})
+
+    await add_segments(manager, 1, ["a", "b"])
+    assert manager.active_meetings[1]["rolling_summary"]["task"] is None
+
+    await add_segments(manager, 1, ["c"])
+    await manager.active_meetings[1]["rolling_summary"]["task"]
+
+    assert fake_ai.rolling_calls == [("", "a\nb\nc")]
+
+
+class RecordingConnectionManager(ConnectionManager):
+    """Keeps broadcasts in a list instead of sending them"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    async def broadcast_to_meeting(self, meeting_id, message):
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_refreshes_on_a_timer_and_requests_broadcast_once(fake_ai, monkeypatch):
+    """A quiet meeting's pending segments are summarized after the interval; one request, one event"""
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_SEGMENTS", 1000)
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_INTERVAL", 0.05)
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=True)
+    await manager.start_meeting(1, {})
+
+    await add_segments(manager, 1, ["a"])
+    assert fake_ai.rolling_calls == []
+    await asyncio.sleep(0.1)
+    assert fake_ai.rolling_calls == [("", "a")]
+    assert [message["type"] for message in connections.sent][-1] == "summary"
+
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_INTERVAL", 60)
+    connections.sent.clear()
+    await add_segments(manager, 1, ["b"])
+    assert manager.active_meetings[1]["rolling_summary"]["timer"] is not None
+    assert await manager.generate_summary(1) == "a|b"
+    assert [message["type"] for message in connections.sent] == ["transcript", "summary"]
+    assert manager.active_meetings[1]["rolling_summary"]["timer"] is None
+
+
+@pytest.mark.asyncio
+async def test_end_meeting_runs_analysis_in_background(fake_ai, monkeypatch):
+    """meeting_ended goes out first, AI results follow and are persisted"""
+    release = asyncio.Event()
+
+    async def analyze_meeting(transcript, meeting_type="general"):
+        await release.wait()
+        return schemas.MeetingAnalysis(action_items=[{"title": "Ship it"}])
+
+    fake_ai.analyze_meeting = analyze_meeting
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=True)
+    saved = []
+
+    async def save_meeting(meeting_id, values):
+        saved.append(values)
+
+    monkeypatch.setattr(manager, "_save_meeting", save_meeting)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a", "b"])
+
+    await manager.end_meeting(1)
+    assert 1 not in manager.active_meetings
+    assert connections.sent[-1]["type"] == "meeting_ended"
+
+    release.set()
+    await manager.shutdown()
+
+    types = [message["type"] for message in connections.sent]
+    assert types[-3:] == ["meeting_ended", "final_summary", "insights"]
+    assert saved[0]["status"] == "completed"
+    assert saved[-1] == {"summary": "a\nb", "action_items": [
+        {"title": "Ship it", "description": None, "assignee": None, "due_date": None, "priority": "medium"}
+    ]}
+
+
+@pytest.mark.asyncio
+async def test_end_meeting_without_rolling_summary_sends_transcript_once(fake_ai, monkeypatch):
+    """The final summary comes from the analysis instead of a second full-transcript call"""
+    calls = []
+
+    async def analyze_meeting(transcript, meeting_type="general"):
+        calls.append("analyze_meeting")
+        return schemas.MeetingAnalysis(summary="Shipped")
+
+    async def generate_summary(transcript, meeting_type="general"):
+        calls.append("generate_summary")
+        return "unused"
+
+    fake_ai.analyze_meeting = analyze_meeting
+    fake_ai.generate_summary = generate_summary
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=False)
+    saved = []
+
+    async def save_meeting(meeting_id, values):
+        saved.append(values)
+
+    monkeypatch.setattr(manager, "_save_meeting", save_meeting)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a", "b"])
+    await manager.end_meeting(1)
+    await manager.shutdown()
+
+    assert calls == ["analyze_meeting"]
+    assert connections.sent[-1]["data"]["summary"] == "Shipped"
+    assert saved[-1]["summary"] == "Shipped"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_summary_requests_are_coalesced(monkeypatch):
+    """Simultaneous requests share one LLM call and one broadcast"""
+    calls = []
+
+    class SlowAIService:
+        async def generate_summary(self, transcript, meeting_type="general"):
+            calls.append(transcript)
+            await asyncio.sleep(0.05)
+            return "summary"
+
+    monkeypatch.setattr(websocket_manager, "ai_service", SlowAIService())
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=False)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a", "b"])
+    connections.sent.clear()
+
+    results = await asyncio.gather(*[manager.generate_summary(1) for _ in range(5)])
+
+    assert results == ["summary"] * 5
+    assert len(calls) == 1
+    assert [message["type"] for message in connections.sent] == ["summary"]
+    assert manager._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_streamed_summary_is_relayed_as_coalesced_deltas(monkeypatch):
+    """The first token goes out at once, later ones in batches, then the full summary"""
+    class StreamingAIService:
+        async def stream_summary(self, transcript, meeting_type="general"):
+            for token in ["The ", "team ", "agreed ", "to ", "ship."]:
+                yield token
+
+    monkeypatch.setattr(websocket_manager, "ai_service", StreamingAIService())
+    monkeypatch.setattr(websocket_manager, "SUMMARY_STREAM_INTERVAL", 60)
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=False)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a"])
+    connections.sent.clear()
+
+    assert await manager.generate_summary(1, stream=True) == "The team agreed to ship."
+
+    deltas, final = connections.sent[:-1], connections.sent[-1]
+    assert [message["data"]["delta"] for message in deltas] == ["The ", "team agreed to ship."]
+    assert all("seq" not in message for message in deltas)
+    assert final["type"] == "summary"
+    assert final["data"]["summary"] == "The team agreed to ship."
+    assert final["data"]["stream_id"] == deltas[0]["data"]["stream_id"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_and_plain_summary_requests_are_not_coalesced(monkeypatch):
+    """A streamed request joining a plain one in flight still gets its deltas"""
+    class BothAIService:
+        async def generate_summary(self, transcript, meeting_type="general"):
+            await asyncio.sleep(0.05)
+            return "plain"
+
+        async def stream_summary(self, transcript, meeting_type="general"):
+            yield "streamed"
+
+    monkeypatch.setattr(websocket_manager, "ai_service", BothAIService())
+    connections = RecordingConnectionManager()
+    manager = MeetingManager(connections, rolling_summary=False)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a"])
+    connections.sent.clear()
+
+    results = await asyncio.gather(manager.generate_summary(1), manager.generate_summary(1, stream=True))
+
+    assert results == ["plain", "streamed"]
+    assert [message["type"] for message in connections.sent] == ["summary_delta", "summary", "summary"]
+
+
+class FakeWebSocket:
+    """Collects sent frames; a blocked socket never completes a send"""
+
+    def __init__(self, blocked=False):
+        self.blocked = blocked
+        self.frames = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.blocked:
+            await asyncio.Event().wait()
+        self.frames.append(text)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_does_not_delay_other_participants():
+    """Broadcasts reach fast sockets while a stalled one is dropped at the high-water mark"""
+    manager = ConnectionManager(send_queue_size=3)
+    fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+    await manager.connect(fast, 1)
+    await manager.connect(slow, 1)
+
+    for i in range(6):
+        await manager.broadcast_to_meeting(1, {"type": "transcript", "data": {"n": i}})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    assert fast.frames == [f'{{"type":"transcript","data":{{"n":{i}}}}}' for i in range(6)]
+    assert slow not in manager.connection_meetings
+    assert slow.close_code == 1013
+    assert manager.active_connections[1] == {fast}
+
+    manager.disconnect(fast)
+    # The close and unsubscribe tasks are held until they finish
+    assert manager.background_tasks
+    await manager.stop()
+    assert not manager.background_tasks
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_participants_on_other_workers():
+    """Managers sharing a pub/sub hub deliver each other's broadcasts"""
+    hub = MemoryPubSub()
+    worker_a = ConnectionManager(backend=MemoryBackend(hub))
+    worker_b = ConnectionManager(backend=MemoryBackend(hub))
+    on_a, on_b, elsewhere = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await worker_a.connect(on_a, 1)
+    await worker_b.connect(on_b, 1)
+    await worker_b.connect(elsewhere, 2)
+
+    await worker_b.broadcast_to_meeting(1, {"type": "transcript"})
+    await asyncio.sleep(0)
+
+    assert on_a.frames == on_b.frames == ['{"type":"transcript"}']
+    assert elsewhere.frames == []
+
+    # The last local participant leaving drops the worker's subscription
+    worker_a.disconnect(on_a)
+    await asyncio.sleep(0)
+    assert hub.channels["meeting:1"] == {worker_b.backend}
+
+    worker_b.disconnect(on_b)
+    worker_b.disconnect(elsewhere)
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_commands_on_any_worker_reach_the_owning_session(fake_ai, monkeypatch):
+    """Session state and numbering stay on the worker that started the meeting"""
+    monkeypatch.setattr(websocket_manager, "ROLLING_SUMMARY_SEGMENTS", 1000)
+    hub = MemoryPubSub()
+    owner = MeetingManager(ConnectionManager(backend=MemoryBackend(hub)), rolling_summary=True)
+    other = MeetingManager(ConnectionManager(backend=MemoryBackend(hub)), rolling_summary=True)
+    monkeypatch.setattr(owner, "_finalize_meeting", lambda *args: asyncio.sleep(0))
+    on_other = FakeWebSocket()
+    await other.connection_manager.connect(on_other, 1)
+
+    await owner.start_meeting(1, {})
+    # A start on the second worker goes to the existing session instead of forking it
+    await other.start_meeting(1, {"title": "Restarted"})
+    await asyncio.sleep(0)
+    assert 1 not in other.active_meetings
+    assert owner.active_meetings[1]["data"] == {"title": "Restarted"}
+
+    assert await other.add_transcript(1, {"text": "a"}, idempotency_key="k1")
+    await other.add_transcript(1, {"text": "a"}, idempotency_key="k1")
+    await asyncio.sleep(0)
+    await owner.add_transcript(1, {"text": "b"})
+    assert await other.generate_summary(1) is None
+    await asyncio.sleep(0.01)
+    # Events raised outside the session, like finished jobs, are numbered by the owner too
+    await other.announce(1, {"type": "job_completed"})
+    await asyncio.sleep(0.01)
+
+    assert [t["text"] for t in owner.active_meetings[1]["transcript"]] == ["a", "b"]
+    frames = [json.loads(frame) for frame in on_other.frames]
+    assert [(f["type"], f["seq"]) for f in frames] == [
+        ("meeting_started", 1), ("meeting_started", 2), ("transcript", 3), ("transcript", 4), ("summary", 5),
+        ("job_completed", 6)
+    ]
+    assert frames[4]["data"]["summary"] == "a\nb"
+    # The second worker replays from the events it delivered
+    epoch = owner.event_logs[1]["epoch"]
+    assert [m["seq"] for m in other.replay_messages(1, last_seq=3, epoch=epoch)] == [4, 5, 6]
+
+    await other.end_meeting(1)
+    await asyncio.sleep(0)
+    assert 1 not in owner.active_meetings
+    assert hub.channels.keys() == {"meeting:1"}
+    # No worker owns it now
+    assert await other.add_transcript(1, {"text": "late"}) is False
+
+    other.connection_manager.disconnect(on_other)
+    await asyncio.sleep(0)
+    assert 1 not in other.event_logs
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, rows):
+        self.batches.append(rows)
+
+
+@pytest.mark.asyncio
+async def test_transcript_segments_are_written_in_batches():
+    """Segments are flushed by count, by timer and when the meeting ends"""
+    writer = RecordingWriter()
+    buffer = TranscriptWriteBuffer(flush_segments=3, flush_interval_ms=20, writer=writer)
+    manager = MeetingManager(RecordingConnectionManager(), rolling_summary=False, transcript_buffer=buffer)
+    await manager.start_meeting(1, {})
+
+    await add_segments(manager, 1, ["a", "b", "c"])
+    await asyncio.sleep(0)
+    assert [[row["content"] for row in batch] for batch in writer.batches] == [["a", "b", "c"]]
+
+    await add_segments(manager, 1, ["d"])
+    await asyncio.sleep(0.05)
+    assert [row["content"] for row in writer.batches[-1]] == ["d"]
+
+    await add_segments(manager, 1, ["e"])
+    await buffer.flush()
+    assert writer.batches[-1][0]["meeting_id"] == 1
+    assert writer.batches[-1][0]["note_type"] == "transcript"
+    assert len(writer.batches) == 3
+
+
+class FlakyWriter(RecordingWriter):
+    """Fails the first `outages` writes, then rejects batches holding a "bad" segment"""
+
+    def __init__(self, outages):
+        super().__init__()
+        self.outages = outages
+
+    async def __call__(self, rows):
+        if self.outages:
+            self.outages -= 1
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        if any(row["content"] == "bad" for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+        await super().__call__(rows)
+
+
+@pytest.mark.asyncio
+async def test_transcript_buffer_backs_off_and_drops_rejected_rows():
+    """Outages are retried after a growing delay; rows the database rejects are isolated and dropped"""
+    writer = FlakyWriter(outages=2)
+    buffer = TranscriptWriteBuffer(flush_segments=2, flush_interval_ms=20, writer=writer, max_pending=5)
+
+    for text in ["a", "b"]:
+        buffer.add(1, {"text": text})
+    await asyncio.sleep(0)
+    assert (buffer.failures, len(buffer.rows)) == (1, 2)
+
+    # Backing off: reaching flush_segments does not start another write
+    for text in ["bad", "c", "d", "e"]:
+        buffer.add(1, {"text": text})
+    assert (buffer.failures, [row["content"] for row in buffer.rows]) == (1, ["b", "bad", "c", "d", "e"])
+    # Retries after 40ms, then 80ms more
+    await asyncio.sleep(0.06)
+    assert buffer.failures == 2
+    await asyncio.sleep(0.15)
+
+    assert buffer.failures == 0 and buffer.rows == []
+    assert [row["content"] for batch in writer.batches for row in batch] == ["b", "c", "d", "e"]
+    assert buffer.counters == {"written": 4, "rejected": 1, "overflowed": 1}
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_gets_only_missed_events(monkeypatch):
+    """Broadcasts are numbered and replayed from the ring buffer after last_seq"""
+    monkeypatch.setattr(websocket_manager, "REPLAY_BUFFER_SIZE", 3)
+    manager = MeetingManager(ConnectionManager(send_queue_size=2), rolling_summary=False)
+    await manager.start_meeting(1, {})
+    await add_segments(manager, 1, ["a", "b", "c"])
+    epoch = manager.event_logs[1]["epoch"]
+
+    missed = manager.replay_messages(1, last_seq=2, epoch=epoch)
+    assert [(m["seq"], m["epoch"], m["data"]["text"]) for m in missed] == [(3, epoch, "b"), (4, epoch, "c")]
+    assert manager.replay_messages(1, last_seq=4) == []
+    # Older than the buffer, from before a reset, from another epoch, or more
+    # than the client's send queue holds: the client must reload
+    assert manager.replay_messages(1, last_seq=0)[0]["type"] == "resync"
+    assert manager.replay_messages(1, last_seq=9)[0]["data"] == {"meeting_id": 1, "seq": 4, "epoch": epoch}
+    assert manager.replay_messages(1, last_seq=4, epoch="stale")[0]["type"] == "resync"
+    assert manager.replay_messages(1, last_seq=2, limit=1)[0]["type"] == "resync"
+
+    websocket = FakeWebSocket()
+    await manager.connection_manager.connect(
+        websocket, 1, backlog=lambda limit: manager.replay_messages(1, 3, epoch, limit)
+    )
+    await add_segments(manager, 1, ["d"])
+    await asyncio.sleep(0)
+    assert [json.loads(frame)["seq"] for frame in websocket.frames] == [4, 5]
+
+    lagging = FakeWebSocket()
+    await manager.connection_manager.connect(
+        lagging, 1, backlog=lambda limit: manager.replay_messages(1, 2, epoch, limit)
+    )
+    await asyncio.sleep(0)
+    assert [json.loads(frame)["type"] for frame in lagging.frames] == ["resync"]
+
+    manager.connection_manager.disconnect(websocket)
+    manager.connection_manager.disconnect(lagging)
+
+
+@pytest.mark.asyncio
+async def test_resent_transcript_frames_are_ignored():
+    """A frame with an already accepted idempotency key is not added again"""
+    manager = MeetingManager(RecordingConnectionManager(), rolling_summary=False)
+    await manager.start_meeting(1, {})
+
+    assert await manager.add_transcript(1, {"text": "hello"}, idempotency_key="k1") is True
+    assert await manager.add_transcript(1, {"text": "hello"}, idempotency_key="k1") is False
+
+    assert [t["text"] for t in manager.active_meetings[1]["transcript"]] == ["hello"]